@@ -7,9 +7,8 @@ import re
 # Ensure src is in path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from parsers.netlist_parser import NetlistParser
-from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
 from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from project_session import ProjectSession
 from generators.excel_generator import ExcelGenerator
 from generators.html_generator import HTMLExecutiveGenerator
 from gui.rating_gui import VoltageConfirmationList, RatingsDashboard
@@ -23,16 +22,18 @@ class RatingVerificationApp:
         if not self.netlist_path:
             self.netlist_path = filedialog.askopenfilename(
                 title="Select Altium Netlist (.NET)",
-                filetypes=[("Netlist files", "*.NET"), ("All files", "*.*")]
+                filetypes=[("Netlist files", "*.NET *.NET.gz *.zip"), ("All files", "*.*")]
             )
             if not self.netlist_path:
                 sys.exit(0)
 
-        self.netlist = NetlistParser(self.netlist_path)
-        self.voltage_detector = NetVoltageAnalyzer()
-        
         db_path = os.path.join(os.path.dirname(__file__), 'data', 'component_database.json')
-        self.analyzer = PassiveRatingAnalyzer(db_path)
+        self.session = ProjectSession(
+            self.netlist_path, db_path,
+            parser_options={'use_cache': True, 'fields': PassiveRatingAnalyzer.COMPONENT_FIELDS})
+        self.netlist = self.session.netlist
+        self.voltage_detector = self.session.voltage_detector
+        self.analyzer = self.session.analyzer
         
         dir_path = os.path.dirname(self.netlist_path)
         self.excel_output = os.path.join(dir_path, "RatingVerification_Interactive_Report.xlsx")
@@ -45,22 +46,21 @@ class RatingVerificationApp:
         try:
             print(f"\n--- Starting Analysis ---\nTarget: {os.path.basename(self.netlist_path)}")
             
-            # [Step 1] Parsing...
-            self.netlist.parse()
-            net_names = list(self.netlist.nets.keys())
+            # [Step 1] Parsing (done in __init__)
+            net_names = self.session.net_names
             
             # [Step 2] Voltage Detection & Confirm
-            candidates = self.voltage_detector.detect_candidates(net_names)
+            candidates = self.session.voltage_candidates
             if candidates:
                 confirm_gui = VoltageConfirmationList(self.root, candidates)
                 self.root.wait_window(confirm_gui.top)
                 confirmed = confirm_gui.results
                 for net, info in confirmed.items():
                     if info['action'] == 'confirm':
-                        self.voltage_detector.add_confirmed(net, info['voltage'])
+                        self.session.confirm_voltage(net, info['voltage'])
             
             # [Step 3] Analysis
-            confirmed_voltages = self.voltage_detector.get_analysis_state()
+            confirmed_voltages = self.session.confirmed_voltages
             results = []
             
             for des, comp_data in self.netlist.components.items():
@@ -79,16 +79,17 @@ class RatingVerificationApp:
                     else:
                         res = self.analyzer.analyze_resistor(comp_info, max_v)
                     
-                    res['Type'] = prefix
-                    res['Description'] = comp_data.get('DESCRIPTION') or comp_data.get('PARTTYPE') or '-'
-                    res['Footprint'] = comp_data.get('FOOTPRINT', '-')
+                    res.type = prefix
+                    res.description = comp_data.get('DESCRIPTION') or comp_data.get('PARTTYPE') or '-'
+                    res.footprint = comp_data.get('FOOTPRINT', '-')
                     results.append(res)
                 except Exception as e:
                     print(f"  [Warning] Skipping {des}: {e}")
 
             if results:
-                self.excel_gen.generate(results)
-                self.html_gen.generate(results)
+                integrity = self.session.integrity_findings
+                self.excel_gen.generate(results, integrity)
+                self.html_gen.generate(results, integrity)
                 try: os.startfile(self.html_output)
                 except: pass
                 
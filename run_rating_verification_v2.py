@@ -16,9 +16,11 @@ src_path = os.path.join(application_path, 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from parsers.netlist_parser import NetlistParser
-from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
+from parsers.netlist_source import source_file, split_archive_path
 from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from project_session import ProjectSession
+from analyzers.variants import DNP, substitute
+from analyzers.rating_result import Verdict, AuditCode, VIOLATIONS
 from generators.excel_generator import ExcelGenerator
 from generators.html_generator import HTMLExecutiveGenerator
 from gui.rating_gui import VoltageConfirmationList, RatingsDashboard, NetlistSelectionPage
@@ -26,7 +28,7 @@ from gui.rating_gui import VoltageConfirmationList, RatingsDashboard, NetlistSel
 class RatingVerificationAppV2:
     """Version 2.0 with Switching Path Analysis and Worst-Case Detection."""
     
-    def __init__(self, netlist_path=None):
+    def __init__(self, netlist_path=None, variant_path=None):
         try:
             print("[Debug] Initializing RatingVerificationAppV2...")
             self.root = tk.Tk()
@@ -50,23 +52,31 @@ class RatingVerificationAppV2:
             self.netlist_path = landing.selected_path
             print(f"[Debug] Target netlist: {self.netlist_path}")
             
-            if not os.path.exists(self.netlist_path):
+            if not os.path.exists(source_file(self.netlist_path)):
                 print(f"[Error] Netlist file does not exist: {self.netlist_path}")
                 messagebox.showerror("File Not Found", f"The selected netlist file does not exist:\n{self.netlist_path}")
                 sys.exit(1)
             
-            self.netlist = NetlistParser(self.netlist_path)
-            self.voltage_detector = NetVoltageAnalyzer()
-            
             # Database path - works for both development and PyInstaller
             if getattr(sys, 'frozen', False):
                 db_path = os.path.join(sys._MEIPASS, 'data', 'component_database.json')
             else:
                 db_path = os.path.join(os.path.dirname(__file__), 'data', 'component_database.json')
-            self.analyzer = PassiveRatingAnalyzer(db_path)
+
+            self.session = ProjectSession(
+                self.netlist_path, db_path,
+                parser_options={'use_cache': True, 'fields': PassiveRatingAnalyzer.COMPONENT_FIELDS},
+                variant_path=variant_path)
+            self.netlist = self.session.netlist
+            self.voltage_detector = self.session.voltage_detector
+            self.analyzer = self.session.analyzer
             
-            dir_path = os.path.dirname(self.netlist_path)
-            base_name = os.path.splitext(os.path.basename(self.netlist_path))[0]
+            archive, member = split_archive_path(self.netlist_path)
+            dir_path = os.path.dirname(archive)
+            base_name = os.path.basename(member or archive)
+            if base_name.lower().endswith('.gz'):
+                base_name = base_name[:-3]
+            base_name = os.path.splitext(base_name)[0]
             self.excel_output = os.path.join(dir_path, f"{base_name}_Rating_Verification.xlsx")
             self.html_output = os.path.join(dir_path, f"{base_name}_Executive_Summary.html")
             
@@ -83,60 +93,66 @@ class RatingVerificationAppV2:
             traceback.print_exc()
             sys.exit(1)
 
-    def identify_gnd_nets(self, net_names):
-        """Standardizes identification of Ground nets."""
-        gnd_keywords = ['GND', 'VSS', 'REF_0V', 'BAT_NEG', 'COM']
-        return [n for n in net_names if any(kw in n.upper() for kw in gnd_keywords)]
-
-    def map_transistor_bridges(self, gnd_nets):
-        """Identify nets connected to GND via a transistor switch."""
-        switchable_gnd_nets = set()
-        for des, comp_data in self.netlist.components.items():
-            if des.startswith('Q') or des.startswith('TR'):
-                pin_mapping = self.netlist.get_component_nets(des)
-                comp_nets = [n for n in pin_mapping.values() if n]
-                if any(net in gnd_nets for net in comp_nets):
-                    for net in comp_nets:
-                        if net not in gnd_nets:
-                            switchable_gnd_nets.add(net)
-        return switchable_gnd_nets
-
     def run(self):
         print("[Debug] run() method called - starting analysis...")
         try:
             print(f"\n--- Starting V2.0 Worst-Case Analysis ---\nTarget: {os.path.basename(self.netlist_path)}")
             
-            # [Step 1] Parsing
-            self.netlist.parse()
-            net_names = list(self.netlist.nets.keys())
-            print(f"[Step 1] Parsed netlist: {len(self.netlist.components)} components, {len(net_names)} nets")
+            # [Step 1] Parsing (already done in __init__, possibly from cache)
+            net_names = self.session.net_names
+            source = " (cached)" if self.netlist.from_cache else ""
+            print(f"[Step 1] Parsed netlist{source}: {len(self.netlist.components)} components, {len(net_names)} nets")
+            integrity = self.session.integrity_findings
+            integrity_fails = sum(1 for f in integrity if f['Severity'] == 'FAIL')
+            print(f"  - Netlist integrity: {len(integrity)} findings ({integrity_fails} FAIL).")
             
             # [Step 2] GND & Transistor Bridge Detection
-            gnd_nets = self.identify_gnd_nets(net_names)
-            switchable_gnd = self.map_transistor_bridges(gnd_nets)
+            gnd_nets = self.session.gnd_nets
+            switchable_gnd = self.session.switchable_nodes
             print(f"  - Detected {len(gnd_nets)} GND nets.")
             print(f"  - Detected {len(switchable_gnd)} Switchable GND nodes (via Transistors).")
 
             # [Step 3] Voltage Detection
-            candidates = self.voltage_detector.detect_candidates(net_names)
+            candidates = self.session.voltage_candidates
             if candidates:
                 print(f"[Step 3] {len(candidates)} potential voltage points detected. Opening confirmation UI...")
-                confirm_gui = VoltageConfirmationList(self.root, candidates, available_nets=net_names)
+                confirm_gui = VoltageConfirmationList(self.root, candidates, available_nets=net_names,
+                                                      roles=self.session.name_roles)
                 self.root.wait_window(confirm_gui.top)
                 confirmed = confirm_gui.results
                 for net, info in confirmed.items():
                     if info['action'] == 'confirm':
-                        self.voltage_detector.add_confirmed(net, info['voltage'])
+                        self.session.confirm_voltage(net, info['voltage'])
 
             # [Step 4] Worst-Case Analysis
             print("[Step 4] Running Worst-Case Power Analysis...")
-            confirmed_voltages = self.voltage_detector.get_analysis_state()
-            print(f"  - Confirmed voltages: {confirmed_voltages}")
-            results = []
-            
-            # Prefixes from designator_mapping.md
-            analysis_prefixes = ['R', 'C', 'L']
-            all_prefixes = ['R', 'C', 'J', 'CN', 'IC', 'U', 'D', 'TR', 'Q', 'L', 'FL', 'X']
+            print(f"  - Confirmed voltages: {self.session.confirmed_voltages}")
+            confirmed_voltages, conflicts = self.session.propagation
+            extra = len(confirmed_voltages) - len(self.session.confirmed_voltages)
+            print(f"  - Propagated through series parts to {extra} more nets "
+                  f"({len(self.session.rail_propagator.links)} 0R/FB/FL/L links).")
+            for c in conflicts:
+                print(f"  [Warning] Rail conflict: {c['nets'][0]}={c['voltages'][0]}V vs "
+                      f"{c['nets'][1]}={c['voltages'][1]}V are joined by series parts")
+            node_voltages = self.session.node_voltages
+            print(f"  - DC operating point: {len(node_voltages)} nets solved "
+                  f"from {len(self.session.dc_solver.resistors)} resistors.")
+            terminal_stress = self.session.terminal_stress
+            high_side = self.session.high_side_nodes
+            print(f"  - Detected {len(high_side)} high-side switched nodes (via Transistors).")
+            switchable_gnd = switchable_gnd | high_side
+            net_roles = self.session.net_roles
+            role_counts = ", ".join(f"{n} {c}" for n, c in net_roles.counts().items())
+            print(f"  - Net roles: {role_counts}")
+            variants = self.session.variants
+            variant_points = self.session.variant_operating_points
+            if variants is not None:
+                print(f"  - Variants: {', '.join(variants.variants)} "
+                      f"({len(variant_points)} distinct DC networks)")
+            # Designator prefix -> rating rule, from the "rules" in component_database.json
+            rules = self.session.rule_engine
+            # Components grouped by rule, so each rule is rated in one batch
+            batches = {}
             
             for des, comp_data in self.netlist.components.items():
                 try:
@@ -145,80 +161,73 @@ class RatingVerificationAppV2:
                     if not prefix_match: continue
                     prefix = prefix_match.group(1)
                     
-                    if prefix not in all_prefixes: continue
+                    rule = rules.rule_for(prefix)
+                    if rule is None: continue
                     
-                    pin_mapping = self.netlist.get_component_nets(des)
+                    pin_mapping = self.netlist.pin_index.get(des, {})
                     comp_nets = [n for n in pin_mapping.values() if n]
+                    is_on_switchable_node = any(net in switchable_gnd for net in comp_nets)
                     
-                    power_v = 0.0
-                    is_on_switchable_node = False
-                    
-                    for net in comp_nets:
-                        if net in confirmed_voltages:
-                            power_v = max(power_v, confirmed_voltages[net])
-                        if net in switchable_gnd:
-                            is_on_switchable_node = True
-                    
-                    applied_v = power_v
-                    comp_info = {**comp_data, 'designator': des, 'type': prefix}
-                    
-                    if prefix == 'C':
-                        res = self.analyzer.analyze_capacitor(comp_info, applied_v)
-                    elif prefix == 'R':
-                        res = self.analyzer.analyze_resistor(comp_info, applied_v)
-                    elif prefix == 'L':
-                        res = self.analyzer.analyze_inductor(comp_info, 0.0) # Placeholder for current
-                    else:
-                        # General audit for other components (J, U, D, etc.)
-                        audit = self.analyzer.audit_component(comp_info)
-                        res = {
-                            'Designator': des,
-                            'Type': prefix,
-                            'Verdict': 'OK' if audit['AuditVerdict'] == 'OK' else audit['AuditVerdict'],
-                            'Applied': '-',
-                            'Rating': '-',
-                            'Derated': '-',
-                            'Reason': 'Audit Only',
-                            **audit
-                        }
-                    
-                    # Metadata override
-                    res['Type'] = prefix
-                    res['Description'] = comp_data.get('DESCRIPTION') or comp_data.get('PARTTYPE') or '-'
-                    res['Footprint'] = comp_data.get('FOOTPRINT', '-')
-                    
-                    # ENHANCED V2.0 LOGIC:
-                    if is_on_switchable_node and prefix in analysis_prefixes:
-                        if applied_v > 0:
-                            # If NOK on switching path, require user review; if OK, mark as switching
-                            if res['Verdict'].startswith('NOK'):
-                                res['Verdict'] = "User Review Required"
-                                res['Reason'] = f"[Switching Path - NOK] {res.get('Reason', '')} - Requires manual verification"
-                            else:
-                                res['Verdict'] = res['Verdict'] + " (Switching)"
-                                res['Reason'] = f"[Switching Path] {res.get('Reason', '')}"
-                        elif res['Verdict'] == 'OK':
-                            res['Reason'] = "(Switching Node found but NO supply V detected/confirmed)"
-                        
-                    results.append(res)
+                    applied_v = self._applied_voltage(des, comp_nets, node_voltages, terminal_stress)
+                    batches.setdefault(rule, []).append(
+                        (des, prefix, comp_data, comp_nets, is_on_switchable_node, applied_v))
                 except Exception as e:
                     print(f"  [Warning] Skipping {des}: {e}")
 
+            analyzed = {}
+            for rule, members in batches.items():
+                try:
+                    comps = [{**comp_data, 'designator': des, 'type': prefix}
+                             for des, prefix, comp_data, *_ in members]
+                    batch = rules.analyze_batch(rule, comps, [m[-1] for m in members])
+                except Exception as e:
+                    print(f"  [Warning] Skipping {len(members)} {rule.name} parts: {e}")
+                    continue
+                for res, (des, prefix, comp_data, comp_nets, is_on_switchable_node, applied_v) in zip(batch, members):
+                    try:
+                        self._mark_switching(res, rule, applied_v, is_on_switchable_node)
+                        
+                        # Metadata override
+                        res.type = prefix
+                        res.description = comp_data.get('DESCRIPTION') or comp_data.get('PARTTYPE') or '-'
+                        res.footprint = comp_data.get('FOOTPRINT', '-')
+                        res.net_roles = ", ".join(sorted({net_roles.role_name(n) for n in comp_nets})) or '-'
+                        
+                        if variants is not None:
+                            self._add_variant_verdicts(res, des, rule, prefix, comp_data, comp_nets,
+                                                       is_on_switchable_node, variants, variant_points)
+                        analyzed[des] = res
+                    except Exception as e:
+                        print(f"  [Warning] Skipping {des}: {e}")
+            results = [analyzed[des] for des in self.netlist.components if des in analyzed]
+
             print(f"[Step 4] Analysis complete: {len(results)} components analyzed")
+            cache = self.analyzer.cache_stats()
+            print(f"  - Part cache: {cache['parts']} unique parts, {cache['hits']} hits / "
+                  f"{cache['misses']} misses ({cache['hit_rate']:.0%})")
+            rail_summary = self.session.rail_decoupling
+            print(f"  - Rail decoupling summary: {len(rail_summary)} rails")
 
             # [Step 5] Pre-test Summary
             print("\n--- PRE-TEST SUMMARY ---")
-            lib_errors = [r for r in results if r.get('AuditVerdict') == 'FAIL']
-            derating_errors = [r for r in results if r.get('Verdict', '').startswith('NOK')]
-            missing_data = [r for r in results if "Missing Data" in r.get('Verdict', '')]
+            lib_errors = [r for r in results if r.audit == AuditCode.FAIL]
+            derating_errors = [r for r in results if r.verdict == Verdict.NOK]
+            missing_data = [r for r in results if r.verdict == Verdict.MISSING_DATA]
             
             print(f"  - Library / Footprint Issues: {len(lib_errors)}")
             print(f"  - Derating Violations: {len(derating_errors)}")
             print(f"  - Components Missing Ratings: {len(missing_data)}")
+            print(f"  - Netlist Integrity Findings: {len(integrity)}")
+            if variants is not None:
+                for name in variants.variants:
+                    entries = [r.variant_verdicts.get(name) for r in results]
+                    nok = sum(1 for e in entries if e and e[0] in VIOLATIONS)
+                    dnp = sum(1 for e in entries if e and e[0] == Verdict.DNP)
+                    print(f"  - Variant {name}: {nok} NOK / review, {dnp} DNP")
             if lib_errors:
                 print("  [Sample Library Errors]:")
                 for r in lib_errors[:3]:
-                    print(f"    * {r['Designator']}: {r['AuditReason']}")
+                    print(f"    * {r.designator}: {r.audit_reason}")
             print("------------------------\n")
 
             # [Step 5] Reporting
@@ -226,8 +235,8 @@ class RatingVerificationAppV2:
                 print(f"[Step 5] Generating Reports...")
                 print(f"  - Excel: {self.excel_output}")
                 print(f"  - HTML: {self.html_output}")
-                self.excel_gen.generate(results)
-                self.html_gen.generate(results)
+                self.excel_gen.generate(results, integrity, rail_summary)
+                self.html_gen.generate(results, integrity, rail_summary)
                 print(f"  ✓ Reports generated successfully!")
                 
                 dashboard = RatingsDashboard(self.root, results)
@@ -246,8 +255,66 @@ class RatingVerificationAppV2:
             if self.root.winfo_exists():
                 self.root.destroy()
 
+    def _applied_voltage(self, des, comp_nets, node_voltages, terminal_stress):
+        power_v = 0.0
+        for net in comp_nets:
+            if net in node_voltages:
+                power_v = max(power_v, node_voltages[net])
+        # Two-pin parts are stressed by the pin-to-pin difference, not the highest rail;
+        # None when neither pin has a known voltage
+        if des in terminal_stress:
+            return terminal_stress[des]
+        return power_v
+
+    def _analyze_component(self, des, rule, prefix, comp_data, applied_v, is_on_switchable_node):
+        comp_info = {**comp_data, 'designator': des, 'type': prefix}
+        res = self.session.rule_engine.analyze(rule, comp_info, applied_v)
+        self._mark_switching(res, rule, applied_v, is_on_switchable_node)
+        return res
+
+    def _mark_switching(self, res, rule, applied_v, is_on_switchable_node):
+        # ENHANCED V2.0 LOGIC:
+        if is_on_switchable_node and rule.rated:
+            if applied_v is not None and applied_v > 0:
+                # If NOK on switching path, require user review; if OK, mark as switching
+                if res.verdict == Verdict.NOK:
+                    res.verdict = Verdict.REVIEW
+                else:
+                    res.switching = True
+            elif res.verdict == Verdict.OK:
+                res.note = "(Switching Node found but NO supply V detected/confirmed)"
+
+    def _add_variant_verdicts(self, res, des, rule, prefix, comp_data, comp_nets, is_on_switchable_node,
+                              variants, variant_points):
+        """Fills res.variant_verdicts per variant, analyzing each distinct case once."""
+        verdicts = {}
+        res.variant_verdicts = dict.fromkeys(variants.variants)
+        for point_mask, node_voltages, terminal_stress in variant_points:
+            for mask, state in variants.groups(des):
+                shared = point_mask & mask
+                if not shared:
+                    continue
+                if state is DNP:
+                    verdict = (Verdict.DNP, False)
+                else:
+                    applied_v = self._applied_voltage(des, comp_nets, node_voltages, terminal_stress)
+                    key = (state, applied_v)
+                    if key not in verdicts:
+                        data = comp_data if state is None else substitute(comp_data, state)
+                        variant_res = self._analyze_component(des, rule, prefix, data, applied_v,
+                                                              is_on_switchable_node)
+                        verdicts[key] = (variant_res.verdict, variant_res.switching)
+                    verdict = verdicts[key]
+                for name in variants.names(shared):
+                    res.variant_verdicts[name] = verdict
+
 if __name__ == "__main__":
-    default_net = r"c:\Users\fikre\Documents\PlatformIO\Projects\Auto_Altium\NX_Orin.NET"
-    if not os.path.exists(default_net): default_net = None
-    app = RatingVerificationAppV2(default_net)
+    import argparse
+    cli = argparse.ArgumentParser(description="Rating Verification V2.0")
+    cli.add_argument('netlist', nargs='?', help="Netlist (.NET, .NET.gz or .zip)")
+    cli.add_argument('--variants', help="Assembly variant CSV (Variant,Designator,Status,Value)")
+    args = cli.parse_args()
+    default_net = args.netlist or r"c:\Users\fikre\Documents\PlatformIO\Projects\Auto_Altium\NX_Orin.NET"
+    if not os.path.exists(source_file(default_net)): default_net = None
+    app = RatingVerificationAppV2(default_net, args.variants)
     app.run()
@@ -0,0 +1,60 @@
+from typing import Dict
+
+import numpy as np
+
+from analyzers.rating_result import Verdict
+
+# Verdicts a batch can produce, in report order
+BATCH_VERDICTS = (Verdict.NOK, Verdict.MARGINAL, Verdict.OK, Verdict.UNKNOWN)
+
+
+def batch_verdicts(applied, rating, derating_factor, marginal_threshold) -> 'BatchVerdicts':
+    """
+    Vectorized PassiveRatingAnalyzer.get_verdict(): NOK above the raw or the
+    derated rating, MARGINAL from `marginal_threshold` of the derated rating,
+    UNKNOWN where the rating is missing (<= 0) or the applied stress is NaN.
+    `derating_factor` and `marginal_threshold` are arrays with one entry per
+    row (e.g. from each row's rule) or one value for the whole batch.
+    """
+    applied = np.abs(np.asarray(applied, dtype=float))
+    rating = np.asarray(rating, dtype=float)
+    derated = rating * np.broadcast_to(np.asarray(derating_factor, dtype=float), rating.shape)
+    threshold = np.broadcast_to(np.asarray(marginal_threshold, dtype=float), rating.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(derated > 0, applied / derated, np.inf)
+
+    verdicts = np.full(rating.shape, Verdict.OK, dtype=np.int8)
+    verdicts[ratio >= threshold] = Verdict.MARGINAL
+    verdicts[(ratio > 1.0) | (applied > rating)] = Verdict.NOK
+    verdicts[~(rating > 0) | np.isnan(applied)] = Verdict.UNKNOWN
+    return BatchVerdicts(applied, rating, derated, ratio, verdicts)
+
+
+class BatchVerdicts:
+    """
+    Verdicts for one batch of components, held as arrays of numbers.
+    PassiveRatingAnalyzer.rate() turns rows into RatingResult records; the
+    text is produced by the report writers.
+    """
+    __slots__ = ('applied', 'rating', 'derated', 'ratio', 'verdicts')
+
+    def __init__(self, applied: np.ndarray, rating: np.ndarray, derated: np.ndarray,
+                 ratio: np.ndarray, verdicts: np.ndarray):
+        self.applied = applied
+        self.rating = rating
+        self.derated = derated
+        self.ratio = ratio
+        self.verdicts = verdicts
+
+    def __len__(self) -> int:
+        return len(self.verdicts)
+
+    def verdict(self, row: int) -> Verdict:
+        return Verdict(int(self.verdicts[row]))
+
+    def rows_with(self, verdict: Verdict) -> np.ndarray:
+        return np.flatnonzero(self.verdicts == verdict)
+
+    def counts(self) -> Dict[Verdict, int]:
+        tally = np.bincount(self.verdicts, minlength=len(Verdict))
+        return {verdict: int(tally[verdict]) for verdict in BATCH_VERDICTS}
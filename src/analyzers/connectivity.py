@@ -0,0 +1,151 @@
+from collections import deque
+from typing import Dict, List, Set, Optional, Iterable, Tuple
+
+from analyzers.voltage_propagation import designator_prefix
+
+
+class ConnectivityIndex:
+    """
+    Indexed connectivity queries over a parsed netlist.
+
+    Nets and components get integer IDs and the bipartite net <-> component
+    graph is stored as adjacency lists, built in one pass over the pin index.
+    Lookups ("what is on net X", "which nets does U12 touch") are then
+    dictionary hits, and path / k-hop queries are breadth-first searches
+    that touch only the part of the graph they reach.
+
+    Graph searches skip `exclude_nets` (GND and big rails would otherwise
+    make every part a neighbor of every other part).
+    """
+
+    def __init__(self, netlist):
+        self.netlist = netlist
+        self.net_names: List[str] = netlist.get_net_names()
+        self.net_ids: Dict[str, int] = {n: i for i, n in enumerate(self.net_names)}
+        self.designators: List[str] = list(netlist.pin_index.keys())
+        self.designator_ids: Dict[str, int] = {d: i for i, d in enumerate(self.designators)}
+        self.net_comps: List[List[int]] = [[] for _ in self.net_names]
+        self.comp_nets: List[List[int]] = []
+
+        for cid, des in enumerate(self.designators):
+            nets = []
+            for net in dict.fromkeys(self.netlist.pin_index[des].values()):
+                nid = self.net_ids.get(net)
+                if nid is not None:
+                    nets.append(nid)
+                    self.net_comps[nid].append(cid)
+            self.comp_nets.append(nets)
+
+    def _excluded(self, exclude_nets: Iterable[str]) -> Set[int]:
+        return {self.net_ids[n] for n in exclude_nets if n in self.net_ids}
+
+    # --- Membership ---
+    def pins_of(self, designator: str) -> Dict[str, str]:
+        """pin -> net for a component."""
+        return dict(self.netlist.pin_index.get(designator, {}))
+
+    def nets_of(self, designator: str) -> List[str]:
+        """Distinct nets a component touches, in pin order."""
+        cid = self.designator_ids.get(designator)
+        if cid is None:
+            return []
+        return [self.net_names[n] for n in self.comp_nets[cid]]
+
+    def members(self, net_name: str) -> List[Tuple[str, str]]:
+        """(designator, pin) pairs on a net."""
+        return list(self.netlist.get_net_members(net_name))
+
+    def components_on(self, net_name: str) -> List[str]:
+        """Distinct components on a net."""
+        nid = self.net_ids.get(net_name)
+        if nid is None:
+            return []
+        return [self.designators[c] for c in self.net_comps[nid]]
+
+    # --- Neighborhood queries ---
+    def neighbors(self, designator: str, exclude_nets: Iterable[str] = ()) -> Set[str]:
+        """Components sharing at least one net with `designator`."""
+        return self.k_hop(designator, 1, exclude_nets)
+
+    def between(self, net_a: str, net_b: str, prefixes: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Components with pins on both nets, e.g. between('3V3', 'GND', ('C',))
+        for the decoupling caps of a rail.
+        """
+        on_b = set(self.components_on(net_b))
+        wanted = set(prefixes) if prefixes is not None else None
+        return [d for d in self.components_on(net_a)
+                if d in on_b and (wanted is None or designator_prefix(d) in wanted)]
+
+    def k_hop(self, designator: str, k: int, exclude_nets: Iterable[str] = ()) -> Set[str]:
+        """Components reachable from `designator` through at most k shared nets."""
+        start = self.designator_ids.get(designator)
+        if start is None:
+            return set()
+        blocked = self._excluded(exclude_nets)
+        seen_comp = {start}
+        seen_net = set(blocked)
+        frontier = [start]
+        for _ in range(k):
+            nxt = []
+            for c in frontier:
+                for n in self.comp_nets[c]:
+                    if n in seen_net:
+                        continue
+                    seen_net.add(n)
+                    for other in self.net_comps[n]:
+                        if other not in seen_comp:
+                            seen_comp.add(other)
+                            nxt.append(other)
+            if not nxt:
+                break
+            frontier = nxt
+        seen_comp.discard(start)
+        return {self.designators[c] for c in seen_comp}
+
+    def path(self, net_a: str, net_b: str, exclude_nets: Iterable[str] = (),
+             via_prefixes: Optional[Iterable[str]] = None) -> Optional[List[str]]:
+        """
+        Shortest net-component-net-... chain from net_a to net_b, alternating
+        net names and designators, or None if they are not connected.
+        `via_prefixes` limits the components a path may pass through
+        (e.g. ('R', 'L', 'FB') for a series path).
+        """
+        src, dst = self.net_ids.get(net_a), self.net_ids.get(net_b)
+        if src is None or dst is None:
+            return None
+        if src == dst:
+            return [net_a]
+        wanted = set(via_prefixes) if via_prefixes is not None else None
+        blocked = self._excluded(exclude_nets) - {src, dst}
+        # net id -> (previous net id, component id)
+        came_from = {src: None}
+        used = set()
+        queue = deque([src])
+        while queue:
+            n = queue.popleft()
+            for c in self.net_comps[n]:
+                if c in used:
+                    continue
+                used.add(c)
+                if wanted is not None and designator_prefix(self.designators[c]) not in wanted:
+                    continue
+                for m in self.comp_nets[c]:
+                    if m in came_from or m in blocked:
+                        continue
+                    came_from[m] = (n, c)
+                    if m == dst:
+                        return self._unwind(came_from, dst)
+                    queue.append(m)
+        return None
+
+    def _unwind(self, came_from, dst: int) -> List[str]:
+        chain = [self.net_names[dst]]
+        step = came_from[dst]
+        while step is not None:
+            n, c = step
+            chain.append(self.designators[c])
+            chain.append(self.net_names[n])
+            step = came_from[n]
+        chain.reverse()
+        return chain
@@ -0,0 +1,277 @@
+from typing import Dict, Iterable, List, Optional, Callable
+
+import numpy as np
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.linalg import spsolve
+except ImportError:  # scipy is optional; the conjugate-gradient fallback is used instead
+    coo_matrix = None
+
+from analyzers.voltage_propagation import RailPropagator, UnionFind, designator_prefix
+
+CG_TOLERANCE = 1e-10
+
+# Designator prefixes of parts that are open at DC and draw no current
+OPEN_AT_DC = ('C',)
+
+
+class DCSolver:
+    """
+    DC operating point of the resistor network.
+
+    Nets merged into one rail domain by the RailPropagator (0R, FB, FL, L are
+    DC shorts) form one node. Every resistor with a parsable value adds a
+    conductance between its two nodes. Confirmed rails and GND nets are fixed
+    and the remaining nodes are solved from the sparse nodal equations
+    G_uu * v_u = -G_uf * v_f.
+
+    Only resistors are modelled, so a node is solved only when every part on
+    it is a resistor or a capacitor (open at DC), and parts with all pins on
+    the node, like a ferrite bead inside a domain, do not count. A node that
+    also carries an IC, diode, transistor or unparsable part draws an
+    unknown current and is left unknown, together with every node
+    resistively connected to it without passing a fixed node. Unknown and
+    floating nodes get no voltage; worst_case() bounds the unknown ones by
+    the rails they are tied to.
+
+    Designators in `not_fitted` (DNP in an assembly variant) are open
+    circuits: they add no edge, make no node opaque and get no stress.
+    """
+
+    def __init__(self, netlist, resistance_of: Callable[[Dict], Optional[float]],
+                 propagator: Optional[RailPropagator] = None, not_fitted: Iterable[str] = ()):
+        self.netlist = netlist
+        not_fitted = set(not_fitted)
+        self.propagator = propagator or RailPropagator(netlist)
+        self.net_names = self.propagator.net_names
+        uf = self.propagator.uf
+        self.node_of = np.fromiter((uf.find(i) for i in range(len(self.net_names))),
+                                   dtype=np.int64, count=len(self.net_names))
+
+        ids = self.propagator.net_ids
+        a, b, g = [], [], []
+        self.resistors: List[str] = []
+        # Terminal nets of every two-pin part (-1 = unconnected), for terminal_stress()
+        self.two_terminal: List[str] = []
+        term_a, term_b = [], []
+        # Nodes with a member other than a modelled resistor, and (part, node)
+        # pairs of those members for worst_case()
+        self.opaque = np.zeros(len(self.net_names), dtype=bool)
+        self.opaque_parts: List[str] = []
+        part_of, part_node = [], []
+        for des, pins in netlist.pin_index.items():
+            if des in not_fitted:
+                continue
+            nets = list(pins.values())
+            if len(pins) == 2:
+                self.two_terminal.append(des)
+                term_a.append(ids.get(nets[0], -1))
+                term_b.append(ids.get(nets[1], -1))
+                if self._add_resistor(des, nets, resistance_of, a, b, g):
+                    continue
+            if designator_prefix(des) in OPEN_AT_DC:
+                continue
+            nodes = {int(self.node_of[ids[n]]) for n in nets if n in ids}
+            if len(pins) < 2 or len(nodes) > 1:
+                self.opaque[list(nodes)] = True
+                part_of += [len(self.opaque_parts)] * len(nodes)
+                part_node += nodes
+                self.opaque_parts.append(des)
+        self.edge_a = np.array(a, dtype=np.int64)
+        self.edge_b = np.array(b, dtype=np.int64)
+        self.edge_g = np.array(g, dtype=np.float64)
+        self.term_a = np.array(term_a, dtype=np.int64)
+        self.term_b = np.array(term_b, dtype=np.int64)
+        self.part_of = np.array(part_of, dtype=np.int64)
+        self.part_node = np.array(part_node, dtype=np.int64)
+        self.iterations = 0
+
+    def _add_resistor(self, des, nets, resistance_of, a, b, g) -> bool:
+        """Adds a resistor edge; False if `des` is not a modelled resistor."""
+        if designator_prefix(des) != 'R' or not all(nets):
+            return False
+        comp = self.netlist.components.get(des)
+        if comp is None:  # on nets but never declared (see NetlistIntegrityAnalyzer)
+            return False
+        ids = self.propagator.net_ids
+        na, nb = self.node_of[ids[nets[0]]], self.node_of[ids[nets[1]]]
+        if na == nb:
+            return True
+        resistance = resistance_of({**comp, 'designator': des})
+        if not resistance or resistance <= 0:
+            return False
+        a.append(na)
+        b.append(nb)
+        g.append(1.0 / resistance)
+        self.resistors.append(des)
+        return True
+
+    def _groups(self, is_fixed: np.ndarray) -> np.ndarray:
+        """Root of every node's resistor-connected group, not passing fixed nodes."""
+        n = len(self.net_names)
+        ea, eb = self.edge_a, self.edge_b
+        free = ~is_fixed[ea] & ~is_fixed[eb]
+        uf = UnionFind(n)
+        for x, y in zip(ea[free].tolist(), eb[free].tolist()):
+            uf.union(x, y)
+        return np.fromiter((uf.find(i) for i in range(n)), dtype=np.int64, count=n)
+
+    def _solvable(self, is_fixed: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        """
+        Mask of free nodes whose voltage the resistor network determines:
+        their group touches a fixed node and contains no opaque node.
+        """
+        n = len(self.net_names)
+        ea, eb = self.edge_a, self.edge_b
+        anchored = np.zeros(n, dtype=bool)
+        anchored[roots[ea[is_fixed[eb] & ~is_fixed[ea]]]] = True
+        anchored[roots[eb[is_fixed[ea] & ~is_fixed[eb]]]] = True
+        tainted = np.zeros(n, dtype=bool)
+        tainted[roots[self.opaque & ~is_fixed]] = True
+        return anchored[roots] & ~tainted[roots] & ~is_fixed
+
+    def _fixed_nodes(self, fixed: Dict[str, float]):
+        ids = self.propagator.net_ids
+        voltage = np.zeros(len(self.net_names))
+        is_fixed = np.zeros(len(self.net_names), dtype=bool)
+        for net, v in fixed.items():
+            if net in ids:
+                node = self.node_of[ids[net]]
+                voltage[node] = v
+                is_fixed[node] = True
+        return voltage, is_fixed
+
+    def solve(self, fixed: Dict[str, float]) -> Dict[str, float]:
+        """Returns net -> DC voltage for every fixed or solvable net."""
+        n = len(self.net_names)
+        ids = self.propagator.net_ids
+        voltage, is_fixed = self._fixed_nodes(fixed)
+        if not is_fixed.any():
+            return {}
+
+        unknown = self._solvable(is_fixed, self._groups(is_fixed))
+        index = np.full(n, -1, dtype=np.int64)
+        index[unknown] = np.arange(int(unknown.sum()))
+        m = int(unknown.sum())
+
+        if m:
+            ia, ib, g = index[self.edge_a], index[self.edge_b], self.edge_g
+            diag = (np.bincount(ia[ia >= 0], g[ia >= 0], minlength=m)
+                    + np.bincount(ib[ib >= 0], g[ib >= 0], minlength=m))
+            # Currents injected by fixed neighbours
+            rhs = (np.bincount(ia[(ia >= 0) & (ib < 0)],
+                               (g * voltage[self.edge_b])[(ia >= 0) & (ib < 0)], minlength=m)
+                   + np.bincount(ib[(ib >= 0) & (ia < 0)],
+                                 (g * voltage[self.edge_a])[(ib >= 0) & (ia < 0)], minlength=m))
+            both = (ia >= 0) & (ib >= 0)
+            voltage[unknown] = self._solve_system(diag, ia[both], ib[both], g[both], rhs)
+
+        result = {}
+        solved = is_fixed | unknown
+        for i, net in enumerate(self.net_names):
+            node = self.node_of[i]
+            if solved[node]:
+                result[net] = float(voltage[node])
+        # Explicit values win over their domain's value
+        result.update((net, v) for net, v in fixed.items() if net in ids)
+        return result
+
+    def worst_case(self, fixed: Dict[str, float]) -> Dict[str, float]:
+        """
+        Net -> worst-case voltage magnitude for every net solve() leaves
+        unknown: the largest |V| of the fixed nodes its resistor-connected
+        group reaches, either through a resistor (the rail of a pull-up or
+        divider) or through another pin of a part on the group (the supply
+        rails of an IC driving the net). Groups that reach no fixed node are
+        omitted.
+        """
+        voltage, is_fixed = self._fixed_nodes(fixed)
+        if not is_fixed.any():
+            return {}
+        roots = self._groups(is_fixed)
+        ea, eb = self.edge_a, self.edge_b
+        bound = np.full(len(self.net_names), np.nan)
+        into_a = is_fixed[eb] & ~is_fixed[ea]
+        into_b = is_fixed[ea] & ~is_fixed[eb]
+        np.fmax.at(bound, roots[ea[into_a]], np.abs(voltage[eb[into_a]]))
+        np.fmax.at(bound, roots[eb[into_b]], np.abs(voltage[ea[into_b]]))
+        # Highest fixed pin of every non-resistor part, applied to its free pins
+        pin_fixed = is_fixed[self.part_node]
+        part_max = np.full(len(self.opaque_parts), np.nan)
+        np.fmax.at(part_max, self.part_of[pin_fixed], np.abs(voltage[self.part_node[pin_fixed]]))
+        np.fmax.at(bound, roots[self.part_node[~pin_fixed]], part_max[self.part_of[~pin_fixed]])
+        bound = bound[roots]
+        unknown = ~is_fixed & ~self._solvable(is_fixed, roots) & ~np.isnan(bound)
+        return {net: float(bound[node]) for net, node in zip(self.net_names, self.node_of.tolist())
+                if unknown[node]}
+
+    def _solve_system(self, diag, rows, cols, g, rhs) -> np.ndarray:
+        m = len(diag)
+        if coo_matrix is not None:
+            r = np.concatenate([np.arange(m), rows, cols])
+            c = np.concatenate([np.arange(m), cols, rows])
+            data = np.concatenate([diag, -g, -g])
+            self.iterations = 0
+            return np.atleast_1d(spsolve(coo_matrix((data, (r, c)), shape=(m, m)).tocsr(), rhs))
+        return self._conjugate_gradient(diag, rows, cols, g, rhs)
+
+    def _conjugate_gradient(self, diag, rows, cols, g, rhs) -> np.ndarray:
+        """Jacobi-preconditioned CG on the symmetric positive definite nodal matrix."""
+        m = len(diag)
+
+        def matvec(x):
+            return (diag * x
+                    - np.bincount(rows, g * x[cols], minlength=m)
+                    - np.bincount(cols, g * x[rows], minlength=m))
+
+        inv_diag = 1.0 / diag
+        x = rhs * inv_diag
+        r = rhs - matvec(x)
+        z = r * inv_diag
+        p = z.copy()
+        rz = r @ z
+        limit = CG_TOLERANCE * max(np.linalg.norm(rhs), 1e-30)
+        self.iterations = 0
+        for self.iterations in range(1, 10 * m + 1):
+            if np.linalg.norm(r) <= limit:
+                break
+            ap = matvec(p)
+            alpha = rz / (p @ ap)
+            x += alpha * p
+            r -= alpha * ap
+            z = r * inv_diag
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+        return x
+
+    def terminal_stress(self, node_voltages: Dict[str, float],
+                        worst_case: Optional[Dict[str, float]] = None) -> Dict[str, Optional[float]]:
+        """
+        Terminal-to-terminal voltage of every two-pin part in one vectorized
+        pass: |V1 - V2| when both pins are known. When one pin is known, the
+        other takes its worst-case rail magnitude from `worst_case` (see
+        worst_case()) and the stress is the larger of the two, so a pull-up
+        into an IC pin or a capacitor from an IC pin to GND sees the full
+        rail. When neither pin is known the stress is None (unknown): no
+        rail-to-rail drop is assumed between two unsolved nets.
+        """
+        ids = self.propagator.net_ids
+        # Slot n stays NaN and absorbs unconnected (-1) terminals
+        v = np.full(len(self.net_names) + 1, np.nan)
+        bound = np.full(len(self.net_names) + 1, np.nan)
+        for values, target in ((node_voltages, v), (worst_case or {}, bound)):
+            for net, value in values.items():
+                i = ids.get(net)
+                if i is not None:
+                    target[i] = value
+        va, vb = v[self.term_a], v[self.term_b]
+        known_a, known_b = ~np.isnan(va), ~np.isnan(vb)
+        ba = np.where(known_a, np.abs(va), bound[self.term_a])
+        bb = np.where(known_b, np.abs(vb), bound[self.term_b])
+        with np.errstate(invalid='ignore'):
+            stress = np.where(known_a & known_b, np.abs(va - vb),
+                              np.where(known_a | known_b, np.fmax(ba, bb), np.nan))
+        return {des: None if value != value else value
+                for des, value in zip(self.two_terminal, stress.tolist())}
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Iterable, Tuple
+
+from analyzers.value_lexer import SIZE_CODES, Quantities
+from analyzers.voltage_propagation import designator_prefix
+
+
+def package_of(comp: Dict, q: Quantities) -> str:
+    """EIA size code from the footprint (or the part text), else the footprint name."""
+    if q.footprint_size in SIZE_CODES:
+        return q.footprint_size
+    if q.sizes:
+        return q.sizes[0]
+    return str(comp.get('FOOTPRINT', '') or '') or '?'
+
+
+def format_farads(value: float) -> str:
+    for scale, unit in ((1e-6, 'uF'), (1e-9, 'nF')):
+        if value >= scale:
+            return f"{value / scale:.4g}{unit}"
+    return f"{value / 1e-12:.4g}pF"
+
+
+class RailDecouplingAggregator:
+    """
+    Per-rail decoupling summary: number of capacitors between each rail and
+    GND, their total nominal capacitance, and counts per voltage rating and
+    per package.
+
+    Capacitance, rating and package come from the analyzer's part cache,
+    so each unique part is lexed once. One grouped pass over the pin index
+    assigns each two-pin capacitor with one pin on GND to the rail on its
+    other pin.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+
+    def part_info(self, comp: Dict) -> Tuple[Optional[float], float, str]:
+        """(capacitance F or None, voltage rating V or 0, package)."""
+        q = self.analyzer.quantities(comp)
+        return q.first('capacitance'), q.first('voltage', 0.0), package_of(comp, q)
+
+    def aggregate(self, netlist, rail_voltages: Dict[str, float], gnd_nets: Iterable[str],
+                  required: Iterable[str] = ()) -> List[Dict]:
+        """
+        One row per non-zero rail that has decoupling, plus every rail in
+        `required` (e.g. the user-confirmed ones) even if it has none.
+        """
+        gnd = set(gnd_nets)
+        rails = {n: v for n, v in rail_voltages.items() if v != 0 and n not in gnd}
+        groups: Dict[str, List] = {}
+        components = netlist.components
+        for des, pins in netlist.pin_index.items():
+            if len(pins) != 2 or designator_prefix(des) != 'C':
+                continue
+            a, b = pins.values()
+            rail = b if a in gnd else a if b in gnd else None
+            if rail not in rails:
+                continue
+            comp = components.get(des)
+            if comp is not None:
+                groups.setdefault(rail, []).append(self.part_info(comp))
+
+        rows = []
+        for rail in dict.fromkeys([*groups, *(r for r in required if r in rails)]):
+            parts = groups.get(rail, [])
+            total = sum(c for c, _, _ in parts if c)
+            by_rating: Dict[float, int] = {}
+            by_package: Dict[str, int] = {}
+            for _, rating, package in parts:
+                by_rating[rating] = by_rating.get(rating, 0) + 1
+                by_package[package] = by_package.get(package, 0) + 1
+            rated = [r for _, r, _ in parts if r > 0]
+            rows.append({
+                'Rail': rail,
+                'Voltage': rails[rail],
+                'Capacitors': len(parts),
+                'Total Capacitance': format_farads(total) if total else '-',
+                'Total (uF)': round(total * 1e6, 6),
+                'Unparsed Values': sum(1 for c, _, _ in parts if c is None),
+                'Min Rating': f"{min(rated):g}V" if rated else '-',
+                'By Voltage Rating': ", ".join(
+                    f"{f'{r:g}V' if r else '?'} x{n}" for r, n in sorted(by_rating.items())) or '-',
+                'By Package': ", ".join(f"{p} x{n}" for p, n in sorted(by_package.items())) or '-',
+            })
+        rows.sort(key=lambda r: (-r['Voltage'], r['Rail']))
+        return rows
@@ -0,0 +1,97 @@
+from array import array
+from typing import Dict, List, Optional, Iterable
+
+# Role codes stored per net ID
+ROLE_SIGNAL = 0
+ROLE_GROUND = 1
+ROLE_SUPPLY = 2
+ROLE_SWITCHED = 3
+ROLE_NAMES = ('signal', 'ground', 'supply', 'switched')
+
+_NO_VOLTAGE = float('nan')
+
+
+class NetRoleIndex:
+    """
+    Role of every net (ground, supply rail, switched node or signal), with
+    the reason it was assigned and, for ground and supply nets, the voltage
+    suggested by the name.
+
+    Roles and voltages live in arrays keyed by net ID (the position in
+    net_names), so one classification pass serves the voltage detector, the
+    switching detector, the GUI and the reports. from_names() does the
+    name-based pass. with_topology() returns a copy that also marks switched
+    nodes and confirmed rails.
+    """
+
+    def __init__(self, net_names: List[str]):
+        self.net_names = net_names
+        self.net_ids: Dict[str, int] = {n: i for i, n in enumerate(net_names)}
+        self.roles = array('b', bytes(len(net_names)))
+        self.voltages = array('d', [_NO_VOLTAGE]) * len(net_names)
+        # net ID -> reason, for non-signal nets
+        self.reasons: Dict[int, str] = {}
+
+    @classmethod
+    def from_names(cls, net_names: List[str], detector) -> 'NetRoleIndex':
+        """Classifies every net once by name with NetVoltageAnalyzer.classify_name()."""
+        index = cls(net_names)
+        for i, name in enumerate(net_names):
+            role, voltage, reason = detector.classify_name(name)
+            if role != ROLE_SIGNAL:
+                index.roles[i] = role
+                index.voltages[i] = voltage
+                index.reasons[i] = reason
+        return index
+
+    def with_topology(self, switched: Iterable[str] = (),
+                      rail_voltages: Optional[Dict[str, float]] = None) -> 'NetRoleIndex':
+        """
+        Copy with topology-derived roles: nets at a confirmed/propagated
+        voltage become supply (0V: ground), and the remaining non-ground
+        nets reachable through a transistor become switched.
+        """
+        index = NetRoleIndex.__new__(NetRoleIndex)
+        index.net_names, index.net_ids = self.net_names, self.net_ids
+        index.roles = array('b', self.roles)
+        index.voltages = array('d', self.voltages)
+        index.reasons = dict(self.reasons)
+        for net, v in (rail_voltages or {}).items():
+            i = self.net_ids.get(net)
+            if i is None:
+                continue
+            index.roles[i] = ROLE_GROUND if v == 0 else ROLE_SUPPLY
+            index.voltages[i] = v
+            index.reasons[i] = f"Confirmed rail domain at {v:g}V"
+        for net in switched:
+            i = self.net_ids.get(net)
+            if i is not None and index.roles[i] in (ROLE_SIGNAL, ROLE_SWITCHED):
+                index.roles[i] = ROLE_SWITCHED
+                index.reasons[i] = "Connected to GND or a rail through a transistor"
+        return index
+
+    def role_of(self, net_name: str) -> int:
+        i = self.net_ids.get(net_name)
+        return ROLE_SIGNAL if i is None else self.roles[i]
+
+    def role_name(self, net_name: str) -> str:
+        return ROLE_NAMES[self.role_of(net_name)]
+
+    def reason(self, net_name: str) -> str:
+        i = self.net_ids.get(net_name)
+        return self.reasons.get(i, "No ground/supply naming or switching path")
+
+    def voltage_hint(self, net_name: str) -> Optional[float]:
+        i = self.net_ids.get(net_name)
+        if i is None or self.voltages[i] != self.voltages[i]:  # NaN: no hint
+            return None
+        return self.voltages[i]
+
+    def nets_with(self, role: int) -> List[str]:
+        return [n for n, r in zip(self.net_names, self.roles) if r == role]
+
+    def counts(self) -> Dict[str, int]:
+        out = dict.fromkeys(ROLE_NAMES, 0)
+        for r in self.roles:
+            out[ROLE_NAMES[r]] += 1
+        return out
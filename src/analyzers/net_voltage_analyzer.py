@@ -1,5 +1,15 @@
 import re
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
+
+from analyzers.net_roles import ROLE_SIGNAL, ROLE_GROUND, ROLE_SUPPLY
+
+# Substrings that mark a net as Ground/Reference
+GND_KEYWORDS = ['GND', 'VSS', 'REF_0V', 'BAT_NEG', 'COM']
+
+# Priority 1: Numeric patterns like 3V3, 5V, 1.8V, 12V, or even just _3.3_
+_NUM_PATTERN = re.compile(r'(\d+[Vv]\d+|\d+\.\d+[Vv]?|\d+[Vv])', re.IGNORECASE)
+# Priority 2: Keywords like VCC, VDD, VBUS, +5V, +12V
+_MAIN_PATTERN = re.compile(r'(VCC|VDD|VBUS|VSAFE|PWR|DCDC|REG|LDO|VOUT|\+\d+V)', re.IGNORECASE)
 
 class NetVoltageAnalyzer:
     """Detects and confirms voltages on PCB nets based on naming clues."""
@@ -29,14 +39,47 @@ class NetVoltageAnalyzer:
             
         return None
 
-    def detect_candidates(self, net_names: List[str]) -> Dict[str, float]:
-        """Scans net names for potential voltage points and values."""
+    def classify_name(self, name: str) -> Tuple[int, Optional[float], str]:
+        """
+        Role of a net from its name alone: (ROLE_*, suggested voltage, reason).
+        This is the single place the naming rules live; NetRoleIndex runs it
+        once per net and everything else reads the index.
+        """
+        net_upper = name.upper()
+
+        # 1. Identify Ground/Reference
+        for kw in GND_KEYWORDS:
+            if kw in net_upper:
+                return ROLE_GROUND, 0.0, f"Name contains '{kw}'"
+
+        # 2. Search for numeric voltage content first
+        num_match = _NUM_PATTERN.search(name)
+        if num_match:
+            voltage = self._parse_voltage_value(num_match.group(0))
+            if voltage is not None:
+                return ROLE_SUPPLY, voltage, f"Voltage '{num_match.group(0)}' in name"
+
+        # 3. Fallback to keywords
+        kw_match = _MAIN_PATTERN.search(name)
+        if kw_match:
+            # Try to see if there's a number AFTER the keyword like VDD33
+            num_after = re.search(r'\d+', name[kw_match.end():])
+            if num_after:
+               # Attempt to parse as 3.3 or similar if it looks like a common voltage
+               val = num_after.group(0)
+               if len(val) == 2 and val in ['12', '18', '33', '50']:
+                   return ROLE_SUPPLY, float(f"{val[0]}.{val[1]}"), f"Keyword '{kw_match.group(0)}{val}' in name"
+
+            # Default keyword mapping
+            return ROLE_SUPPLY, 3.3, f"Keyword '{kw_match.group(0)}' in name (3.3V assumed)"  # Standard assumption for VCC/VDD
+        return ROLE_SIGNAL, None, ""
+
+    def detect_candidates(self, net_names: List[str], roles=None) -> Dict[str, float]:
+        """
+        Scans net names for potential voltage points and values. With a
+        NetRoleIndex the precomputed roles are used instead of re-classifying.
+        """
         candidates = {}
-        # Priority 1: Numeric patterns like 3V3, 5V, 1.8V, 12V, or even just _3.3_
-        num_pattern = re.compile(r'(\d+[Vv]\d+|\d+\.\d+[Vv]?|\d+[Vv])', re.IGNORECASE)
-        # Priority 2: Keywords like VCC, VDD, VBUS, +5V, +12V
-        main_pattern = re.compile(r'(VCC|VDD|VBUS|VSAFE|PWR|DCDC|REG|LDO|VOUT|\+\d+V)', re.IGNORECASE)
-        
         for name in net_names:
             if name in self.excluded_nets or name in self.current_session_excluded:
                 continue
@@ -45,37 +88,18 @@ class NetVoltageAnalyzer:
             if '%' in name or ',' in name:
                 continue
 
-            net_upper = name.upper()
-            
-            # 1. Identify Ground/Reference
-            if any(kw in net_upper for kw in ['GND', 'VSS', 'REF_0V', 'BAT_NEG', 'COM']):
-                candidates[name] = 0.0
-                continue
-            
-            # 2. Search for numeric voltage content first
-            num_match = num_pattern.search(name)
-            if num_match:
-                voltage = self._parse_voltage_value(num_match.group(0))
-                if voltage is not None:
-                    candidates[name] = voltage
-                    continue
-
-            # 3. Fallback to keywords
-            kw_match = main_pattern.search(name)
-            if kw_match:
-                # Try to see if there's a number AFTER the keyword like VDD33
-                num_after = re.search(r'\d+', name[kw_match.end():])
-                if num_after:
-                   # Attempt to parse as 3.3 or similar if it looks like a common voltage
-                   val = num_after.group(0)
-                   if len(val) == 2 and val in ['12', '18', '33', '50']:
-                       candidates[name] = float(f"{val[0]}.{val[1]}")
-                       continue
-                
-                # Default keyword mapping
-                candidates[name] = 3.3 # Standard assumption for VCC/VDD
+            if roles is not None:
+                voltage = roles.voltage_hint(name)
+            else:
+                voltage = self.classify_name(name)[1]
+            if voltage is not None:
+                candidates[name] = voltage
         return candidates
 
+    def identify_gnd_nets(self, net_names: List[str]) -> List[str]:
+        """Standardizes identification of Ground nets."""
+        return [n for n in net_names if self.classify_name(n)[0] == ROLE_GROUND]
+
     def add_confirmed(self, net_name: str, voltage: float):
         self.confirmed_voltages[net_name] = voltage
 
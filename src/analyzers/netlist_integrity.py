@@ -0,0 +1,66 @@
+from typing import Dict, List
+
+from analyzers.voltage_propagation import designator_prefix
+
+PASSIVE_PREFIXES = ('R', 'C', 'L', 'FB', 'FL')
+
+# Check names, in report order
+CHECK_DUPLICATE = 'Duplicate Designator'
+CHECK_UNKNOWN = 'Unknown Designator'
+CHECK_SHORTED = 'Shorted Passive'
+CHECK_SINGLE_PIN = 'Single-Pin Net'
+CHECK_UNCONNECTED = 'Unconnected Component'
+
+
+class NetlistIntegrityAnalyzer:
+    """
+    Structural checks on a parsed netlist, independent of any voltages:
+    duplicate designators, net pins that reference undeclared designators,
+    two-terminal passives with both pins on one net, single-pin nets and
+    declared components that appear on no net.
+
+    Each check is a single pass over the pin index, the net index or the
+    component table, so the whole run is linear in the netlist size.
+    """
+
+    def analyze(self, netlist) -> List[Dict]:
+        findings = []
+        components = netlist.components
+
+        for des, count in netlist.duplicate_designators.items():
+            findings.append(self._finding(CHECK_DUPLICATE, 'FAIL', des, '-',
+                                          f"Declared in {count} component blocks; only the last one is analyzed"))
+
+        for des, pins in netlist.pin_index.items():
+            if des not in components:
+                nets = sorted(set(pins.values()))
+                findings.append(self._finding(CHECK_UNKNOWN, 'FAIL', des, ", ".join(nets),
+                                              "Net pins reference a designator with no component block"))
+            elif len(pins) == 2 and designator_prefix(des) in PASSIVE_PREFIXES:
+                nets = set(pins.values())
+                if len(nets) == 1:
+                    findings.append(self._finding(CHECK_SHORTED, 'WARNING', des, nets.pop(),
+                                                  "Both pins on the same net"))
+
+        for net, members in netlist.net_members.items():
+            if len(members) == 1:
+                des, pin = members[0]
+                findings.append(self._finding(CHECK_SINGLE_PIN, 'WARNING', f"{des}-{pin}", net,
+                                              "Net connects a single pin"))
+
+        pin_index = netlist.pin_index
+        for des in components:
+            if des not in pin_index:
+                findings.append(self._finding(CHECK_UNCONNECTED, 'WARNING', des, '-',
+                                              "Component is on no net"))
+        return findings
+
+    @staticmethod
+    def _finding(check: str, severity: str, designator: str, net: str, detail: str) -> Dict:
+        return {
+            'Check': check,
+            'Severity': severity,
+            'Designator': designator,
+            'Net': net,
+            'Detail': detail,
+        }
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_MAX_PARTS = 4096
+
+
+class PartCache:
+    """
+    Bounded least-recently-used map from a part key (its normalized
+    value/description/footprint fields) to data derived from it. Designators
+    that share a part share one entry, so parsing is paid once per unique
+    part. Hit and miss counts are kept for reporting.
+    """
+
+    def __init__(self, max_parts: int = DEFAULT_MAX_PARTS):
+        self.max_parts = max_parts
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: Any):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_parts:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'parts': len(self._entries),
+            'max_parts': self.max_parts,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
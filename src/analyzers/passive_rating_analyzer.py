@@ -1,22 +1,55 @@
 import json
 import os
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from analyzers.batch_verdicts import BatchVerdicts, batch_verdicts
+from analyzers.part_cache import PartCache, DEFAULT_MAX_PARTS
+from analyzers.rating_result import RatingInput, RatingResult, Verdict, AuditCode
+from analyzers.rule_engine import validate_database
+from analyzers.value_lexer import Quantities, TEXT_FIELDS, lex_component
+
+# Fields that determine a component's lexed quantities
+LEXED_FIELDS = TEXT_FIELDS + ('FOOTPRINT',)
 
 class PassiveRatingAnalyzer:
     """Analyzes component ratings against applied circuit conditions using a rating database."""
+
+    # Component attributes read by the extractors and audit below, plus the
+    # report metadata (DESCRIPTION/PARTTYPE/FOOTPRINT). Netlist tags use
+    # Altium casing ('Comment', 'Value'); BOM rows use lower case.
+    # Pass to NetlistParser(fields=...) to drop everything else while parsing.
+    COMPONENT_FIELDS = (
+        'DESIGNATOR', 'FOOTPRINT', 'PARTTYPE', 'DESCRIPTION', 'Description',
+        'Library Name', 'Comment', 'Value', 'comment', 'value',
+    )
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, max_cached_parts: int = DEFAULT_MAX_PARTS):
         self.db_path = db_path
         with open(db_path, 'r') as f:
             self.db = json.load(f)
         
+        errors = validate_database(self.db)
+        if errors:
+            raise ValueError(f"Invalid component database {db_path}:\n  " + "\n  ".join(errors))
+        
         self.settings = self.db.get('settings', {})
         self.marginal_threshold = self.settings.get('marginal_threshold_percentage', 80) / 100.0
+        # Flat lookups compiled once from the database
+        self.capacitor_factors = self.db['capacitors']['derating_factors']
+        self.resistor_factor = self.db['resistors'].get('default_derating_factor', 1.0)
+        self.inductor_factor = self.db.get('inductors', {}).get('default_derating_factor', 0.7)
+        self.footprint_power = self.db['resistors']['footprint_power_ratings_watts']
+        # Normalized part fields -> [Quantities, audit result]
+        self.part_cache = PartCache(max_cached_parts)
 
-    def get_verdict(self, applied: float, rating: float, derating_factor: float) -> str:
+    def get_verdict(self, applied: float, rating: float, derating_factor: float,
+                    marginal_threshold: Optional[float] = None) -> str:
         """Determines the status (OK, NOK, Marginal)."""
         if rating <= 0: return "Unknown"
+        if marginal_threshold is None:
+            marginal_threshold = self.marginal_threshold
         
         derated_rating = rating * derating_factor
         ratio = applied / derated_rating if derated_rating > 0 else float('inf')
@@ -25,28 +58,94 @@ class PassiveRatingAnalyzer:
             return "NOK"
         if ratio > 1.0: # Exceeds derated rating
             return "NOK"
-        if ratio >= self.marginal_threshold:
+        if ratio >= marginal_threshold:
             return "Marginal"
         return "OK"
 
+    def analyze_batch(self, applied, rating, derating_factor, marginal_threshold=None) -> BatchVerdicts:
+        """
+        get_verdict() for a whole batch at once. Takes arrays of applied
+        stress and rating, and a derating factor and marginal threshold each
+        as an array or one value (None: the database threshold).
+        """
+        if marginal_threshold is None:
+            marginal_threshold = self.marginal_threshold
+        return batch_verdicts(applied, rating, derating_factor, marginal_threshold)
+
+    def rate(self, comps: List[Dict], inputs: List[RatingInput],
+             marginal_threshold=None) -> List[RatingResult]:
+        """
+        Results for a batch of components from their rating inputs (see
+        capacitor_input() etc.): the verdicts come from one analyze_batch()
+        call, then missing data is flagged and the library audit added.
+        An input without an applied stress (e.g. a part between two
+        unsolved nets) is UNKNOWN unless its data is missing.
+        """
+        n = len(inputs)
+        batch = self.analyze_batch(
+            np.fromiter((np.nan if i.applied is None else i.applied for i in inputs), float, n),
+            np.fromiter((i.rating for i in inputs), float, n),
+            np.fromiter((i.factor for i in inputs), float, n),
+            marginal_threshold)
+        results = []
+        for row, (comp, entry) in enumerate(zip(comps, inputs)):
+            if entry.applied is None:
+                result = RatingResult(comp['designator'], comp.get('type', ''), entry.unit, rating=entry.rating,
+                                      verdict=Verdict.UNKNOWN if entry.note is None else Verdict.MISSING_DATA,
+                                      note=entry.note or "Applied stress unknown")
+            else:
+                derated = float(batch.derated[row])
+                # Ratio of the derated limit, for reasons and sorting
+                ratio = entry.applied / derated if derated > 0 else 0.0
+                result = RatingResult(comp['designator'], comp.get('type', ''), entry.unit, entry.applied,
+                                      entry.rating, derated, ratio, batch.verdict(row))
+                if entry.note is not None:
+                    result.verdict = Verdict.MISSING_DATA
+                    result.note = entry.note
+            results.append(self._with_audit(result, comp))
+        return results
+
+    def part_key(self, comp: Dict) -> tuple:
+        """Normalized part identity: the lexed fields plus the library name."""
+        return (tuple(' '.join(str(comp.get(f) or '').upper().split()) for f in LEXED_FIELDS)
+                + (str(comp.get('Library Name', '')).strip(),))
+
+    def _part_entry(self, comp: Dict) -> list:
+        """[Quantities, audit result or None] for the component's part, from the cache."""
+        key = self.part_key(comp)
+        entry = self.part_cache.get(key)
+        if entry is None:
+            entry = [lex_component(comp), None]
+            self.part_cache.put(key, entry)
+        return entry
+
+    def quantities(self, comp: Dict) -> Quantities:
+        """Typed values lexed from the component's text fields and footprint, once per unique part."""
+        return self._part_entry(comp)[0]
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self.part_cache.stats()
+
     def audit_component(self, comp: Dict) -> Dict:
         """
         Audits library usage and footprint consistency.
         Checks: 1. Library Name is triomobil.DbLib 2. Part Name Size matches Footprint Size
+        The result depends only on the part, so it is cached with its quantities.
         """
+        entry = self._part_entry(comp)
+        if entry[1] is None:
+            entry[1] = self._audit_part(comp, entry[0])
+        return dict(entry[1])
+
+    def _audit_part(self, comp: Dict, q: Quantities) -> Dict:
         lib_name = str(comp.get('Library Name', '')).strip()
         # Enforce strict company library
         is_standard_lib = lib_name == "triomobil.DbLib"
         
-        # Footprint Consistency Check
-        fields = [str(comp.get(f, '')) for f in ['DESCRIPTION', 'PARTTYPE', 'comment', 'value', 'Description']]
-        text = " ".join(fields).upper()
-        # Find size code in part name (e.g. 0603)
-        part_size_match = re.search(r'\b(0201|0402|0603|0805|1206|1210|2010|2512)\b', text)
-        
-        footprint = str(comp.get('FOOTPRINT', '')).upper()
-        # Improved footprint regex to extract the 4-digit code even if suffixed (e.g., 0402R)
-        fp_size_match = re.search(r'(\d{4})', footprint)
+        # Footprint Consistency Check: size code in part name (e.g. 0603) vs
+        # the 4-digit code in the footprint, even if suffixed (e.g., 0402R)
+        part_size = q.sizes[0] if q.sizes else None
+        fp_size = q.footprint_size
         
         audit_verdict = "OK"
         audit_reasons = []
@@ -55,13 +154,11 @@ class PassiveRatingAnalyzer:
             audit_verdict = "FAIL"
             audit_reasons.append(f"Library Error: Non-Standard Library ({lib_name or 'Empty'})")
             
-        if part_size_match and fp_size_match:
-            part_size = part_size_match.group(1)
-            fp_size = fp_size_match.group(1)
+        if part_size and fp_size:
             if part_size != fp_size:
                 audit_verdict = "FAIL"
                 audit_reasons.append(f"Library Error: Footprint Mismatch! (Part: {part_size}, PCB: {fp_size})")
-        elif not fp_size_match:
+        elif not fp_size:
              audit_verdict = "FAIL"
              audit_reasons.append("Library Error: Missing or Invalid Footprint")
         
@@ -70,156 +167,75 @@ class PassiveRatingAnalyzer:
             'AuditReason': "; ".join(audit_reasons) if audit_reasons else "Consistent"
         }
 
-    def analyze_capacitor(self, comp: Dict, voltage: float) -> Dict:
-        c_type = comp.get('PARTTYPE', 'Capacitor-MLCC')
-        factors = self.db['capacitors']['derating_factors']
-        factor = factors.get(c_type, factors['Default'])
-        
-        raw_rating = self._extract_voltage_rating(comp)
-        derated = raw_rating * factor
-        status = self.get_verdict(abs(voltage), raw_rating, factor)
-        
-        # Calculate ratio for clearer reason
-        ratio = (abs(voltage) / derated) * 100 if derated > 0 else 0
-        if status == 'NOK':
-            reason = f"EXCEEDED: {ratio:.1f}% of derated limit ({derated:.2f}V)"
-        elif status == 'Marginal':
-            reason = f"MARGINAL: {ratio:.1f}% of derated limit ({derated:.2f}V)"
-        else:
-            reason = "Safe"
-            
-        if raw_rating == 0: 
-            status = "Unknown (Missing Data)"
-            reason = "No voltage rating found in params"
-        
+    def _with_audit(self, result: RatingResult, comp: Dict) -> RatingResult:
+        """Adds the library audit; derating failures and missing data escalate it."""
         audit = self.audit_component(comp)
-        
-        # Update AuditVerdict to include derating failures
-        final_audit_verdict = audit['AuditVerdict']
-        if status.startswith('NOK') or status.startswith('Unknown'):
-            final_audit_verdict = 'FAIL'
-        elif status == 'Marginal' and final_audit_verdict == 'OK':
-            final_audit_verdict = 'WARNING'
-        
-        return {
-            'Designator': comp['designator'],
-            'Applied': f"{voltage:.2f}V",
-            'Rating': f"{raw_rating:.2f}V",
-            'Derated': f"{derated:.2f}V",
-            'Verdict': status,
-            'Reason': reason,
-            'AuditVerdict': final_audit_verdict,
-            'AuditReason': audit['AuditReason']
-        }
+        code = AuditCode.parse(audit['AuditVerdict'])
+        if result.verdict in (Verdict.NOK, Verdict.UNKNOWN, Verdict.MISSING_DATA):
+            code = AuditCode.FAIL
+        elif result.verdict == Verdict.MARGINAL and code == AuditCode.OK:
+            code = AuditCode.WARNING
+        result.audit = code
+        result.audit_reason = audit['AuditReason']
+        return result
 
-    def analyze_resistor(self, comp: Dict, voltage: float) -> Dict:
-        """Analyzes power dissipation if resistance can be determined."""
-        resistance = self._extract_resistance(comp)
+    def capacitor_input(self, comp: Dict, voltage: Optional[float],
+                        factor: Optional[float] = None) -> RatingInput:
+        """Voltage derating inputs (voltage None: unknown); `factor` overrides the database default."""
+        if factor is None:
+            c_type = comp.get('PARTTYPE', 'Capacitor-MLCC')
+            factor = self.capacitor_factors.get(c_type, self.capacitor_factors['Default'])
+        raw_rating = self._extract_voltage_rating(comp)
+        return RatingInput('V', None if voltage is None else abs(voltage), raw_rating, factor,
+                           None if raw_rating else "No voltage rating found in params")
+
+    def resistor_input(self, comp: Dict, voltage: Optional[float],
+                       factor: Optional[float] = None) -> RatingInput:
+        """Power dissipation inputs, if resistance can be determined."""
+        resistance = self.resistance(comp)
         power_rating = self._get_resistor_power(comp)
-        factor = self.db['resistors'].get('default_derating_factor', 1.0)
-        
+        if factor is None:
+            factor = self.resistor_factor
         if resistance is None or resistance == 0:
-            res_dict = {
-                'Designator': comp['designator'], 
-                'Verdict': 'Unknown (R=?)', 
-                'Applied': '0.00mW', 
-                'Rating': f"{power_rating*1000:.1f}mW",
-                'Reason': "Could not parse resistance value"
-            }
-        else:
-            applied_power = (voltage ** 2) / resistance
-            derated = power_rating * factor
-            status = self.get_verdict(applied_power, power_rating, factor)
-            
-            # Calculate ratio for clearer reason
-            ratio = (applied_power / derated) * 100 if derated > 0 else 0
-            if status == 'NOK':
-                reason = f"EXCEEDED: {ratio:.1f}% of derated limit ({derated*1000:.1f}mW)"
-            elif status == 'Marginal':
-                reason = f"MARGINAL: {ratio:.1f}% of derated limit ({derated*1000:.1f}mW)"
-            else:
-                reason = "Safe"
-            
-            res_dict = {
-                'Designator': comp['designator'],
-                'Applied': f"{applied_power*1000:.2f}mW",
-                'Rating': f"{power_rating*1000:.2f}mW",
-                'Derated': f"{derated*1000:.2f}mW",
-                'Verdict': status,
-                'Reason': reason
-            }
-        
-        if power_rating == 0 or (resistance is None or resistance == 0):
-            res_dict['Verdict'] = "Unknown (Missing Data)"
-            
-        audit = self.audit_component(comp)
-        
-        # Update AuditVerdict to include derating failures
-        final_audit_verdict = audit['AuditVerdict']
-        if res_dict['Verdict'].startswith('NOK') or res_dict['Verdict'].startswith('Unknown'):
-            final_audit_verdict = 'FAIL'
-        elif res_dict['Verdict'] == 'Marginal' and final_audit_verdict == 'OK':
-            final_audit_verdict = 'WARNING'
-        
-        res_dict['AuditVerdict'] = final_audit_verdict
-        res_dict['AuditReason'] = audit['AuditReason']
-        return res_dict
+            return RatingInput('W', None, power_rating, factor, "Could not parse resistance value")
+        applied = None if voltage is None else (voltage ** 2) / resistance
+        return RatingInput('W', applied, power_rating, factor,
+                           None if power_rating else "No power rating found in params")
 
-    def analyze_inductor(self, comp: Dict, current: float) -> Dict:
-        """Analyzes inductor current ratings."""
+    def inductor_input(self, comp: Dict, current: float, factor: Optional[float] = None) -> RatingInput:
+        """Current rating inputs."""
         i_rating = self._extract_current_rating(comp)
-        factor = self.db.get('inductors', {}).get('default_derating_factor', 0.7)
-        derated = i_rating * factor
-        status = self.get_verdict(abs(current), i_rating, factor)
-        
-        # Calculate ratio
-        ratio = (abs(current) / derated) * 100 if derated > 0 else 0
-        if status == 'NOK':
-            reason = f"EXCEEDED: {ratio:.1f}% of derated limit ({derated:.2f}A)"
-        elif status == 'Marginal':
-            reason = f"MARGINAL: {ratio:.1f}% of derated limit ({derated:.2f}A)"
-        else:
-            reason = "Safe"
-            
-        if i_rating == 0:
-            status = "Unknown (Missing Data)"
-            reason = "No current rating found in params"
-            
+        if factor is None:
+            factor = self.inductor_factor
+        return RatingInput('A', abs(current), i_rating, factor,
+                           None if i_rating else "No current rating found in params")
+
+    def analyze_capacitor(self, comp: Dict, voltage: Optional[float], factor: Optional[float] = None,
+                          marginal_threshold: Optional[float] = None) -> RatingResult:
+        """Voltage derating; `factor`/`marginal_threshold` override the database defaults."""
+        return self.rate([comp], [self.capacitor_input(comp, voltage, factor)], marginal_threshold)[0]
+
+    def analyze_resistor(self, comp: Dict, voltage: Optional[float], factor: Optional[float] = None,
+                         marginal_threshold: Optional[float] = None) -> RatingResult:
+        """Analyzes power dissipation if resistance can be determined."""
+        return self.rate([comp], [self.resistor_input(comp, voltage, factor)], marginal_threshold)[0]
+
+    def analyze_inductor(self, comp: Dict, current: float, factor: Optional[float] = None,
+                         marginal_threshold: Optional[float] = None) -> RatingResult:
+        """Analyzes inductor current ratings."""
+        return self.rate([comp], [self.inductor_input(comp, current, factor)], marginal_threshold)[0]
+
+    def audit_only(self, comp: Dict) -> RatingResult:
+        """Library/footprint audit for parts without a rating model (J, U, D, ...)."""
         audit = self.audit_component(comp)
-        
-        # Update AuditVerdict to include derating failures
-        final_audit_verdict = audit['AuditVerdict']
-        if status.startswith('NOK') or status.startswith('Unknown'):
-            final_audit_verdict = 'FAIL'
-        elif status == 'Marginal' and final_audit_verdict == 'OK':
-            final_audit_verdict = 'WARNING'
-        
-        return {
-            'Designator': comp['designator'],
-            'Applied': f"{current:.2f}A",
-            'Rating': f"{i_rating:.2f}A",
-            'Derated': f"{derated:.2f}A",
-            'Verdict': status,
-            'Reason': reason,
-            'AuditVerdict': final_audit_verdict,
-            'AuditReason': audit['AuditReason']
-        }
+        code = AuditCode.parse(audit['AuditVerdict'])
+        return RatingResult(comp['designator'], comp.get('type', ''),
+                            verdict=Verdict.OK if code == AuditCode.OK else Verdict.FAIL,
+                            note='Audit Only', audit=code, audit_reason=audit['AuditReason'])
 
     def _extract_current_rating(self, comp: Dict) -> float:
-        """Extracts current rating (e.g., 2A, 500mA) from component fields."""
-        fields = [str(comp.get(f, '')) for f in ['DESCRIPTION', 'PARTTYPE', 'comment', 'value', 'Description']]
-        text = " ".join(fields).upper()
-        
-        # Look for Amps/mA
-        ma_match = re.search(r'(\d+(?:\.\d+)?)\s*MA', text)
-        if ma_match:
-            return float(ma_match.group(1)) / 1000.0
-            
-        a_match = re.search(r'(\d+(?:\.\d+)?)\s*A\b', text)
-        if a_match:
-            return float(a_match.group(1))
-            
-        return 0.0
+        """Extracts current rating (e.g., 2A, 500mA, 2A2) from component fields."""
+        return self.quantities(comp).first('current', 0.0)
 
     def _get_resistor_power(self, comp: Dict) -> float:
         """
@@ -228,89 +244,38 @@ class PassiveRatingAnalyzer:
                   2. Footprint in Part Name (0603...)
                   3. Library Footprint
         """
-        fields = [str(comp.get(f, '')) for f in ['DESCRIPTION', 'PARTTYPE', 'comment', 'value', 'Description']]
-        text = " ".join(fields).upper()
-        
-        # Priority 1a: Fractional Wattage (e.g., 1/10W, 1/16W)
-        frac_match = re.search(r'(\d+/\d+)\s*W', text)
-        if frac_match:
-            try:
-                num, den = map(float, frac_match.group(1).split('/'))
-                return num / den
-            except: pass
-
-        # Priority 1b: Decimal/Metric Wattage (e.g., 100MW, 0.1W, 2W)
-        # mW check
-        mw_match = re.search(r'(\d+(?:\.\d+)?)\s*MW', text)
-        if mw_match:
-            return float(mw_match.group(1)) / 1000.0
-        
-        # W check (careful not to match 1W in 100K 1% or similar)
-        # Look for standalone number followed by W
-        w_match = re.search(r'\b(\d+(?:\.\d+)?)\s*W\b', text)
-        if w_match:
-            return float(w_match.group(1))
-            
-        # Priority 2: Footprint codes in Part Name (e.g., 0603SAJ...)
-        fp_match = re.search(r'\b(0201|0402|0603|0805|1206|1210|2010|2512)\b', text)
-        if fp_match:
-            code = fp_match.group(1)
-            return self.db['resistors']['footprint_power_ratings_watts'].get(code, 0.063)
-
-        # Priority 3: Library Footprint tag
-        footprint = str(comp.get('FOOTPRINT', '')).upper()
-        match = re.search(r'(\d{4})', footprint)
-        if match:
-            fp_code = match.group(1)
-            return self.db['resistors']['footprint_power_ratings_watts'].get(fp_code, 0.063)
-            
+        q = self.quantities(comp)
+        if q.power:
+            return q.power[0]
+        code = q.sizes[0] if q.sizes else q.footprint_size
+        if code:
+            return self.footprint_power.get(code, 0.063)
         return 0.063
 
     def _extract_voltage_rating(self, comp: Dict) -> float:
-        # Altium/Protel netlists use PARTTYPE or DESCRIPTION for the value string
-        text = (str(comp.get('PARTTYPE', '')) + " " + 
-                str(comp.get('DESCRIPTION', '')) + " " + 
-                str(comp.get('comment', '')) + " " + 
-                str(comp.get('value', ''))).upper()
-        
-        match = re.search(r'(\d+(?:\.\d+)?)\s*V', text)
-        return float(match.group(1)) if match else 0.0
+        """Voltage rating (e.g., 16V, 25VDC, 2kV, 6V3) from component fields."""
+        return self.quantities(comp).first('voltage', 0.0)
 
-    def _extract_resistance(self, comp: Dict) -> float:
-        # Altium/Protel netlists use PARTTYPE or DESCRIPTION for the value string
-        fields = [str(comp.get(f, '')) for f in ['DESCRIPTION', 'PARTTYPE', 'comment', 'value', 'Description']]
-        text = " ".join(fields).upper()
-        
-        # Priority 1: Values with units (e.g., 100K, 4.7R, 1M)
-        # Search for these first to avoid picking up 0603 from "0603 100K"
-        unit_match = re.search(r'(\d+(?:\.\d+)?)\s*([KRM])(?!\w)', text)
-        if unit_match:
-            val = float(unit_match.group(1))
-            unit = unit_match.group(2)
-            if unit == 'K': return val * 1000
-            if unit == 'M': return val * 1000000
-            return val
-            
+    def _extract_capacitance(self, comp: Dict) -> Optional[float]:
+        """Nominal capacitance in farads (e.g. "10uF 16V", "100nF", "4u7"), or None."""
+        return self.quantities(comp).first('capacitance')
+
+    def resistance(self, comp: Dict) -> Optional[float]:
+        """Resistance in ohms (e.g., 100K, 4K7, 1R0, 4.7 Ohm, "RES 100"), or None."""
+        q = self.quantities(comp)
+        # Priority 1: Values with units, so "0603 100K" reads as 100K
+        if q.resistance:
+            return q.resistance[0]
         # Priority 2: Standalone numbers (e.g., "100" in "RES 100")
-        # But ignore common footprint prefixes if they appear at the start of a word
-        # We look for numbers that aren't 0402, 0603, 0805, 1206 unless they are standalone
-        raw_matches = re.findall(r'\b(\d+(?:\.\d+)?)\b', text)
-        for val_str in raw_matches:
-            if val_str in ['0402', '0603', '0805', '1206']:
-                continue
-            return float(val_str)
-            
+        if q.numbers:
+            return q.numbers[0]
         # Fallback: If only a footprint-like number is found, use it as a last resort
-        if raw_matches:
-            return float(raw_matches[0])
-            
+        if q.sizes:
+            return float(q.sizes[0])
         return None
 
-    def analyze_generic(self, comp: Dict, current: float = 0, voltage: float = 0) -> Dict:
+    def analyze_generic(self, comp: Dict, current: float = 0, voltage: float = 0) -> RatingResult:
         """Fallback for Coils, Ferrites, Diodes, Transistors."""
         # This would ideally use more complex logic per type
-        return {
-            'Designator': comp['designator'],
-            'Verdict': 'Manual Review Required',
-            'Note': f"Type: {comp['type']}"
-        }
+        return RatingResult(comp['designator'], comp.get('type', ''), verdict=Verdict.MANUAL,
+                            note=f"Type: {comp['type']}")
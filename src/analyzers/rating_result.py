@@ -0,0 +1,96 @@
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+
+class Verdict(IntEnum):
+    """Rating verdict, numbered in report order (most severe first)."""
+    NOK = 0
+    REVIEW = 1          # NOK on a switching path: manual verification required
+    MARGINAL = 2
+    OK = 3
+    MISSING_DATA = 4    # No rating or value could be extracted
+    UNKNOWN = 5
+    FAIL = 6            # Audit-only part whose library audit failed
+    MANUAL = 7          # No rating model for this part type
+    DNP = 8             # Not fitted (assembly variants)
+
+
+class AuditCode(IntEnum):
+    OK = 0
+    WARNING = 1
+    FAIL = 2
+
+    @classmethod
+    def parse(cls, text: str) -> 'AuditCode':
+        return cls[text] if text in cls.__members__ else cls.OK
+
+
+# Verdicts that count as a violation in summaries
+VIOLATIONS = (Verdict.NOK, Verdict.REVIEW)
+
+
+class RatingResult:
+    """
+    Outcome of one component's rating check, with stresses as numbers in
+    SI units (V, A or W). `unit` names the quantity; text is produced only
+    by the report writers (generators.result_format).
+
+    `switching` marks a part on a transistor-switched node whose verdict
+    stands. `note` replaces the stress-derived reason when set (missing
+    data, audit-only parts). `variant_verdicts` maps each assembly variant
+    to (verdict, switching), or None when the variant was not evaluated.
+    """
+    __slots__ = ('designator', 'type', 'unit', 'applied', 'rating', 'derated', 'ratio',
+                 'verdict', 'switching', 'note', 'audit', 'audit_reason',
+                 'description', 'footprint', 'net_roles', 'variant_verdicts')
+
+    def __init__(self, designator: str, type: str = '', unit: str = '',
+                 applied: Optional[float] = None, rating: Optional[float] = None,
+                 derated: Optional[float] = None, ratio: Optional[float] = None,
+                 verdict: Verdict = Verdict.UNKNOWN, note: Optional[str] = None,
+                 audit: AuditCode = AuditCode.OK, audit_reason: str = 'Consistent'):
+        self.designator = designator
+        self.type = type
+        self.unit = unit
+        self.applied = applied
+        self.rating = rating
+        self.derated = derated
+        self.ratio = ratio
+        self.verdict = verdict
+        self.switching = False
+        self.note = note
+        self.audit = audit
+        self.audit_reason = audit_reason
+        self.description = '-'
+        self.footprint = '-'
+        self.net_roles = '-'
+        self.variant_verdicts: Dict[str, Optional[Tuple[Verdict, bool]]] = {}
+
+    @property
+    def is_violation(self) -> bool:
+        return self.verdict in VIOLATIONS
+
+    def sort_key(self):
+        """Most severe verdict first, then highest stress ratio."""
+        return (self.verdict, -(self.ratio or 0.0))
+
+    def __repr__(self) -> str:
+        return f"RatingResult({self.designator}, {self.verdict.name}, audit={self.audit.name})"
+
+
+class RatingInput:
+    """
+    What a rated check compares, before the verdict: the applied stress and
+    the raw rating in `unit`, and the derating factor. `applied` is None
+    when it cannot be computed; `note` marks missing data and forces
+    MISSING_DATA.
+    """
+    __slots__ = ('unit', 'applied', 'rating', 'factor', 'note')
+
+    def __init__(self, unit: str, applied: Optional[float], rating: float, factor: float,
+                 note: Optional[str] = None):
+        self.unit = unit
+        self.applied = applied
+        self.rating = rating
+        self.factor = factor
+        self.note = note
@@ -0,0 +1,90 @@
+from typing import Dict, List, Set, Iterable
+
+from analyzers.voltage_propagation import designator_prefix
+
+SWITCH_PREFIXES = ('Q', 'TR')
+DEFAULT_MAX_HOPS = 2
+
+
+class SwitchingNodeDetector:
+    """
+    Finds nets that a transistor can connect to GND (low side) or to a supply
+    rail (high side). The netlist is indexed once as a bipartite graph of nets
+    and switches with integer IDs. A search then walks outward from the
+    source nets through up to `max_hops` transistors, so stacked or cascaded
+    switches are found too. Every net and switch is visited at most once, so a
+    search is linear in the size of the switch graph.
+    """
+
+    def __init__(self, netlist, prefixes=SWITCH_PREFIXES):
+        self.net_names: List[str] = netlist.get_net_names()
+        self.net_ids: Dict[str, int] = {n: i for i, n in enumerate(self.net_names)}
+        self.switches: List[str] = []
+        # switch id -> net ids, net id -> switch ids
+        self.switch_nets: List[List[int]] = []
+        self.net_switches: List[List[int]] = [[] for _ in self.net_names]
+
+        for des, pins in netlist.pin_index.items():
+            if designator_prefix(des) not in prefixes:
+                continue
+            nets = sorted({self.net_ids[n] for n in pins.values() if n in self.net_ids})
+            if len(nets) < 2:
+                continue
+            sid = len(self.switches)
+            self.switches.append(des)
+            self.switch_nets.append(nets)
+            for n in nets:
+                self.net_switches[n].append(sid)
+
+    def reachable(self, sources: Iterable[str], max_hops: int = DEFAULT_MAX_HOPS,
+                  blocked: Iterable[str] = ()) -> Set[str]:
+        """
+        Nets reachable from `sources` through at most `max_hops` switches.
+        Source and blocked nets are never returned or expanded.
+        """
+        seen = bytearray(len(self.net_names))
+        used = bytearray(len(self.switches))
+        for name in blocked:
+            i = self.net_ids.get(name)
+            if i is not None:
+                seen[i] = 1
+        frontier = []
+        for name in sources:
+            i = self.net_ids.get(name)
+            if i is not None:
+                seen[i] = 1
+                frontier.append(i)
+
+        found = []
+        for _ in range(max_hops):
+            nxt = []
+            for n in frontier:
+                for s in self.net_switches[n]:
+                    if used[s]:
+                        continue
+                    used[s] = 1
+                    for m in self.switch_nets[s]:
+                        if not seen[m]:
+                            seen[m] = 1
+                            nxt.append(m)
+            if not nxt:
+                break
+            found.extend(nxt)
+            frontier = nxt
+        return {self.net_names[i] for i in found}
+
+    def low_side(self, gnd_nets: Iterable[str], max_hops: int = DEFAULT_MAX_HOPS,
+                 rail_nets: Iterable[str] = ()) -> Set[str]:
+        """
+        Nets a transistor chain can pull to GND. The walk stops at supply
+        rails, so a gate driver into a load switch does not mark the rail
+        on the load switch's source as switched.
+        """
+        gnd_nets = set(gnd_nets)
+        return self.reachable(gnd_nets, max_hops, blocked=gnd_nets.union(rail_nets))
+
+    def high_side(self, rail_nets: Iterable[str], gnd_nets: Iterable[str],
+                  max_hops: int = DEFAULT_MAX_HOPS) -> Set[str]:
+        """Nets a transistor chain can pull up to a supply rail."""
+        rail_nets = set(rail_nets)
+        return self.reachable(rail_nets, max_hops, blocked=rail_nets.union(gnd_nets))
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Tuple, Any
+
+from parsers.netlist_parser import NetlistParser
+from parsers.connector_map_parser import ConnectorMapParser
+from analyzers.voltage_propagation import RailPropagator, UnionFind, propagate_domains
+
+# Nets of a multi-board system are named "<net>@<board>"
+BOARD_SEPARATOR = '@'
+
+
+def qualify(board: str, net_name: str) -> str:
+    return f"{net_name}{BOARD_SEPARATOR}{board}"
+
+
+def split_qualified(qualified: str) -> Tuple[str, str]:
+    """Splits "VDD_5V@MAIN" into ("MAIN", "VDD_5V")."""
+    net_name, _, board = qualified.rpartition(BOARD_SEPARATOR)
+    return board, net_name
+
+
+class SystemStitcher:
+    """
+    Merges the netlists of several boards into one rail-domain graph.
+
+    Every board's nets get a contiguous block of global IDs in a single
+    union-find. Within a board, nets joined by series parts (0R, FB, FL, L)
+    are merged as in RailPropagator. Across boards, the nets on mated
+    connector pins from the mapping are merged. Voltages confirmed on one
+    board then reach every board in the same domain. Building the model is
+    linear in the total number of pins, plus near-constant union-find work
+    per connector pin pair.
+
+    This is a library API; the GUI apps check one board at a time. A
+    system check stitches the boards, propagates the confirmed voltages and
+    hands each board its share via board_voltages() as the session's
+    'external_voltages' input.
+    """
+
+    def __init__(self, boards: Dict[str, Any], pairs: List[Dict[str, str]], link_series: bool = True):
+        for name in boards:
+            if BOARD_SEPARATOR in name:
+                raise ValueError(f"Board name may not contain '{BOARD_SEPARATOR}': {name}")
+        self.boards = boards
+        self.offsets: Dict[str, int] = {}
+        self.net_names: List[str] = []
+        for name, netlist in boards.items():
+            self.offsets[name] = len(self.net_names)
+            self.net_names.extend(qualify(name, n) for n in netlist.get_net_names())
+        self.net_ids: Dict[str, int] = {n: i for i, n in enumerate(self.net_names)}
+        self.uf = UnionFind(len(self.net_names))
+
+        if link_series:
+            for name, netlist in boards.items():
+                offset, local = self.offsets[name], RailPropagator(netlist).uf
+                for i in range(len(local.parent)):
+                    root = local.find(i)
+                    if root != i:
+                        self.uf.union(offset + i, offset + root)
+
+        # (qualified net, qualified net, "J3-1@MAIN <-> J1-1@IO") per stitched pin pair
+        self.links: List[Tuple[str, str, str]] = []
+        # Mapping entries that could not be resolved, as readable messages
+        self.unmatched: List[str] = []
+        for pair in pairs:
+            self._stitch(pair)
+
+    @classmethod
+    def from_files(cls, board_paths: Dict[str, str], mapping_path: str,
+                   parser_options: Optional[Dict[str, Any]] = None, link_series: bool = True):
+        """Parses each board's netlist and the connector mapping CSV."""
+        options = parser_options or {}
+        boards = {name: NetlistParser(path, **options) for name, path in board_paths.items()}
+        return cls(boards, ConnectorMapParser(mapping_path).get_pairs(), link_series)
+
+    def _stitch(self, pair: Dict[str, str]):
+        board_a, board_b = pair['BoardA'], pair['BoardB']
+        for board in (board_a, board_b):
+            if board not in self.boards:
+                raise ValueError(f"Connector map references unknown board: {board}")
+        pins_a = self.boards[board_a].pin_index.get(pair['ConnectorA'], {})
+        pins_b = self.boards[board_b].pin_index.get(pair['ConnectorB'], {})
+
+        if bool(pair['PinA']) != bool(pair['PinB']):
+            raise ValueError(f"Connector map pair {pair['ConnectorA']}@{board_a} <-> "
+                             f"{pair['ConnectorB']}@{board_b} has only one of PinA / PinB")
+        if pair['PinA']:
+            mated = [(pair['PinA'], pair['PinB'])]
+        else:
+            # Whole connector: pair pins by number
+            mated = [(p, p) for p in pins_a if p in pins_b]
+            if not mated:
+                self.unmatched.append(f"{pair['ConnectorA']}@{board_a} <-> {pair['ConnectorB']}@{board_b}: "
+                                      f"no common connected pins")
+
+        for pin_a, pin_b in mated:
+            label = f"{pair['ConnectorA']}-{pin_a}@{board_a} <-> {pair['ConnectorB']}-{pin_b}@{board_b}"
+            net_a, net_b = pins_a.get(pin_a), pins_b.get(pin_b)
+            if net_a is None or net_b is None:
+                self.unmatched.append(f"{label}: pin not connected")
+                continue
+            qa, qb = qualify(board_a, net_a), qualify(board_b, net_b)
+            self.uf.union(self.net_ids[qa], self.net_ids[qb])
+            self.links.append((qa, qb, label))
+
+    def domain_of(self, qualified: str) -> List[str]:
+        """All system nets in the same domain as a qualified net."""
+        root = self.uf.find(self.net_ids[qualified])
+        return [n for i, n in enumerate(self.net_names) if self.uf.find(i) == root]
+
+    def propagate(self, confirmed: Dict[str, float]) -> Tuple[Dict[str, float], List[Dict]]:
+        """Spreads voltages confirmed on qualified nets over the whole system."""
+        return propagate_domains(self.uf, self.net_names, self.net_ids, confirmed)
+
+    def board_voltages(self, voltages: Dict[str, float], board: str) -> Dict[str, float]:
+        """Unqualified net -> voltage for one board, e.g. for ProjectSession's external_voltages."""
+        out = {}
+        for qualified, v in voltages.items():
+            b, net = split_qualified(qualified)
+            if b == board:
+                out[net] = v
+        return out
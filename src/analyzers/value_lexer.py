@@ -0,0 +1,91 @@
+import re
+from typing import Dict, List, Optional
+
+# Text fields lexed for ratings, in priority order (netlist tags, then BOM keys)
+TEXT_FIELDS = ('PARTTYPE', 'DESCRIPTION', 'Description', 'Comment', 'comment', 'Value', 'value')
+
+# EIA imperial size codes recognised in part text
+SIZE_CODES = ('01005', '0201', '0402', '0603', '0805', '1206', '1210', '1812', '2010', '2220', '2512')
+
+_PREFIX = {'P': 1e-12, 'N': 1e-9, 'U': 1e-6, 'µ': 1e-6, 'Μ': 1e-6, 'M': 1e-3, 'K': 1e3, 'G': 1e9}
+# Resistance prefixes: a bare M means mega
+_OHM_PREFIX = {'K': 1e3, 'M': 1e6, 'G': 1e9}
+# Letter used as the decimal point (IEC 60062 "RKM" code) -> (kind, multiplier)
+_RKM = {
+    'R': ('resistance', 1.0), 'K': ('resistance', 1e3), 'M': ('resistance', 1e6),
+    'P': ('capacitance', 1e-12), 'N': ('capacitance', 1e-9), 'U': ('capacitance', 1e-6),
+    'µ': ('capacitance', 1e-6), 'Μ': ('capacitance', 1e-6),
+    'V': ('voltage', 1.0), 'A': ('current', 1.0),
+}
+_UNIT_KIND = {'V': 'voltage', 'A': 'current', 'W': 'power', 'F': 'capacitance', 'H': 'inductance'}
+
+_NUM = r'\d+(?:\.\d+)?'
+# Every alternative starts at a token boundary and must end at one; text is upper-cased first
+_TOKEN = re.compile(
+    r'(?<![A-Z0-9.])(?:'
+    rf'(?P<fnum>\d+)/(?P<fden>\d+)\s*W'                                   # 1/10W
+    r'|(?P<rint>\d+)(?P<rkm>[RKMPNUVAµΜ])(?P<rfrac>\d+)'                    # 4K7, 1R0, 2N2, 3V3, 2A2
+    rf'|(?P<onum>{_NUM})\s*(?P<opre>[KMG])?\s*(?:Ω|OHMS?|R)'               # 100R, 4.7 OHM, 10KΩ
+    rf'|(?P<unum>{_NUM})\s*(?P<upre>[PNUµΜMKG])?(?P<unit>[VAWFH])(?:DC|AC)?'  # 100NF, 2KV, 500MA, 25VDC
+    rf'|(?P<knum>{_NUM})(?P<kpre>[KMG])'                                  # 100K, 1M (resistance)
+    r'|(?P<size>' + '|'.join(SIZE_CODES) + r')'
+    rf'|(?P<bare>{_NUM})'
+    r')(?![A-Z0-9.%])'
+)
+_FOOTPRINT_SIZE = re.compile(r'(\d{4})')
+
+
+class Quantities:
+    """Typed values found in a component's text, each list in order of appearance."""
+    __slots__ = ('voltage', 'current', 'power', 'resistance', 'capacitance', 'inductance',
+                 'sizes', 'numbers', 'footprint_size')
+
+    def __init__(self):
+        self.voltage: List[float] = []
+        self.current: List[float] = []
+        self.power: List[float] = []
+        self.resistance: List[float] = []
+        self.capacitance: List[float] = []
+        self.inductance: List[float] = []
+        self.sizes: List[str] = []        # EIA size codes in the part text
+        self.numbers: List[float] = []    # unitless numbers (not size codes)
+        self.footprint_size: Optional[str] = None
+
+    def first(self, kind: str, default=None):
+        values = getattr(self, kind)
+        return values[0] if values else default
+
+
+def lex_text(text: str, out: Optional[Quantities] = None) -> Quantities:
+    """Single regex scan of `text` into typed quantities."""
+    q = out if out is not None else Quantities()
+    for m in _TOKEN.finditer(text.upper()):
+        kind = m.lastgroup
+        if m.group('fnum') is not None:
+            den = float(m.group('fden'))
+            if den:
+                q.power.append(float(m.group('fnum')) / den)
+        elif m.group('rkm') is not None:
+            kind, scale = _RKM[m.group('rkm')]
+            getattr(q, kind).append(float(f"{m.group('rint')}.{m.group('rfrac')}") * scale)
+        elif m.group('onum') is not None:
+            q.resistance.append(float(m.group('onum')) * _OHM_PREFIX.get(m.group('opre'), 1.0))
+        elif m.group('unum') is not None:
+            scale = _PREFIX[m.group('upre')] if m.group('upre') else 1.0
+            getattr(q, _UNIT_KIND[m.group('unit')]).append(float(m.group('unum')) * scale)
+        elif m.group('knum') is not None:
+            q.resistance.append(float(m.group('knum')) * _OHM_PREFIX[m.group('kpre')])
+        elif kind == 'size':
+            q.sizes.append(m.group('size'))
+        elif kind == 'bare':
+            q.numbers.append(float(m.group('bare')))
+    return q
+
+
+def lex_component(comp: Dict) -> Quantities:
+    """Lexes a component's value/description fields (one scan) and its footprint."""
+    text = " ".join(str(comp[f]) for f in TEXT_FIELDS if comp.get(f))
+    q = lex_text(text)
+    match = _FOOTPRINT_SIZE.search(str(comp.get('FOOTPRINT', '')))
+    q.footprint_size = match.group(1) if match else None
+    return q
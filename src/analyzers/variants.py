@@ -0,0 +1,159 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from analyzers.value_lexer import lex_text
+from analyzers.voltage_propagation import designator_prefix, is_series_element
+
+# Value fields rewritten by a substitution (only those present on the part, plus PARTTYPE)
+VALUE_FIELDS = ('PARTTYPE', 'DESCRIPTION', 'Value', 'Comment', 'value', 'comment')
+
+# Lexed quantities a substituted value replaces in those fields
+_VALUE_KINDS = ('voltage', 'current', 'power', 'resistance', 'capacitance', 'inductance',
+                'sizes', 'numbers')
+
+# Parts whose fitting or value changes the DC network (links and conductances)
+NETWORK_PREFIXES = ('R', 'FB', 'FL', 'L')
+
+# Per-designator state in one variant: None = as in the netlist, DNP, or a value string
+DNP = object()
+
+
+class VariantSet:
+    """
+    Assembly variants as bitmasks: bit i stands for variants[i]. Every
+    designator that a variant touches has a DNP mask and one mask per
+    substituted value; all other designators are fitted unchanged in every
+    variant and cost nothing.
+
+    groups() splits the variants for one part into classes with identical
+    data. network_groups() does the same for the whole DC network. The
+    analysis then runs once per class instead of once per variant.
+    """
+
+    def __init__(self, variants: List[str], dnp: Dict[str, Set[str]], values: Dict[str, Dict[str, str]]):
+        self.variants = list(variants)
+        self.all_mask = (1 << len(self.variants)) - 1
+        self.dnp_mask: Dict[str, int] = {}
+        self.value_masks: Dict[str, Dict[str, int]] = {}
+        for i, variant in enumerate(self.variants):
+            bit = 1 << i
+            for des in dnp.get(variant, ()):
+                self.dnp_mask[des] = self.dnp_mask.get(des, 0) | bit
+            for des, value in values.get(variant, {}).items():
+                if des in dnp.get(variant, ()):
+                    continue
+                masks = self.value_masks.setdefault(des, {})
+                masks[value] = masks.get(value, 0) | bit
+
+    @classmethod
+    def from_parser(cls, parser) -> 'VariantSet':
+        return cls(parser.variants, parser.dnp, parser.values)
+
+    def touched(self) -> Set[str]:
+        return set(self.dnp_mask) | set(self.value_masks)
+
+    def names(self, mask: int) -> List[str]:
+        return [v for i, v in enumerate(self.variants) if mask >> i & 1]
+
+    def state(self, designator: str, variant_index: int):
+        bit = 1 << variant_index
+        if self.dnp_mask.get(designator, 0) & bit:
+            return DNP
+        for value, mask in self.value_masks.get(designator, {}).items():
+            if mask & bit:
+                return value
+        return None
+
+    def groups(self, designator: str) -> List[Tuple[int, object]]:
+        """[(variant mask, state)] covering all variants; state is None, DNP or a value."""
+        out = []
+        remaining = self.all_mask
+        dnp = self.dnp_mask.get(designator, 0)
+        if dnp:
+            out.append((dnp, DNP))
+            remaining &= ~dnp
+        for value, mask in self.value_masks.get(designator, {}).items():
+            out.append((mask, value))
+            remaining &= ~mask
+        if remaining:
+            out.append((remaining, None))
+        return out
+
+    def network_groups(self) -> List[Tuple[int, Dict[str, object]]]:
+        """
+        Variants partitioned by the states of their R / FB / FL / L parts,
+        as [(variant mask, {designator: DNP or value})]. Variants in one
+        class share a single propagation and DC solve.
+        """
+        network = sorted(d for d in self.touched() if designator_prefix(d) in NETWORK_PREFIXES)
+        classes: Dict[Tuple, int] = {}
+        for i in range(len(self.variants)):
+            signature = tuple((d, self.state(d, i)) for d in network)
+            classes[signature] = classes.get(signature, 0) | (1 << i)
+        return [(mask, {d: s for d, s in signature if s is not None})
+                for signature, mask in classes.items()]
+
+
+def _kinds(text: str) -> Set[str]:
+    q = lex_text(text)
+    return {kind for kind in _VALUE_KINDS if getattr(q, kind)}
+
+
+def _merge_value(text: str, value: str, kinds: Set[str]) -> str:
+    """`text` with the words stating one of `kinds` replaced by `value` (prepended if none do)."""
+    words, placed = [], False
+    for word in str(text).split():
+        if _kinds(word) & kinds:
+            if not placed:
+                words.append(value)
+                placed = True
+        else:
+            words.append(word)
+    return ' '.join(words if placed else [value] + words)
+
+
+def substitute(comp: Dict, value: str) -> Dict:
+    """
+    Copy of a component with `value` merged into its value fields: words
+    stating a quantity that `value` also states (resistance, voltage,
+    size, ...) are replaced, the rest of the part data (power rating,
+    tolerance, dielectric, ...) is kept for the rating lookups.
+    """
+    out = dict(comp)
+    kinds = _kinds(value)
+    for field in VALUE_FIELDS:
+        if out.get(field):
+            out[field] = _merge_value(out[field], value, kinds)
+        elif field == 'PARTTYPE':
+            out[field] = value
+    return out
+
+
+def not_fitted(overrides: Dict[str, object]) -> Set[str]:
+    """Designators removed (DNP) by a network class's overrides."""
+    return {des for des, state in overrides.items() if state is DNP}
+
+
+def variant_link_predicate(overrides: Dict[str, object]):
+    """RailPropagator link rule honouring DNP parts and substituted values."""
+    def link(des: str, comp: Dict) -> bool:
+        state = overrides.get(des)
+        if state is DNP:
+            return False
+        if state is not None:
+            comp = substitute(comp, state)
+        return is_series_element(des, comp)
+    return link
+
+
+def variant_resistance(overrides: Dict[str, object], resistance_of):
+    """
+    DCSolver resistance lookup honouring substituted values. DNP parts are
+    not looked up: pass not_fitted(overrides) to the DCSolver, which drops
+    them from the network as open circuits.
+    """
+    def resistance(comp: Dict) -> Optional[float]:
+        state = overrides.get(comp.get('designator'))
+        if state is not None and state is not DNP:
+            comp = substitute(comp, state)
+        return resistance_of(comp)
+    return resistance
@@ -0,0 +1,150 @@
+import re
+from typing import Dict, List, Optional, Callable, Tuple
+
+from analyzers.value_lexer import lex_text
+
+# Two-terminal parts that carry a rail unchanged (DC drop neglected)
+SERIES_PREFIXES = ('FB', 'FL', 'L')
+
+_PREFIX = re.compile(r'^([A-Z]{1,2})')
+# A value field that is only a bare zero ("0", "0.0")
+_BARE_ZERO = re.compile(r'0(?:[.,]0+)?')
+
+
+def designator_prefix(designator: str) -> str:
+    match = _PREFIX.match(designator.upper())
+    return match.group(1) if match else ''
+
+
+def is_zero_ohm(comp: Dict) -> bool:
+    """
+    True if the value fields of a resistor read as a 0Ω jumper: the first
+    resistance the value lexer finds is 0 ("0R", "0R0", "0 Ohm"), or the
+    whole field is a bare zero. Other zeros ("1K 0,1W") do not count.
+    """
+    for field in ('Value', 'Comment', 'PARTTYPE', 'value', 'comment'):
+        text = str(comp.get(field, '') or '').strip().upper()
+        if not text:
+            continue
+        resistance = lex_text(text).resistance
+        if resistance:
+            if resistance[0] == 0:
+                return True
+        elif _BARE_ZERO.fullmatch(text):
+            return True
+    return False
+
+
+def is_series_element(designator: str, comp: Dict) -> bool:
+    """Default link rule: ferrite beads, filters, inductors and 0Ω resistors."""
+    prefix = designator_prefix(designator)
+    if prefix in SERIES_PREFIXES:
+        return True
+    if prefix == 'R':
+        return is_zero_ohm(comp)
+    return False
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with union by size and path halving."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+
+class RailPropagator:
+    """
+    Groups nets into rail domains: nets joined by series elements (0Ω
+    resistors, ferrite beads, filters, inductors) end up in one union-find set.
+    A voltage confirmed on any net of a domain then applies to the whole
+    domain. Building the domains is one pass over the components.
+    """
+
+    def __init__(self, netlist, link_predicate: Optional[Callable[[str, Dict], bool]] = None):
+        self.netlist = netlist
+        self.link_predicate = link_predicate or is_series_element
+        self.net_names: List[str] = netlist.get_net_names()
+        self.net_ids: Dict[str, int] = {n: i for i, n in enumerate(self.net_names)}
+        self.uf = UnionFind(len(self.net_names))
+        # (designator, net_a, net_b) for every merge, for reporting
+        self.links: List[Tuple[str, str, str]] = []
+        self._build()
+
+    def _build(self):
+        components = self.netlist.components
+        for des, pins in self.netlist.pin_index.items():
+            nets = {n for n in pins.values() if n}
+            if len(pins) != 2 or len(nets) != 2:
+                continue
+            comp = components.get(des)
+            if comp is None or not self.link_predicate(des, comp):
+                continue
+            a, b = sorted(nets)
+            self.uf.union(self.net_ids[a], self.net_ids[b])
+            self.links.append((des, a, b))
+
+    def domain_of(self, net_name: str) -> List[str]:
+        """All nets in the same rail domain as net_name."""
+        root = self.uf.find(self.net_ids[net_name])
+        return [n for i, n in enumerate(self.net_names) if self.uf.find(i) == root]
+
+    def propagate(self, confirmed: Dict[str, float]) -> Tuple[Dict[str, float], List[Dict]]:
+        """Spreads confirmed voltages to every net of their domain (see propagate_domains)."""
+        return propagate_domains(self.uf, self.net_names, self.net_ids, confirmed)
+
+
+def propagate_domains(uf: UnionFind, net_names: List[str], net_ids: Dict[str, int],
+                      confirmed: Dict[str, float]) -> Tuple[Dict[str, float], List[Dict]]:
+    """
+    Spreads confirmed voltages to every net of their union-find domain.
+    Returns (net -> voltage, conflicts). A conflict is reported when two
+    confirmed nets of one domain disagree; the domain then keeps the
+    larger magnitude (worst case for the rating checks), and each
+    explicitly confirmed net keeps its own value.
+    """
+    domain_voltage: Dict[int, float] = {}
+    domain_source: Dict[int, str] = {}
+    conflicts = []
+    for net, voltage in confirmed.items():
+        net_id = net_ids.get(net)
+        if net_id is None:
+            continue
+        root = uf.find(net_id)
+        if root not in domain_voltage:
+            domain_voltage[root] = voltage
+            domain_source[root] = net
+        elif domain_voltage[root] != voltage:
+            conflicts.append({
+                'nets': (domain_source[root], net),
+                'voltages': (domain_voltage[root], voltage),
+            })
+            if abs(voltage) > abs(domain_voltage[root]):
+                domain_voltage[root] = voltage
+                domain_source[root] = net
+
+    voltages: Dict[str, float] = {}
+    if domain_voltage:
+        for i, net in enumerate(net_names):
+            root = uf.find(i)
+            if root in domain_voltage:
+                voltages[net] = domain_voltage[root]
+    voltages.update((n, v) for n, v in confirmed.items() if n in net_ids)
+    return voltages, conflicts
@@ -1,9 +1,23 @@
+from collections import Counter
+
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font, Alignment
 from openpyxl.utils import get_column_letter
 import os
 
+from analyzers.rating_result import Verdict, AuditCode, VIOLATIONS
+from generators.result_format import display_row, variant_names, is_library_error
+
+# Row fill per verdict (Unknown / missing data is treated as NOK)
+VERDICT_FILLS = {
+    Verdict.NOK: 'NOK',
+    Verdict.MARGINAL: 'Marginal',
+    Verdict.OK: 'OK',
+    Verdict.MISSING_DATA: 'NOK',
+    Verdict.UNKNOWN: 'NOK',
+}
+
 class ExcelGenerator:
     """Generates a styled Excel report for component rating verification."""
     
@@ -17,32 +31,30 @@ class ExcelGenerator:
             'AuditWarn': PatternFill(start_color='ADD8E6', end_color='ADD8E6', fill_type='solid')      # Light Blue
         }
 
-    def generate(self, results: list):
-        """Creates the Excel file with Summary, Details, Library Errors, and Derating Errors sheets."""
-        df = pd.DataFrame(results)
+    def generate(self, results: list, integrity: list = None, rail_summary: list = None):
+        """
+        Creates the Excel file with Summary, Details, Library Errors, Derating Errors
+        and (when given) Rail Decoupling and Netlist Integrity sheets.
+        `integrity` None means the integrity checks were not run.
+        `results` are RatingResult records; they are formatted to text here.
+        """
+        integrity_df = pd.DataFrame(integrity or [], columns=['Check', 'Severity', 'Designator', 'Net', 'Detail'])
         
-        # Sort results: NOK -> Marginal -> OK (Handle strings like "NOK (Switching)")
-        def get_sort_key(v):
-            v_str = str(v)
-            if v_str.startswith('NOK'): return 0
-            if v_str.startswith('Marginal'): return 1
-            if v_str.startswith('OK'): return 2
-            return 3
-            
-        df['sort_order'] = df['Verdict'].apply(get_sort_key)
-        df = df.sort_values('sort_order').drop(columns=['sort_order'])
+        # Sort results: NOK -> Review -> Marginal -> OK -> rest, highest stress first
+        results = sorted(results, key=lambda r: r.sort_key())
+        variants = variant_names(results)
         
         # Filter for Library Errors and Derating Errors
-        library_errors = df[df['AuditReason'].str.contains('Library Error', case=False, na=False)]
-        derating_errors = df[
-            df['Verdict'].str.startswith('NOK', na=False)
-            | df['Verdict'].str.startswith('Marginal', na=False)
-            | df['Verdict'].str.startswith('User Review', na=False)
-        ]
+        library_errors = [r for r in results if is_library_error(r)]
+        derating_errors = [r for r in results if r.verdict in (Verdict.NOK, Verdict.MARGINAL, Verdict.REVIEW)]
 
         with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
             # 1. Summary Sheet (first for visibility)
-            summary_data = self._create_summary_data(df, library_errors, derating_errors)
+            summary_data = self._create_summary_data(results, library_errors, derating_errors)
+            if summary_data and integrity is not None:
+                # Not run (None) is left out rather than reported as 0 findings
+                after = next(i for i, row in enumerate(summary_data) if row['Category'] == 'Derating Errors')
+                summary_data.insert(after + 1, {'Category': 'Netlist Integrity Findings', 'Value': len(integrity_df)})
             summary_df = pd.DataFrame(summary_data)
             summary_df.to_excel(writer, sheet_name='Summary', index=False)
             workbook = writer.book
@@ -50,57 +62,63 @@ class ExcelGenerator:
             self._style_summary_sheet(summary_sheet)
             
             # 2. Details Sheet
-            df.to_excel(writer, sheet_name='Verification Details', index=False)
-            details_sheet = workbook['Verification Details']
-            self._style_details_sheet(details_sheet, df)
+            self._write_results(writer, 'Verification Details', results, variants)
             
             # 3. Library Errors Sheet
-            if not library_errors.empty:
-                library_errors.to_excel(writer, sheet_name='Library Errors', index=False)
-                lib_errors_sheet = workbook['Library Errors']
-                self._style_details_sheet(lib_errors_sheet, library_errors)
+            if library_errors:
+                self._write_results(writer, 'Library Errors', library_errors, variants)
             
             # 4. Derating Errors Sheet
-            if not derating_errors.empty:
-                derating_errors.to_excel(writer, sheet_name='Derating Errors', index=False)
-                derating_sheet = workbook['Derating Errors']
-                self._style_details_sheet(derating_sheet, derating_errors)
+            if derating_errors:
+                self._write_results(writer, 'Derating Errors', derating_errors, variants)
+
+            # 5. Variant Comparison Sheet (parts whose verdict differs between variants)
+            if variants:
+                differs = [r for r in results if len(set(r.variant_verdicts.values())) > 1]
+                if differs:
+                    self._write_results(writer, 'Variant Comparison', differs, variants,
+                                        ['Designator', 'Type', 'Verdict'] + [f"Verdict [{v}]" for v in variants])
+
+            # 6. Rail Decoupling Sheet
+            if rail_summary:
+                rail_df = pd.DataFrame(rail_summary)
+                rail_df.to_excel(writer, sheet_name='Rail Decoupling', index=False)
+                self._style_rail_sheet(workbook['Rail Decoupling'], rail_df)
+
+            # 7. Netlist Integrity Sheet
+            if not integrity_df.empty:
+                integrity_df.to_excel(writer, sheet_name='Netlist Integrity', index=False)
+                self._style_integrity_sheet(workbook['Netlist Integrity'], integrity_df)
 
         print(f"Excel report generated: {os.path.abspath(self.output_path)}")
 
-    def _style_details_sheet(self, sheet, df):
+    def _write_results(self, writer, sheet_name, results, variants, columns=None):
+        df = pd.DataFrame([display_row(r, variants) for r in results])
+        if columns:
+            df = df[columns]
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+        self._style_details_sheet(writer.book[sheet_name], df, results)
+
+    def _style_details_sheet(self, sheet, df, results):
         # Header formatting
         for cell in sheet[1]:
             cell.font = Font(bold=True)
             cell.alignment = Alignment(horizontal='center')
         
-        # Verdict-based coloring
-        # Note: We use the capitalized 'Verdict' key consistent with the rest of the app
-        verdict_col_idx = df.columns.get_loc('Verdict') + 1
-        for row_idx in range(2, sheet.max_row + 1):
-            verdict_val = str(sheet.cell(row=row_idx, column=verdict_col_idx).value)
-            fill = None
-            if verdict_val.startswith('NOK'): fill = self.colors['NOK']
-            elif verdict_val.startswith('Marginal'): fill = self.colors['Marginal']
-            elif verdict_val.startswith('OK'): fill = self.colors['OK']
-            elif verdict_val.startswith('Unknown'): fill = self.colors['NOK']  # Treat Unknown as NOK
-            
-            if fill:
-                for col_idx in range(1, len(df.columns) + 1):
-                    sheet.cell(row=row_idx, column=col_idx).fill = fill
-
-        # Audit-based coloring (overrides verdict color if critical)
         audit_col_idx = df.columns.get_loc('AuditVerdict') + 1 if 'AuditVerdict' in df.columns else None
-        if audit_col_idx:
-            for row_idx in range(2, sheet.max_row + 1):
-                audit_val = sheet.cell(row=row_idx, column=audit_col_idx).value
-                if audit_val == 'FAIL':
-                    fill = self.colors['AuditFail']
-                    for col_idx in range(1, len(df.columns) + 1):
-                        sheet.cell(row=row_idx, column=col_idx).fill = fill
-                elif audit_val == 'WARNING' and not str(sheet.cell(row=row_idx, column=verdict_col_idx).value).startswith('NOK'):
-                    # Only color for warning if not already red from a verdict
-                    sheet.cell(row=row_idx, column=audit_col_idx).fill = self.colors['AuditWarn']
+        for row_idx, result in enumerate(results, start=2):
+            row_cells = [sheet.cell(row=row_idx, column=col_idx) for col_idx in range(1, len(df.columns) + 1)]
+            # Verdict-based coloring
+            fill = self.colors.get(VERDICT_FILLS.get(result.verdict))
+            # Audit-based coloring (overrides verdict color if critical)
+            if audit_col_idx and result.audit == AuditCode.FAIL:
+                fill = self.colors['AuditFail']
+            if fill:
+                for cell in row_cells:
+                    cell.fill = fill
+            if audit_col_idx and result.audit == AuditCode.WARNING and result.verdict != Verdict.NOK:
+                # Only color for warning if not already red from a verdict
+                row_cells[audit_col_idx - 1].fill = self.colors['AuditWarn']
 
         # Auto-adjust column width
         for i, col in enumerate(df.columns, 1):
@@ -110,27 +128,51 @@ class ExcelGenerator:
                 width = 15
             sheet.column_dimensions[get_column_letter(i)].width = width
 
-    def _create_summary_data(self, df, library_errors, derating_errors):
-        if df.empty: return []
-        
-        counts = df['Type'].value_counts().to_dict()
-        verdicts = df['Verdict'].value_counts().to_dict()
+    def _style_integrity_sheet(self, sheet, df):
+        for cell in sheet[1]:
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+        severity_col_idx = df.columns.get_loc('Severity') + 1
+        for row_idx in range(2, sheet.max_row + 1):
+            severity = sheet.cell(row=row_idx, column=severity_col_idx).value
+            fill = self.colors['NOK'] if severity == 'FAIL' else self.colors['Marginal']
+            for col_idx in range(1, len(df.columns) + 1):
+                sheet.cell(row=row_idx, column=col_idx).fill = fill
+        for i, col in enumerate(df.columns, 1):
+            sheet.column_dimensions[get_column_letter(i)].width = 45 if col == 'Detail' else 22
+
+    def _style_rail_sheet(self, sheet, df):
+        for cell in sheet[1]:
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+        count_col_idx = df.columns.get_loc('Capacitors') + 1
+        for row_idx in range(2, sheet.max_row + 1):
+            # A confirmed rail without any decoupling is worth a look
+            if not sheet.cell(row=row_idx, column=count_col_idx).value:
+                for col_idx in range(1, len(df.columns) + 1):
+                    sheet.cell(row=row_idx, column=col_idx).fill = self.colors['Marginal']
+        for i, col in enumerate(df.columns, 1):
+            width = 35 if col.startswith('By ') else 18
+            sheet.column_dimensions[get_column_letter(i)].width = width
+
+    def _create_summary_data(self, results, library_errors, derating_errors):
+        if not results: return []
         
-        review_mask = df['Verdict'].str.startswith('User Review', na=False)
-        nok_mask = df['Verdict'].str.startswith('NOK', na=False) | review_mask
+        counts = Counter(r.type for r in results)
+        verdicts = Counter(r.verdict for r in results)
 
         summary = [
-            {'Category': 'Total Components Checked', 'Value': len(df)},
-            {'Category': 'Verdict: OK', 'Value': len(df[df['Verdict'].str.startswith('OK', na=False)])},
-            {'Category': 'Verdict: Marginal', 'Value': len(df[df['Verdict'].str.startswith('Marginal', na=False)])},
-            {'Category': 'Verdict: NOK', 'Value': len(df[nok_mask])},
+            {'Category': 'Total Components Checked', 'Value': len(results)},
+            {'Category': 'Verdict: OK', 'Value': verdicts[Verdict.OK]},
+            {'Category': 'Verdict: Marginal', 'Value': verdicts[Verdict.MARGINAL]},
+            {'Category': 'Verdict: NOK', 'Value': sum(verdicts[v] for v in VIOLATIONS)},
             {'Category': '-- Errors Summary --', 'Value': ''},
             {'Category': 'Library Errors', 'Value': len(library_errors)},
             {'Category': 'Derating Errors', 'Value': len(derating_errors)},
             {'Category': '-- Breakdown by Type --', 'Value': ''}
         ]
         
-        for t, count in counts.items():
+        for t, count in counts.most_common():
             summary.append({'Category': f"Type: {t}", 'Value': count})
             
         return summary
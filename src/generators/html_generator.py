@@ -1,20 +1,26 @@
 import os
 from datetime import datetime
 
+from analyzers.rating_result import Verdict, AuditCode, VIOLATIONS
+from generators.result_format import format_value, reason_text, verdict_label, variant_names
+
 class HTMLExecutiveGenerator:
     """Generates a professional HTML Executive Summary Report."""
     
     def __init__(self, output_path: str):
         self.output_path = output_path
 
-    def generate(self, results: list):
-        """Creates the HTML report with summary stats and critical findings."""
+    def generate(self, results: list, integrity: list = None, rail_summary: list = None):
+        """
+        Creates the HTML report with summary stats, critical findings, rail decoupling and netlist integrity.
+        `results` are RatingResult records; they are formatted to text here.
+        """
+        rail_summary = rail_summary or []
         total = len(results)
-        # Fix: Catch variants like "NOK (Switching)" using startswith
-        noks = [r for r in results if str(r.get('Verdict', '')).startswith('NOK')]
-        marginals = [r for r in results if str(r.get('Verdict', '')).startswith('Marginal')]
-        reviews = [r for r in results if str(r.get('Verdict', '')).startswith('User Review')]
-        oks = [r for r in results if str(r.get('Verdict', '')).startswith('OK')]
+        noks = [r for r in results if r.verdict == Verdict.NOK]
+        marginals = [r for r in results if r.verdict == Verdict.MARGINAL]
+        reviews = [r for r in results if r.verdict == Verdict.REVIEW]
+        oks = [r for r in results if r.verdict == Verdict.OK]
         nok_total = len(noks) + len(reviews)
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -83,6 +89,14 @@ class HTMLExecutiveGenerator:
         {"<p>No critical issues found.</p>" if not noks and not marginals and not reviews else ""}
         {self._generate_findings_table(noks + marginals + reviews)}
 
+        {self._generate_variant_section(results)}
+
+        <h2>Rail Decoupling Summary</h2>
+        {"<p>No confirmed rails.</p>" if not rail_summary else ""}
+        {self._generate_rail_table(rail_summary)}
+
+        {self._generate_integrity_section(integrity)}
+
         <div style="margin-top: 50px; font-size: 0.8em; color: #555; text-align: center;">
             Auto_Altium Passive Verifier v1.0 | Standalone Executive Report
         </div>
@@ -112,30 +126,135 @@ class HTMLExecutiveGenerator:
             </thead>
             <tbody>
         """
-        for item in findings:
-            verdict_str = str(item.get('Verdict', ''))
-            if verdict_str.startswith('NOK'):
+        for item in sorted(findings, key=lambda r: r.sort_key()):
+            if item.verdict == Verdict.NOK:
                 v_class = "v-nok"
-            elif verdict_str.startswith('Marginal'):
+            elif item.verdict == Verdict.MARGINAL:
                 v_class = "v-marginal"
             else:
                 v_class = "v-review"
             table_html += f"""
                 <tr>
+                    <td>{item.designator}</td>
+                    <td>{item.type or '-'}</td>
+                    <td>{format_value(item.applied, item.unit)}</td>
+                    <td>{format_value(item.rating, item.unit)}</td>
+                    <td class="{v_class}">{verdict_label(item.verdict, item.switching)}</td>
+                    <td>{reason_text(item)}</td>
+                    <td class="{self._get_audit_class(item)}">{item.audit_reason}</td>
+                </tr>
+            """
+        table_html += "</tbody></table>"
+        return table_html
+
+    def _generate_variant_section(self, results: list) -> str:
+        """Per-variant verdict counts side by side, when results carry variant verdicts."""
+        variants = variant_names(results)
+        if not variants: return ""
+
+        rows = ""
+        for name in variants:
+            verdicts = [e[0] for e in (r.variant_verdicts.get(name) for r in results) if e]
+            nok = sum(1 for v in verdicts if v in VIOLATIONS)
+            marginal = sum(1 for v in verdicts if v == Verdict.MARGINAL)
+            dnp = sum(1 for v in verdicts if v == Verdict.DNP)
+            rows += f"""
+                <tr>
+                    <td>{name}</td>
+                    <td class="{'v-nok' if nok else ''}">{nok}</td>
+                    <td class="{'v-marginal' if marginal else ''}">{marginal}</td>
+                    <td>{dnp}</td>
+                    <td>{len(verdicts) - dnp}</td>
+                </tr>
+            """
+        return f"""
+        <h2>Assembly Variants</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>Variant</th>
+                    <th>NOK / Review</th>
+                    <th>Marginal</th>
+                    <th>DNP</th>
+                    <th>Fitted</th>
+                </tr>
+            </thead>
+            <tbody>{rows}</tbody>
+        </table>
+        """
+
+    def _generate_rail_table(self, rails: list) -> str:
+        if not rails: return ""
+
+        table_html = """
+        <table>
+            <thead>
+                <tr>
+                    <th>Rail</th>
+                    <th>Voltage</th>
+                    <th>Capacitors</th>
+                    <th>Total Capacitance</th>
+                    <th>Min Rating</th>
+                    <th>By Voltage Rating</th>
+                    <th>By Package</th>
+                </tr>
+            </thead>
+            <tbody>
+        """
+        for item in rails:
+            c_class = "" if item.get('Capacitors') else "v-marginal"
+            table_html += f"""
+                <tr>
+                    <td>{item.get('Rail', '-')}</td>
+                    <td>{item.get('Voltage', 0):g}V</td>
+                    <td class="{c_class}">{item.get('Capacitors', 0)}</td>
+                    <td>{item.get('Total Capacitance', '-')}</td>
+                    <td>{item.get('Min Rating', '-')}</td>
+                    <td>{item.get('By Voltage Rating', '-')}</td>
+                    <td>{item.get('By Package', '-')}</td>
+                </tr>
+            """
+        table_html += "</tbody></table>"
+        return table_html
+
+    def _generate_integrity_section(self, findings: list) -> str:
+        """Netlist Integrity heading and table; omitted when the checks were not run (None)."""
+        if findings is None:
+            return ""
+        empty = "<p>No structural netlist issues found.</p>" if not findings else ""
+        return f"<h2>Netlist Integrity</h2>\n        {empty}\n        {self._generate_integrity_table(findings)}"
+
+    def _generate_integrity_table(self, findings: list) -> str:
+        if not findings: return ""
+
+        table_html = """
+        <table>
+            <thead>
+                <tr>
+                    <th>Check</th>
+                    <th>Severity</th>
+                    <th>Designator</th>
+                    <th>Net</th>
+                    <th>Detail</th>
+                </tr>
+            </thead>
+            <tbody>
+        """
+        for item in findings:
+            s_class = "v-nok" if item.get('Severity') == 'FAIL' else "audit-warn"
+            table_html += f"""
+                <tr>
+                    <td>{item.get('Check', '-')}</td>
+                    <td class="{s_class}">{item.get('Severity', '-')}</td>
                     <td>{item.get('Designator', '-')}</td>
-                    <td>{item.get('Type', '-')}</td>
-                    <td>{item.get('Applied', '-')}</td>
-                    <td>{item.get('Rating', '-')}</td>
-                    <td class="{v_class}">{verdict_str}</td>
-                    <td>{item.get('Reason', '-')}</td>
-                    <td class="{self._get_audit_class(item)}">{item.get('AuditReason', 'Consistent')}</td>
+                    <td>{item.get('Net', '-')}</td>
+                    <td>{item.get('Detail', '-')}</td>
                 </tr>
             """
         table_html += "</tbody></table>"
         return table_html
 
-    def _get_audit_class(self, item: dict) -> str:
-        verdict = item.get('AuditVerdict', 'OK')
-        if verdict == 'FAIL': return "audit-fail"
-        if verdict == 'WARNING': return "audit-warn"
+    def _get_audit_class(self, item) -> str:
+        if item.audit == AuditCode.FAIL: return "audit-fail"
+        if item.audit == AuditCode.WARNING: return "audit-warn"
         return ""
@@ -0,0 +1,82 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from analyzers.rating_result import RatingResult, Verdict
+
+VERDICT_LABELS = {
+    Verdict.NOK: 'NOK',
+    Verdict.REVIEW: 'User Review Required',
+    Verdict.MARGINAL: 'Marginal',
+    Verdict.OK: 'OK',
+    Verdict.MISSING_DATA: 'Unknown (Missing Data)',
+    Verdict.UNKNOWN: 'Unknown',
+    Verdict.FAIL: 'FAIL',
+    Verdict.MANUAL: 'Manual Review Required',
+    Verdict.DNP: 'DNP',
+}
+
+# Columns of the detail tables, in order (variant columns follow)
+DISPLAY_COLUMNS = ('Designator', 'Type', 'Description', 'Footprint', 'Applied', 'Rating', 'Derated',
+                   'Verdict', 'Reason', 'AuditVerdict', 'AuditReason', 'Net Roles')
+
+
+def verdict_label(verdict: Verdict, switching: bool = False) -> str:
+    label = VERDICT_LABELS[verdict]
+    return f"{label} (Switching)" if switching else label
+
+
+def format_value(value: Optional[float], unit: str) -> str:
+    """3.3 'V' -> "3.30V"; powers (W) are shown in mW."""
+    if value is None:
+        return '-'
+    if unit == 'W':
+        return f"{value * 1000:.2f}mW"
+    return f"{value:.2f}{unit}"
+
+
+def reason_text(result: RatingResult) -> str:
+    if result.verdict in (Verdict.NOK, Verdict.REVIEW, Verdict.MARGINAL) and result.note is None:
+        prefix = "MARGINAL" if result.verdict == Verdict.MARGINAL else "EXCEEDED"
+        base = (f"{prefix}: {(result.ratio or 0) * 100:.1f}% of derated limit "
+                f"({format_value(result.derated, result.unit)})")
+    elif result.note is not None:
+        base = result.note
+    else:
+        base = "Safe" if result.verdict == Verdict.OK else '-'
+    if result.verdict == Verdict.REVIEW:
+        return f"[Switching Path - NOK] {base} - Requires manual verification"
+    if result.switching:
+        return f"[Switching Path] {base}"
+    return base
+
+
+def variant_label(entry: Optional[Tuple[Verdict, bool]]) -> str:
+    return '-' if entry is None else verdict_label(*entry)
+
+
+def variant_names(results: Sequence[RatingResult]) -> List[str]:
+    return list(results[0].variant_verdicts) if results else []
+
+
+def display_row(result: RatingResult, variants: Sequence[str] = ()) -> Dict[str, str]:
+    """Report row for one result: DISPLAY_COLUMNS plus 'Verdict [<variant>]' per variant."""
+    row = {
+        'Designator': result.designator,
+        'Type': result.type,
+        'Description': result.description,
+        'Footprint': result.footprint,
+        'Applied': format_value(result.applied, result.unit),
+        'Rating': format_value(result.rating, result.unit),
+        'Derated': format_value(result.derated, result.unit),
+        'Verdict': verdict_label(result.verdict, result.switching),
+        'Reason': reason_text(result),
+        'AuditVerdict': result.audit.name,
+        'AuditReason': result.audit_reason,
+        'Net Roles': result.net_roles,
+    }
+    for name in variants:
+        row[f"Verdict [{name}]"] = variant_label(result.variant_verdicts.get(name))
+    return row
+
+
+def is_library_error(result: RatingResult) -> bool:
+    return 'Library Error' in result.audit_reason
@@ -2,6 +2,8 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from utils.tk_net_selector import show_net_selector
+from analyzers.rating_result import Verdict, AuditCode, VIOLATIONS
+from generators.result_format import display_row, variant_names
 
 # --- GUI THEME CONFIGURATION ---
 # You can change these values to customize the look and feel
@@ -39,11 +41,15 @@ THEME_CONFIG = {
     'font_title': ('Segoe UI', 18, 'bold')
 }
 
+# Dashboard row tag per verdict (anything else is shown as UNKNOWN)
+DASHBOARD_TAGS = {Verdict.OK: 'OK', Verdict.MARGINAL: 'Marginal', Verdict.NOK: 'NOK'}
+
 class VoltageConfirmationList:
     """A sleek Dark Mode GUI with centralized theme config."""
-    def __init__(self, parent, candidates, available_nets=None):
+    def __init__(self, parent, candidates, available_nets=None, roles=None):
         self.results = {}
         self.available_nets = available_nets or []
+        self.roles = roles  # Optional NetRoleIndex, shows why each net was suggested
         self.parent = parent
         self.top = tk.Toplevel(parent)
         self.top.title("Confirm Detected Voltage Points")
@@ -100,6 +106,9 @@ class VoltageConfirmationList:
                  bg=THEME_CONFIG['bg_main'], fg=THEME_CONFIG['text_secondary']).pack(side='left')
         tk.Label(head_row, text="DECISION", width=20, font=THEME_CONFIG['font_table_bold'], 
                  bg=THEME_CONFIG['bg_main'], fg=THEME_CONFIG['text_secondary']).pack(side='left')
+        if self.roles is not None:
+            tk.Label(head_row, text="ROLE", width=10, font=THEME_CONFIG['font_table_bold'],
+                     bg=THEME_CONFIG['bg_main'], fg=THEME_CONFIG['text_secondary']).pack(side='left')
 
         self.rows = []
         for net, val in candidates.items():
@@ -156,6 +165,13 @@ class VoltageConfirmationList:
                                activeforeground="white")
         rb_no.pack(side='left', padx=5)
 
+        role_label = None
+        if self.roles is not None:
+            role_label = tk.Label(ctrl_frame, text=self.roles.role_name(net), width=10,
+                                  font=THEME_CONFIG['font_sub'], bg=THEME_CONFIG['bg_card'],
+                                  fg=THEME_CONFIG['text_secondary'])
+            role_label.pack(side='left', padx=5)
+
         row_data = {
             'row_frame': row_frame,
             'name_label': name_label,
@@ -165,6 +181,7 @@ class VoltageConfirmationList:
             'decision_var': decision_var,
             'original_val': original_val,
             'rbs': [rb_yes, rb_no],
+            'role_label': role_label,
             'net': net
         }
         
@@ -220,6 +237,8 @@ class VoltageConfirmationList:
         row['ctrl_frame'].configure(bg=bg_col)
         for rb in row['rbs']:
             rb.configure(bg=bg_col)
+        if row['role_label'] is not None:
+            row['role_label'].configure(bg=bg_col)
 
     def on_confirm(self):
         for row in self.rows:
@@ -302,7 +321,7 @@ class NetlistSelectionPage:
             parent=self.top,
             title="Select Altium Netlist (.NET)",
             initialdir=initial_dir,
-            filetypes=[("Netlist files", "*.NET"), ("All files", "*.*")]
+            filetypes=[("Netlist files", "*.NET *.NET.gz *.zip"), ("All files", "*.*")]
         )
         if path:
             self.selected_path = path
@@ -341,29 +360,19 @@ class RatingsDashboard:
 
         # 1. Executive Summary Header
         total = len(results_data)
-        noks = [r for r in results_data if str(r.get('Verdict', '')).startswith('NOK')]
-        reviews = [r for r in results_data if str(r.get('Verdict', '')).startswith('User Review')]
-        marginals = [r for r in results_data if str(r.get('Verdict', '')).startswith('Marginal')]
-        missing = [r for r in results_data if "Missing Data" in str(r.get('Verdict', ''))]
-        fails = [r for r in results_data if r.get('AuditVerdict') == 'FAIL']
-        
-        # OK is total minus everything that isn't OK
-        # We need to be careful with double counting (e.g. a component with FAIL audit and NOK verdict)
-        problematic_indices = set()
-        for i, r in enumerate(results_data):
-            v = str(r.get('Verdict', ''))
-            av = r.get('AuditVerdict', '')
-            if (
-                v.startswith('NOK')
-                or v.startswith('Marginal')
-                or v.startswith('User Review')
-                or "Missing Data" in v
-                or av == 'FAIL'
-                or av == 'WARNING'
-            ):
-                problematic_indices.add(i)
-        
-        ok_count = total - len(problematic_indices)
+        noks = [r for r in results_data if r.verdict in VIOLATIONS]
+        marginals = [r for r in results_data if r.verdict == Verdict.MARGINAL]
+        missing = [r for r in results_data if r.verdict == Verdict.MISSING_DATA]
+        fails = [r for r in results_data if r.audit == AuditCode.FAIL]
+        
+        # OK is total minus everything that isn't OK, counting each component once
+        # (e.g. a component with FAIL audit and NOK verdict)
+        problematic = sum(
+            1 for r in results_data
+            if r.verdict in (Verdict.NOK, Verdict.REVIEW, Verdict.MARGINAL, Verdict.MISSING_DATA)
+            or r.audit != AuditCode.OK
+        )
+        ok_count = total - problematic
         
         summary_frame = tk.Frame(self.top, bg=THEME_CONFIG['bg_card'], padx=20, pady=15)
         summary_frame.pack(fill='x', padx=20, pady=10)
@@ -372,7 +381,7 @@ class RatingsDashboard:
                  bg=THEME_CONFIG['bg_card'], fg=THEME_CONFIG['text_accent']).pack(side='left')
         
         stats_text = (
-            f"Total: {total} | NOK: {len(noks) + len(reviews)} | Marginal: {len(marginals)} "
+            f"Total: {total} | NOK: {len(noks)} | Marginal: {len(marginals)} "
             f"| Fail/Issue: {len(fails)} | Missing: {len(missing)} | OK: {ok_count}"
         )
         tk.Label(summary_frame, text=stats_text, font=('Segoe UI', 11), 
@@ -382,7 +391,10 @@ class RatingsDashboard:
         table_frame = tk.Frame(self.top, bg=THEME_CONFIG['bg_main'])
         table_frame.pack(expand=True, fill='both', padx=20, pady=5)
         
+        variants = variant_names(results_data)
         cols = ['Designator', 'Type', 'Description', 'Applied', 'Rating', 'Verdict', 'AuditVerdict', 'AuditReason']
+        # Per-variant verdicts side by side when an assembly variant file was used
+        cols += [f"Verdict [{name}]" for name in variants]
         self.tree = ttk.Treeview(table_frame, columns=cols, show='headings', height=15)
         
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
@@ -406,39 +418,10 @@ class RatingsDashboard:
         self.tree.tag_configure('WARNING', background='#ADD8E6', foreground='#000080')
         self.tree.tag_configure('UNKNOWN', background='#D3D3D3', foreground='black')
         
-        def _sort_key(item):
-            verdict = str(item.get('Verdict', ''))
-            if verdict.startswith('NOK') or verdict.startswith('User Review'):
-                return 0
-            if verdict.startswith('Marginal'):
-                return 1
-            if verdict.startswith('OK'):
-                return 2
-            return 3
-
-        sorted_data = sorted(results_data, key=_sort_key)
-        for item in sorted_data:
-            values = tuple(item.get(col, '-') for col in cols)
-            # Tag logic: AuditVerdict takes priority over Verdict
-            tag = item.get('Verdict', '')
-            if item.get('AuditVerdict') == 'FAIL':
-                tag = 'FAIL'
-            elif item.get('AuditVerdict') == 'WARNING' and not tag.startswith('NOK'):
-                tag = 'WARNING'
-            elif "Missing Data" in tag or tag.startswith('Unknown'):
-                tag = 'UNKNOWN'
-            elif tag.startswith('User Review'):
-                tag = 'WARNING'  # User Review Required -> yellow
-            elif tag.startswith('OK'):
-                tag = 'OK'  # Handles "OK" and "OK (Switching)"
-            elif tag.startswith('Marginal'):
-                tag = 'Marginal'
-            elif tag.startswith('NOK'):
-                tag = 'NOK'
-            else:
-                tag = 'UNKNOWN'
-                
-            self.tree.insert('', 'end', values=values, tags=(tag,))
+        for item in sorted(results_data, key=lambda r: r.sort_key()):
+            row = display_row(item, variants)
+            values = tuple(row.get(col, '-') for col in cols)
+            self.tree.insert('', 'end', values=values, tags=(self._row_tag(item),))
             
         self.tree.pack(side='left', expand=True, fill='both')
         scrollbar.pack(side='right', fill='y')
@@ -450,8 +433,19 @@ class RatingsDashboard:
         tk.Button(btn_frame, text="CLOSE", command=self.top.destroy, width=15,
                   bg=THEME_CONFIG['bg_card'], fg=THEME_CONFIG['text_primary'], font=('Segoe UI', 9, 'bold')).pack(side='right', padx=20)
                   
+    @staticmethod
+    def _row_tag(item) -> str:
+        """Row color: AuditVerdict takes priority over Verdict."""
+        if item.audit == AuditCode.FAIL:
+            return 'FAIL'
+        if item.audit == AuditCode.WARNING and item.verdict != Verdict.NOK:
+            return 'WARNING'
+        if item.verdict == Verdict.REVIEW:
+            return 'WARNING'  # User Review Required -> yellow
+        return DASHBOARD_TAGS.get(item.verdict, 'UNKNOWN')
+
     def _get_summary_text(self, data):
         total = len(data)
-        noks = len([i for i in data if i.get('Verdict') == 'NOK'])
-        margs = len([i for i in data if i.get('Verdict') == 'Marginal'])
+        noks = len([i for i in data if i.verdict == Verdict.NOK])
+        margs = len([i for i in data if i.verdict == Verdict.MARGINAL])
         return f" VERIFICATION REPORT | Total: {total} | Flagged: {noks} NOK | {margs} Marginal "
@@ -2,16 +2,13 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from parsers.netlist_parser import NetlistParser
-from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
+from project_session import ProjectSession
 
 def interactive_verification(netlist_path: str):
     print("--- Power Net Voltage Detection & Confirmation ---")
-    parser = NetlistParser(netlist_path)
-    analyzer = NetVoltageAnalyzer()
+    session = ProjectSession(netlist_path, parser_options={'use_cache': True})
     
-    net_names = parser.get_net_names()
-    candidates = analyzer.detect_candidates(net_names)
+    candidates = session.voltage_candidates
     
     if not candidates:
         print("No voltage candidates detected automatically.")
@@ -23,17 +20,17 @@ def interactive_verification(netlist_path: str):
         while True:
             resp = input(f"\nNet: {net} | Detected: {val}V\nConfirm? [y(es) / n(ot a voltage) / e(dit value)]: ").lower().strip()
             if resp == 'y':
-                analyzer.add_confirmed(net, val)
+                session.confirm_voltage(net, val)
                 print(f"Confirmed {net} = {val}V")
                 break
             elif resp == 'n':
-                analyzer.exclude_net(net)
+                session.exclude_net(net)
                 print(f"Excluded {net}")
                 break
             elif resp == 'e':
                 new_val = input("Enter correct voltage: ").strip()
                 try:
-                    analyzer.add_confirmed(net, float(new_val))
+                    session.confirm_voltage(net, float(new_val))
                     print(f"Confirmed {net} = {new_val}V")
                     break
                 except ValueError:
@@ -42,7 +39,7 @@ def interactive_verification(netlist_path: str):
                 print("Invalid option. Please use y, n, or e.")
 
     print("\n--- Summary of Confirmed Voltages ---")
-    confirmed = analyzer.get_analysis_state()
+    confirmed = session.confirmed_voltages
     for net, v in confirmed.items():
         print(f"{net}: {v}V")
     
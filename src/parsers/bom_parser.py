@@ -1,6 +1,8 @@
 import csv
 from typing import List, Dict, Optional
 
+from parsers.netlist_source import open_text_source
+
 class BOMParser:
     """Parses Altium BOM CSV with enhanced metadata extraction for ratings verification."""
     
@@ -10,9 +12,9 @@ class BOMParser:
         self.parse()
 
     def parse(self):
-        """Reads CSV and extracts key fields."""
+        """Reads CSV (plain, .csv.gz or zipped) and extracts key fields."""
         try:
-            with open(self.filepath, 'r', encoding='utf-8-sig') as f:
+            with open_text_source(self.filepath, extension='.csv', newline='') as f:
                 reader = csv.DictReader(f)
                 for row in reader:
                     # Normalize keys (Altium often has trailing spaces or specific casing)
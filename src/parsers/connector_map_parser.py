@@ -0,0 +1,55 @@
+import csv
+from typing import List, Dict
+
+from parsers.netlist_source import open_text_source
+
+# Expected CSV header; PinA/PinB may be left empty to pair every pin of the
+# two connectors by pin number
+MAP_COLUMNS = ('BoardA', 'ConnectorA', 'PinA', 'BoardB', 'ConnectorB', 'PinB')
+
+
+class ConnectorMapParser:
+    """
+    Parses a board-to-board connector mapping CSV, one mated pin pair (or,
+    with empty pin columns, one mated connector pair) per row:
+
+        BoardA,ConnectorA,PinA,BoardB,ConnectorB,PinB
+        MAIN,J3,1,IO,J1,1
+        MAIN,J4,,PSU,CN2,
+
+    PinA and PinB must be both set or both empty; rows with only one of
+    them are rejected and listed in `errors`.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.pairs: List[Dict[str, str]] = []
+        # "line N: message" per rejected row
+        self.errors: List[str] = []
+        self.parse()
+
+    def parse(self):
+        try:
+            with open_text_source(self.filepath, extension='.csv', newline='') as f:
+                reader = csv.DictReader(f)
+                missing = [c for c in MAP_COLUMNS if c not in (reader.fieldnames or [])]
+                if missing:
+                    print(f"Error parsing connector map: missing columns {', '.join(missing)}")
+                    return
+                for row in reader:
+                    pair = {c: (row.get(c) or '').strip() for c in MAP_COLUMNS}
+                    if not (pair['BoardA'] and pair['ConnectorA'] and pair['BoardB'] and pair['ConnectorB']):
+                        continue
+                    if bool(pair['PinA']) != bool(pair['PinB']):
+                        self.errors.append(f"line {reader.line_num}: PinA and PinB must both be set "
+                                           f"or both be empty ({pair['ConnectorA']}@{pair['BoardA']} "
+                                           f"<-> {pair['ConnectorB']}@{pair['BoardB']})")
+                        continue
+                    self.pairs.append(pair)
+            for error in self.errors:
+                print(f"Error parsing connector map: {error}")
+        except Exception as e:
+            print(f"Error parsing connector map: {e}")
+
+    def get_pairs(self) -> List[Dict[str, str]]:
+        return self.pairs
@@ -0,0 +1,131 @@
+import mmap
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple, Optional, FrozenSet
+
+from parsers.netlist_parser import (
+    BLOCK_COMPONENT, BLOCK_NET, _parse_component_lines, _parse_netname_lines, _pin_entry,
+)
+
+_BOM = b'\xef\xbb\xbf'
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode('utf-8', errors='ignore').strip()
+
+
+class LazyComponent(Mapping):
+    """
+    Component attributes backed by a byte range of a memory-mapped netlist.
+    Only the designator is decoded up front; the TAG/VALUE pairs are decoded
+    on the first access to any other attribute and kept afterwards.
+    """
+    __slots__ = ('_mm', '_start', '_end', '_designator', '_fields', '_data')
+
+    def __init__(self, mm: mmap.mmap, start: int, end: int, designator: str,
+                 fields: Optional[FrozenSet[str]] = None):
+        self._mm = mm
+        self._start = start
+        self._end = end
+        self._designator = designator
+        self._fields = fields
+        self._data: Optional[Dict[str, str]] = None
+
+    @property
+    def designator(self) -> str:
+        return self._designator
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._data is not None
+
+    def _decoded(self) -> Dict[str, str]:
+        if self._data is None:
+            text = self._mm[self._start:self._end].decode('utf-8', errors='ignore')
+            self._data = _parse_component_lines([l.strip() for l in text.splitlines()], self._fields)
+        return self._data
+
+    def __getitem__(self, tag):
+        if tag == 'DESIGNATOR':
+            return self._designator
+        return self._decoded()[tag]
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __len__(self):
+        return len(self._decoded())
+
+    def __repr__(self):
+        state = 'decoded' if self.is_decoded else f"bytes {self._start}-{self._end}"
+        return f"<LazyComponent {self._designator} ({state})>"
+
+
+def _find_closing(mm: mmap.mmap, pos: int, size: int) -> int:
+    """Returns the offset of the next line consisting only of ']' (or size if none)."""
+    while True:
+        hit = mm.find(b'\n]', pos)
+        if hit < 0:
+            return size
+        after = hit + 2
+        if after >= size or mm[after:after + 1] in (b'\n', b'\r', b' ', b'\t'):
+            return hit + 1
+        pos = after
+
+
+def iter_mmap_blocks(mm: mmap.mmap,
+                     fields: Optional[FrozenSet[str]] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Byte-level counterpart of iter_netlist_blocks for a memory-mapped file.
+
+    Component blocks are not decoded: the scanner reads the DESIGNATOR line,
+    jumps to the closing ']' with mmap.find and yields a LazyComponent holding
+    the block's byte offsets. Net blocks are decoded since connectivity is
+    always needed.
+    """
+    size = len(mm)
+    mm.seek(len(_BOM) if mm[:len(_BOM)] == _BOM else 0)
+
+    while mm.tell() < size:
+        line = mm.readline().strip()
+        if line == b'[':
+            start = mm.tell()
+            first = mm.readline().strip()
+            while not first and mm.tell() < size:
+                first = mm.readline().strip()
+            if first == b'DESIGNATOR':
+                designator = _decode(mm.readline())
+                close = _find_closing(mm, start - 1, size)
+                mm.seek(min(size, close + 1))
+                mm.readline()
+                if designator:
+                    yield BLOCK_COMPONENT, LazyComponent(mm, start, close, designator, fields)
+            else:
+                # Legacy [NETNAME ...] blocks (or anything else): decode the whole block
+                close = _find_closing(mm, start - 1, size)
+                text = mm[start:close].decode('utf-8', errors='ignore')
+                mm.seek(min(size, close + 1))
+                mm.readline()
+                if first == b'NETNAME':
+                    net = _parse_netname_lines([l.strip() for l in text.splitlines()])
+                    if net:
+                        yield BLOCK_NET, net
+        elif line == b'(':
+            block = []
+            while mm.tell() < size:
+                entry = mm.readline().strip()
+                if entry == b')':
+                    break
+                if entry:
+                    block.append(_decode(entry))
+            if block:
+                yield BLOCK_NET, (block[0], [_pin_entry(l) for l in block[1:]])
+
+
+def open_mmap(path: str) -> Tuple[object, Optional[mmap.mmap]]:
+    """Opens a file read-only and maps it. Returns (file, None) for empty files."""
+    f = open(path, 'rb')
+    try:
+        return f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Zero-length files cannot be mapped
+        return f, None
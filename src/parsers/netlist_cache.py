@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Optional, Dict, Any
+
+# Override the cache location with this environment variable
+CACHE_DIR_ENV = 'SCHEMATIC_CHECKER_CACHE'
+
+_CHUNK_SIZE = 1 << 20
+
+
+def default_cache_dir() -> str:
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser('~'), '.cache', 'schematic_checker', 'netlists')
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes, read in 1 MB chunks."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(*modules) -> str:
+    """
+    Hashes the source files of the given modules so that editing the parser
+    invalidates old entries even if nobody bumped its version number.
+    Modules without a readable source (e.g. frozen builds) are skipped.
+    """
+    h = hashlib.sha256()
+    for module in modules:
+        path = getattr(module, '__file__', None)
+        if not path or not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class NetlistCache:
+    """Content-addressed pickle store for parsed netlists."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def key_for(self, path: str, parser_version: str, variant: str = '') -> str:
+        """Key = file content hash + parser version/fingerprint + parse mode."""
+        h = hashlib.sha256()
+        h.update(file_digest(path).encode())
+        h.update(parser_version.encode())
+        h.update(variant.encode())
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[Cache] Ignoring unreadable entry {os.path.basename(path)}: {e}")
+            return None
+
+    def store(self, key: str, state: Dict[str, Any]):
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a truncated entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception as e:
+            print(f"[Cache] Could not store parsed netlist: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
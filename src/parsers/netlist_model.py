@@ -0,0 +1,306 @@
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from itertools import accumulate, repeat
+from typing import List, Dict, Tuple, Optional, Iterator
+
+
+class ComponentRecord(Mapping):
+    """
+    Compact per-designator record, read as a {TAG: VALUE} mapping without
+    copying. Attribute names are shared through an interned schema tuple
+    (most parts of a library export the same TAG sequence), only the values
+    are per-record.
+    """
+    __slots__ = ('designator', 'schema', 'values')
+
+    def __init__(self, designator: str, schema: Tuple[str, ...], values: Tuple[str, ...]):
+        self.designator = designator
+        self.schema = schema
+        self.values = values
+
+    def __getitem__(self, tag):
+        try:
+            return self.values[self.schema.index(tag)]
+        except ValueError:
+            raise KeyError(tag) from None
+
+    def __iter__(self):
+        return iter(self.schema)
+
+    def __len__(self):
+        return len(self.schema)
+
+    def get(self, tag: str, default=None):
+        try:
+            return self.values[self.schema.index(tag)]
+        except ValueError:
+            return default
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(zip(self.schema, self.values))
+
+
+class CompactNetlist:
+    """
+    Interned, array-backed netlist.
+
+    Nets, designators and pin names are mapped to integer IDs. Connectivity is
+    stored twice in compressed sparse row (CSR) form:
+      net -> pins:       net_ptr[n]:net_ptr[n+1] slices pin_comp / pin_name
+      component -> pins: comp_ptr[c]:comp_ptr[c+1] slices comp_pin_net / comp_pin_name
+    """
+
+    def __init__(self):
+        self.net_names: List[str] = []
+        self.net_ids: Dict[str, int] = {}
+        self.designators: List[str] = []
+        self.designator_ids: Dict[str, int] = {}
+        self.pin_names: List[str] = []
+        self.records: List[Optional[ComponentRecord]] = []
+
+        self.net_ptr = array('i', [0])
+        self.pin_comp = array('i')
+        self.pin_name = array('i')
+        self.comp_ptr = array('i', [0])
+        self.comp_pin_net = array('i')
+        self.comp_pin_name = array('i')
+        # Declared components and components with pins, counted once by the builder
+        self.num_records = 0
+        self.num_connected = 0
+
+    # --- Sizes ---
+    @property
+    def num_nets(self) -> int:
+        return len(self.net_names)
+
+    @property
+    def num_components(self) -> int:
+        return len(self.designators)
+
+    @property
+    def num_pins(self) -> int:
+        return len(self.pin_comp)
+
+    # --- Connectivity traversal ---
+    def net_pins(self, net_id: int) -> Iterator[Tuple[int, int]]:
+        """Yields (designator_id, pin_name_id) for every pin on a net."""
+        for k in range(self.net_ptr[net_id], self.net_ptr[net_id + 1]):
+            yield self.pin_comp[k], self.pin_name[k]
+
+    def component_pins(self, comp_id: int) -> Iterator[Tuple[int, int]]:
+        """Yields (pin_name_id, net_id) for every connected pin of a component."""
+        for k in range(self.comp_ptr[comp_id], self.comp_ptr[comp_id + 1]):
+            yield self.comp_pin_name[k], self.comp_pin_net[k]
+
+    def component_net_ids(self, comp_id: int) -> List[int]:
+        return list(self.comp_pin_net[self.comp_ptr[comp_id]:self.comp_ptr[comp_id + 1]])
+
+    def net_component_ids(self, net_id: int) -> List[int]:
+        return list(self.pin_comp[self.net_ptr[net_id]:self.net_ptr[net_id + 1]])
+
+    def nbytes(self) -> int:
+        """Approximate size of the connectivity arrays in bytes."""
+        arrays = (self.net_ptr, self.pin_comp, self.pin_name,
+                  self.comp_ptr, self.comp_pin_net, self.comp_pin_name)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class _Interner(dict):
+    """name -> dense ID; an unseen name gets the next ID and is appended to `names`."""
+
+    def __init__(self, names: List[str]):
+        super().__init__()
+        self.names = names
+
+    def __missing__(self, name: str) -> int:
+        name_id = self[name] = len(self.names)
+        self.names.append(sys.intern(name))
+        return name_id
+
+
+class CompactNetlistBuilder:
+    """Accumulates streamed blocks and freezes them into a CompactNetlist."""
+
+    def __init__(self):
+        self.model = CompactNetlist()
+        self._designator_ids = _Interner(self.model.designators)
+        self._net_ids = _Interner(self.model.net_names)
+        self._pin_ids = _Interner(self.model.pin_names)
+        self._schemas: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._values: Dict[str, str] = {}
+        # Flat edge list in arrival order, sorted into CSR by build()
+        self._edge_net = array('i')
+        self._edge_comp = array('i')
+        self._edge_pin = array('i')
+
+    def add_component(self, data: Dict[str, str]):
+        tags = tuple(data)
+        schema = self._schemas.get(tags)
+        if schema is None:
+            schema = self._schemas[tags] = tuple(map(sys.intern, tags))
+        values = data.values()
+        values = tuple(map(self._values.setdefault, values, values))
+        des_id = self._designator_ids[data['DESIGNATOR']]
+        records = self.model.records
+        if des_id >= len(records):
+            records.extend([None] * (des_id + 1 - len(records)))
+        records[des_id] = ComponentRecord(self.model.designators[des_id], schema, values)
+
+    def add_net(self, net_name: str, pins: List[Tuple[str, str]]):
+        """Adds a net given its already split (designator, pin) pairs."""
+        des_ids, pin_ids = self._designator_ids, self._pin_ids
+        self._edge_net.extend([self._net_ids[net_name]] * len(pins))
+        self._edge_comp.extend([des_ids[comp] for comp, _ in pins])
+        self._edge_pin.extend([pin_ids[pin] for _, pin in pins])
+
+    def build(self) -> CompactNetlist:
+        m = self.model
+        m.designator_ids = dict(self._designator_ids)
+        m.net_ids = dict(self._net_ids)
+        m.records.extend([None] * (m.num_components - len(m.records)))
+        m.net_ptr, (m.pin_comp, m.pin_name) = _csr(
+            m.num_nets, self._edge_net, (self._edge_comp, self._edge_pin))
+        m.comp_ptr, (m.comp_pin_net, m.comp_pin_name) = _csr(
+            m.num_components, self._edge_comp, (self._edge_net, self._edge_pin))
+        m.num_records = sum(r is not None for r in m.records)
+        m.num_connected = sum(a != b for a, b in zip(m.comp_ptr, m.comp_ptr[1:]))
+        self._edge_net = self._edge_comp = self._edge_pin = array('i')
+        return m
+
+
+def _csr(num_rows: int, rows: array, columns: Tuple[array, ...]):
+    """Stable sort of edge columns by row, returning (row_ptr, sorted columns)."""
+    counts = Counter(rows)
+    ptr = array('i', accumulate(map(counts.get, range(num_rows), repeat(0)), initial=0))
+    order = sorted(range(len(rows)), key=rows.__getitem__)
+    return ptr, tuple(array('i', map(column.__getitem__, order)) for column in columns)
+
+
+# --- Dict-compatible views used by NetlistParser in compact mode ---
+
+class ComponentsView(Mapping):
+    """designator -> ComponentRecord ({TAG: VALUE} mapping, not copied)."""
+
+    def __init__(self, model: CompactNetlist):
+        self._m = model
+
+    def __getitem__(self, designator):
+        des_id = self._m.designator_ids.get(designator)
+        record = self._m.records[des_id] if des_id is not None else None
+        if record is None:
+            raise KeyError(designator)
+        return record
+
+    def __iter__(self):
+        return (r.designator for r in self._m.records if r is not None)
+
+    def __len__(self):
+        return self._m.num_records
+
+
+class NetsView(Mapping):
+    """net_name -> ["DES-PIN", ...], each list built on first access and kept."""
+
+    def __init__(self, model: CompactNetlist):
+        self._m = model
+        self._rows: Dict[str, List[str]] = {}
+
+    def __getitem__(self, net_name):
+        row = self._rows.get(net_name)
+        if row is None:
+            m = self._m
+            row = self._rows[net_name] = [f"{m.designators[c]}-{m.pin_names[p]}"
+                                          for c, p in m.net_pins(m.net_ids[net_name])]
+        return row
+
+    def __iter__(self):
+        return iter(self._m.net_names)
+
+    def __len__(self):
+        return self._m.num_nets
+
+
+class PinRow(Mapping):
+    """{pin -> net_name} of one component, read from its CSR slice without copying."""
+    __slots__ = ('_m', '_start', '_end')
+
+    def __init__(self, model: CompactNetlist, start: int, end: int):
+        self._m = model
+        self._start = start
+        self._end = end
+
+    def __getitem__(self, pin):
+        m = self._m
+        # Last match, like the dict built in arrival order
+        for k in range(self._end - 1, self._start - 1, -1):
+            if m.pin_names[m.comp_pin_name[k]] == pin:
+                return m.net_names[m.comp_pin_net[k]]
+        raise KeyError(pin)
+
+    def __iter__(self):
+        m = self._m
+        return (m.pin_names[p] for p in m.comp_pin_name[self._start:self._end])
+
+    def __len__(self):
+        return self._end - self._start
+
+    def values(self):
+        m = self._m
+        return [m.net_names[n] for n in m.comp_pin_net[self._start:self._end]]
+
+    def items(self):
+        m = self._m
+        return [(m.pin_names[p], m.net_names[n])
+                for p, n in zip(m.comp_pin_name[self._start:self._end],
+                                m.comp_pin_net[self._start:self._end])]
+
+
+class PinIndexView(Mapping):
+    """designator -> PinRow ({pin -> net_name})"""
+
+    def __init__(self, model: CompactNetlist):
+        self._m = model
+
+    def __getitem__(self, designator):
+        m = self._m
+        des_id = m.designator_ids[designator]
+        start, end = m.comp_ptr[des_id], m.comp_ptr[des_id + 1]
+        if start == end:
+            raise KeyError(designator)
+        return PinRow(m, start, end)
+
+    def __iter__(self):
+        m = self._m
+        return (d for i, d in enumerate(m.designators) if m.comp_ptr[i] != m.comp_ptr[i + 1])
+
+    def __len__(self):
+        return self._m.num_connected
+
+    def items(self):
+        m = self._m
+        return [(d, PinRow(m, start, end))
+                for d, start, end in zip(m.designators, m.comp_ptr, m.comp_ptr[1:]) if start != end]
+
+
+class NetMembersView(Mapping):
+    """net_name -> [(designator, pin), ...], each list built on first access and kept."""
+
+    def __init__(self, model: CompactNetlist):
+        self._m = model
+        self._rows: Dict[str, List[Tuple[str, str]]] = {}
+
+    def __getitem__(self, net_name):
+        row = self._rows.get(net_name)
+        if row is None:
+            m = self._m
+            row = self._rows[net_name] = [(m.designators[c], m.pin_names[p])
+                                          for c, p in m.net_pins(m.net_ids[net_name])]
+        return row
+
+    def __iter__(self):
+        return iter(self._m.net_names)
+
+    def __len__(self):
+        return self._m.num_nets
@@ -1,85 +1,534 @@
+import hashlib
 import re
-from typing import List, Dict, Set
+import sys
+from typing import List, Dict, Iterable, Iterator, Tuple, Optional, FrozenSet, Set
+
+from parsers import netlist_model
+from parsers.netlist_cache import NetlistCache, source_fingerprint
+from parsers.netlist_source import open_text_source, is_compressed, split_archive_path, source_file
+from parsers.netlist_model import (
+    CompactNetlist, CompactNetlistBuilder,
+    ComponentsView, NetsView, PinIndexView, NetMembersView,
+)
+
+# Bump when the parsed representation changes; part of the on-disk cache key
+PARSER_VERSION = '2.1'
+
+# Block kinds emitted by iter_netlist_blocks
+BLOCK_COMPONENT = 'component'
+BLOCK_NET = 'net'
+
+
+def _pin_entry(line: str) -> str:
+    """Reduces a net pin line like "R123-1 100R-1 Passive" to its "R123-1" reference."""
+    return line.split(None, 1)[0] if line else line
+
+
+def split_pin_entry(pin_entry: str) -> Tuple[str, str]:
+    """Splits "U1-A5" into ("U1", "A5"). Entries without a pin number yield an empty pin."""
+    if '-' in pin_entry:
+        comp, pin = pin_entry.split('-', 1)
+        return comp, pin
+    return pin_entry, ''
+
+
+def iter_raw_blocks(lines: Iterable[str]) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Single-pass state machine over the lines of a Protel Netlist 2.0 file.
+
+    Yields ('[', lines) / ('(', lines) for each block with its stripped body
+    lines; blank lines are kept in '[ ]' blocks (they are empty values) and
+    dropped in '( )' blocks. Only the block being read is held in memory.
+    Brackets are only significant when they stand alone on a line, so text
+    such as "(Primary)" or "(-1050,1100)" inside a component never opens a net.
+    """
+    state = None          # None | '[' | '('
+    block: List[str] = []
+
+    for raw in lines:
+        line = raw.strip()
+
+        if state is None:
+            if line == '[' or line == '(':
+                state = line
+                block = []
+            continue
+
+        if state == '[':
+            if line != ']':
+                block.append(line)
+                continue
+        elif line != ')':
+            if line:
+                block.append(line)
+            continue
+
+        yield state, block
+        state = None
+
+
+# A bracket alone on its line (surrounding whitespace allowed, as line.strip() in iter_raw_blocks)
+_BLOCK_OPEN = re.compile(r'^[^\S\n]*([\[(])[^\S\n]*$', re.M)
+_BLOCK_CLOSE = {
+    '[': re.compile(r'^[^\S\n]*\][^\S\n]*$', re.M),
+    '(': re.compile(r'^[^\S\n]*\)[^\S\n]*$', re.M),
+}
+
+
+def iter_block_texts(f, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, str]]:
+    """
+    Fast block splitter for hash scans: yields ('[' | '(', body_text) using
+    regex searches over 1 MB chunks instead of a Python-level loop per line.
+    Block boundaries follow the same rule as iter_raw_blocks (brackets alone
+    on a line, indentation allowed). Only complete lines are scanned; the
+    partial last line of a chunk is kept for the next one. Bodies are only
+    split into lines when a block must be parsed.
+    """
+    buf = ''
+    eof = False
+    while not eof:
+        data = f.read(chunk_size)
+        eof = not data
+        buf += data
+        if eof and buf and not buf.endswith('\n'):
+            buf += '\n'
+        end = buf.rfind('\n') + 1
+        pos = 0
+        while True:
+            m = _BLOCK_OPEN.search(buf, pos, end)
+            if m is None:
+                pos = end
+                break
+            close = _BLOCK_CLOSE[m.group(1)].search(buf, m.end() + 1, end)
+            if close is None:
+                # Incomplete block: wait for the next chunk (or drop it at EOF)
+                pos = m.start()
+                break
+            yield m.group(1), buf[m.end() + 1:close.start()]
+            pos = close.end() + 1
+        buf = buf[pos:]
+
+
+def _block_lines(bracket: str, text: str) -> List[str]:
+    lines = [l.strip() for l in text[:-1].split('\n')] if text else []
+    if bracket == '(':
+        return [l for l in lines if l]
+    return lines
+
+
+def parse_raw_block(bracket: str, block: List[str],
+                    fields: Optional[FrozenSet[str]] = None) -> Optional[Tuple[str, object]]:
+    """Turns one raw block into (BLOCK_COMPONENT, data) / (BLOCK_NET, (name, pins)), or None."""
+    if bracket == '(':
+        if block:
+            return BLOCK_NET, (block[0], [_pin_entry(l) for l in block[1:]])
+        return None
+    first = next((l for l in block if l), None)
+    if first == 'DESIGNATOR':
+        data = _parse_component_lines(block, fields)
+        if data.get('DESIGNATOR'):
+            return BLOCK_COMPONENT, data
+    elif first == 'NETNAME':
+        net = _parse_netname_lines(block)
+        if net:
+            return BLOCK_NET, net
+    return None
+
+
+def iter_netlist_blocks(lines: Iterable[str],
+                        fields: Optional[FrozenSet[str]] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Yields (BLOCK_COMPONENT, {TAG: VALUE}) for every '[ ]' block and
+    (BLOCK_NET, (net_name, [pin, ...])) for every '( )' block or legacy
+    '[NETNAME ...]' block, streaming through iter_raw_blocks.
+    If `fields` is given, only those component tags (plus DESIGNATOR) are kept.
+    """
+    for bracket, block in iter_raw_blocks(lines):
+        parsed = parse_raw_block(bracket, block, fields)
+        if parsed is not None:
+            yield parsed
+
+
+def _parse_component_lines(lines: List[str],
+                           fields: Optional[FrozenSet[str]] = None) -> Dict[str, str]:
+    """
+    Pairs TAG / VALUE lines of a component block.
+    Values may be empty lines, so blank lines are only skipped in tag position;
+    a lone '*' in tag position terminates the attribute list.
+    Tags outside `fields` (when given) are skipped without being stored.
+    """
+    data = {}
+    tag = None
+    for line in lines:
+        if tag is None:
+            if line == '*':
+                break
+            if line:
+                tag = line
+        else:
+            if fields is None or tag in fields or tag == 'DESIGNATOR':
+                data[tag] = line
+            tag = None
+    return data
+
+
+def _parse_netname_lines(lines: List[str]):
+    net_name = None
+    pins = []
+    expect = None
+    for line in lines:
+        if expect == 'NETNAME':
+            net_name = line
+            expect = None
+        elif expect == 'PIN':
+            pins.append(_pin_entry(line))
+            expect = None
+        elif line in ('NETNAME', 'PIN'):
+            expect = line
+    if net_name:
+        return net_name, pins
+    return None
+
+
+def _block_hash(bracket: str, text: str) -> int:
+    """128-bit BLAKE2b digest of a raw block, so distinct blocks never share a hash in practice."""
+    digest = hashlib.blake2b((bracket + text).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class NetlistDelta:
+    """Designators and nets that changed between two parses of the same netlist."""
+
+    def __init__(self):
+        self.added_components: Set[str] = set()
+        self.removed_components: Set[str] = set()
+        self.modified_components: Set[str] = set()
+        self.added_nets: Set[str] = set()
+        self.removed_nets: Set[str] = set()
+        self.modified_nets: Set[str] = set()
+        # Designators with a pin on any added/removed/modified net
+        self.rewired_components: Set[str] = set()
+
+    def is_empty(self) -> bool:
+        return not (self.added_components or self.removed_components or self.modified_components
+                    or self.added_nets or self.removed_nets or self.modified_nets)
+
+    def affected_components(self) -> Set[str]:
+        """Everything whose attributes or connectivity changed (removed parts excluded)."""
+        return (self.added_components | self.modified_components | self.rewired_components) - self.removed_components
+
+    def __repr__(self):
+        return (f"<NetlistDelta components +{len(self.added_components)} -{len(self.removed_components)} "
+                f"~{len(self.modified_components)}, nets +{len(self.added_nets)} "
+                f"-{len(self.removed_nets)} ~{len(self.modified_nets)}>")
+
 
 class NetlistParser:
-    """Parses Protel Netlist 2.0 format (tagged format)."""
-    
-    def __init__(self, filepath: str):
+    """
+    Parses Protel Netlist 2.0 format (tagged format).
+
+    With compact=True the parser builds an interned, CSR-backed CompactNetlist
+    (self.model) instead of dicts; components, nets, pin_index and net_members
+    are then read-only views on top of it.
+
+    With use_cache=True the parsed tables are stored in a content-addressed
+    on-disk cache (see parsers.netlist_cache) and reloaded on later runs as long
+    as neither the file nor the parser changed.
+
+    With lazy=True the file is memory-mapped and components are LazyComponent
+    mappings that decode their attributes on first access (see
+    parsers.mmap_netlist). The map stays open until close() or the next parse().
+    Lazy mode cannot be combined with compact mode or the cache.
+
+    With fields=[...] only the listed component tags (plus DESIGNATOR) are kept;
+    everything else is dropped while parsing. PassiveRatingAnalyzer.COMPONENT_FIELDS
+    is the projection used by the rating pipeline.
+
+    With workers > 1, large files are split at block boundaries and parsed in
+    a process pool (see parsers.parallel_parser); blocks are merged in file
+    order so the result is identical to a sequential parse.
+
+    The path may point at a gzip file ("board.NET.gz"), a zip archive holding a
+    single .NET file, or a zip member ("outputs.zip::Project/board.NET"); such
+    sources are decompressed while streaming (see parsers.netlist_source) and
+    cannot be combined with lazy mode or workers, which need byte offsets.
+
+    With track_changes=True every component and net block is hashed while
+    parsing. reparse() then hash-scans the file again, only parses blocks whose
+    hash is new, patches the tables in place and returns a NetlistDelta.
+    Change tracking needs the plain dict mode (no compact, lazy, workers or cache).
+    """
+
+    def __init__(self, filepath: str, compact: bool = False,
+                 use_cache: bool = False, cache_dir: Optional[str] = None,
+                 lazy: bool = False, workers: int = 1,
+                 fields: Optional[Iterable[str]] = None, track_changes: bool = False):
+        if lazy and (compact or use_cache or workers > 1):
+            raise ValueError("lazy mode cannot be combined with compact mode, the parse cache or workers")
+        if track_changes and (compact or lazy or workers > 1 or use_cache):
+            raise ValueError("track_changes requires the plain dict parse mode")
+        if is_compressed(filepath) and (lazy or workers > 1):
+            raise ValueError("compressed netlists can only be streamed sequentially (no lazy mode or workers)")
         self.filepath = filepath
+        self.compact = compact
+        self.lazy = lazy
+        self.workers = workers
+        self.fields: Optional[FrozenSet[str]] = frozenset(fields) if fields is not None else None
+        self.track_changes = track_changes
+        # Change tracking state: designator / net -> block hash(es), hash -> parsed block
+        self.component_hashes: Dict[str, int] = {}
+        self.net_hashes: Dict[str, Tuple[int, ...]] = {}
+        self._parsed_blocks: Dict[int, Tuple[str, object]] = {}
+        self._mapped = None
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.from_cache = False
+        self.model: Optional[CompactNetlist] = None
         self.components: Dict[str, Dict] = {}
         self.nets: Dict[str, List[str]] = {}
+        # Inverted indexes built while parsing:
+        #   pin_index:   designator -> {pin -> net_name}
+        #   net_members: net_name -> [(designator, pin), ...]
+        self.pin_index: Dict[str, Dict[str, str]] = {}
+        self.net_members: Dict[str, List[Tuple[str, str]]] = {}
+        # designator -> number of [ ] blocks declaring it, for designators seen more than once
+        # (the last block wins in components)
+        self.duplicate_designators: Dict[str, int] = {}
         self.parse()
 
     def parse(self):
-        """Iterates through tagged blocks in the .NET file."""
+        """Streams the .NET file once, collecting component and net blocks as they are read."""
+        self.components = {}
+        self.nets = {}
+        self.pin_index = {}
+        self.net_members = {}
+        self.duplicate_designators = {}
+        self.model = None
+        self.from_cache = False
+        self.component_hashes = {}
+        self.net_hashes = {}
+        self._parsed_blocks = {}
+        self.close()
+
+        cache, key = None, None
+        if self.use_cache:
+            try:
+                cache = NetlistCache(self.cache_dir)
+                key = cache.key_for(source_file(self.filepath), self._cache_version(), self._cache_variant())
+                state = cache.load(key)
+                if state is not None:
+                    self._restore_state(state)
+                    self.from_cache = True
+                    return
+            except OSError as e:
+                print(f"Error reading netlist cache: {e}")
+                cache = None
+
+        self._builder = CompactNetlistBuilder() if self.compact else None
+        seen: Set[str] = set()
         try:
-            with open(self.filepath, 'r', encoding='utf-8-sig', errors='ignore') as f:
-                content = f.read()
-                
-            # 1. Parse Component Blocks [ ]
-            comp_blocks = re.findall(r'\[(.*?)\]', content, re.DOTALL)
-            for block in comp_blocks:
-                lines = [l.strip() for l in block.strip().split('\n') if l.strip()]
-                if lines and lines[0] == 'DESIGNATOR':
-                    self._parse_component_block(lines)
-            
-            # 2. Parse Net Blocks ( ) - Common in Telesis/Protel
-            net_blocks = re.findall(r'\((.*?)\)', content, re.DOTALL)
-            for block in net_blocks:
-                lines = [l.strip() for l in block.strip().split('\n') if l.strip()]
-                if lines:
-                    net_name = lines[0]
-                    self.nets[net_name] = lines[1:]
-
-            # 3. Fallback for [NETNAME] style blocks
-            for block in comp_blocks:
-                lines = [l.strip() for l in block.strip().split('\n') if l.strip()]
-                if lines and lines[0] == 'NETNAME':
-                    self._parse_net_block(lines)
-                    
+            for kind, payload in self._read_blocks():
+                if kind == BLOCK_COMPONENT:
+                    self._note_designator(payload['DESIGNATOR'], seen, self.duplicate_designators)
+                    self._add_component(payload)
+                else:
+                    self._add_net(*payload)
         except Exception as e:
             print(f"Error parsing netlist: {e}")
+            cache = None
+        if self._builder is not None:
+            self._attach_model(self._builder.build())
+            self._builder = None
 
-    def _parse_component_block(self, lines: List[str]):
-        data = {}
-        i = 0
-        while i < len(lines):
-            tag = lines[i]
-            if i + 1 < len(lines):
-                # Check if next line is a tag (starts with uppercase or is a known tag)
-                # But in Protel 2.0, tags are followed by values on the next line.
-                # However, some values might be empty or multi-line (rare in this format).
-                # Simplified: every odd line is a tag, every even line is a value.
-                # Actually, the format is [TAG\nVALUE\nTAG\nVALUE]
-                val = lines[i+1]
-                data[tag] = val
-                i += 2
-            else:
-                i += 1
-        
-        designator = data.get('DESIGNATOR')
-        if designator:
-            self.components[designator] = data
-
-    def _parse_net_block(self, lines: List[str]):
-        net_name = None
-        pins = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if line == 'NETNAME':
-                if i + 1 < len(lines):
-                    net_name = lines[i+1]
-                i += 2
-            elif line == 'PIN':
-                if i + 1 < len(lines):
-                    pins.append(lines[i+1])
-                i += 2
+        if cache is not None:
+            cache.store(key, self._cache_state())
+
+    def _read_blocks(self) -> Iterator[Tuple[str, object]]:
+        if self.track_changes:
+            yield from self._read_tracked_blocks(self.component_hashes, self.net_hashes, self._parsed_blocks)
+            return
+        if self.lazy:
+            from parsers.mmap_netlist import open_mmap, iter_mmap_blocks
+            f, mm = open_mmap(self.filepath)
+            self._mapped = (f, mm)
+            if mm is not None:
+                yield from iter_mmap_blocks(mm, self.fields)
+            return
+        if self.workers > 1:
+            from parsers.parallel_parser import iter_blocks_parallel
+            yield from iter_blocks_parallel(self.filepath, self.workers, self.fields)
+            return
+        with open_text_source(self.filepath, errors='ignore') as f:
+            yield from iter_netlist_blocks(f, self.fields)
+
+    def _read_tracked_blocks(self, component_hashes: Dict[str, int],
+                             net_hashes: Dict[str, Tuple[int, ...]],
+                             parsed_blocks: Dict[int, Tuple[str, object]],
+                             previous: Optional[Dict[int, Tuple[str, object]]] = None
+                             ) -> Iterator[Tuple[str, object]]:
+        """
+        Hashes every raw block, records the hashes per designator / net and
+        only parses blocks whose hash is not found in `previous`.
+        """
+        previous = previous or {}
+        with open_text_source(self.filepath, errors='ignore') as f:
+            for bracket, text in iter_block_texts(f):
+                digest = _block_hash(bracket, text)
+                parsed = previous.get(digest) or parsed_blocks.get(digest)
+                if parsed is None:
+                    parsed = parse_raw_block(bracket, _block_lines(bracket, text), self.fields)
+                    if parsed is None:
+                        continue
+                parsed_blocks[digest] = parsed
+                kind, payload = parsed
+                if kind == BLOCK_COMPONENT:
+                    component_hashes[payload['DESIGNATOR']] = digest
+                else:
+                    net_hashes[payload[0]] = net_hashes.get(payload[0], ()) + (digest,)
+                yield parsed
+
+    def reparse(self) -> NetlistDelta:
+        """
+        Re-reads the file and updates only what changed since the last parse.
+        Unchanged blocks are recognised by hash and not parsed again.
+        """
+        if not self.track_changes:
+            raise ValueError("reparse() needs NetlistParser(..., track_changes=True)")
+
+        old_component_hashes, old_net_hashes = self.component_hashes, self.net_hashes
+        component_hashes: Dict[str, int] = {}
+        net_hashes: Dict[str, Tuple[int, ...]] = {}
+        parsed_blocks: Dict[int, Tuple[str, object]] = {}
+        components: Dict[str, Dict] = {}
+        net_pins: Dict[str, List[str]] = {}
+        duplicates: Dict[str, int] = {}
+        seen: Set[str] = set()
+        for kind, payload in self._read_tracked_blocks(component_hashes, net_hashes,
+                                                       parsed_blocks, self._parsed_blocks):
+            if kind == BLOCK_COMPONENT:
+                self._note_designator(payload['DESIGNATOR'], seen, duplicates)
+                components[payload['DESIGNATOR']] = payload
             else:
-                i += 1
-        
-        if net_name:
-            self.nets[net_name] = pins
+                net_pins.setdefault(payload[0], []).extend(payload[1])
+
+        delta = NetlistDelta()
+        for des in old_component_hashes.keys() - component_hashes.keys():
+            delta.removed_components.add(des)
+            self.components.pop(des, None)
+        for des, digest in component_hashes.items():
+            old = old_component_hashes.get(des)
+            if old == digest:
+                continue
+            (delta.added_components if old is None else delta.modified_components).add(des)
+            self.components[des] = components[des]
+
+        for net in old_net_hashes.keys() - net_hashes.keys():
+            delta.removed_nets.add(net)
+            delta.rewired_components.update(c for c, _ in self.net_members.get(net, []))
+            self._unindex_net(net)
+            del self.nets[net]
+        for net, digests in net_hashes.items():
+            old = old_net_hashes.get(net)
+            if old == digests:
+                continue
+            (delta.added_nets if old is None else delta.modified_nets).add(net)
+            delta.rewired_components.update(c for c, _ in self.net_members.get(net, []))
+            self._unindex_net(net)
+            self.nets[net] = []
+            self._add_net(net, net_pins[net])
+            delta.rewired_components.update(c for c, _ in self.net_members.get(net, []))
+
+        self.component_hashes = component_hashes
+        self.net_hashes = net_hashes
+        self.duplicate_designators = duplicates
+        self._parsed_blocks = parsed_blocks
+        return delta
+
+    def _unindex_net(self, net_name: str):
+        for comp, pin in self.net_members.pop(net_name, []):
+            pins = self.pin_index.get(comp)
+            if pins is not None and pins.get(pin) == net_name:
+                del pins[pin]
+                if not pins:
+                    del self.pin_index[comp]
+
+    def close(self):
+        """Releases the memory map held in lazy mode. Lazy components become unreadable."""
+        if self._mapped is not None:
+            f, mm = self._mapped
+            if mm is not None:
+                mm.close()
+            f.close()
+            self._mapped = None
+
+    def _cache_variant(self) -> str:
+        mode = 'compact' if self.compact else 'dict'
+        member = split_archive_path(self.filepath)[1]
+        if member:
+            mode += '::' + member
+        if self.fields is None:
+            return mode
+        return mode + '|' + '|'.join(sorted(self.fields))
+
+    @staticmethod
+    def _cache_version() -> str:
+        return f"{PARSER_VERSION}:{source_fingerprint(sys.modules[__name__], netlist_model)}"
+
+    def _cache_state(self) -> Dict:
+        if self.model is not None:
+            return {'model': self.model, 'duplicate_designators': self.duplicate_designators}
+        return {
+            'components': self.components,
+            'nets': self.nets,
+            'pin_index': self.pin_index,
+            'net_members': self.net_members,
+            'duplicate_designators': self.duplicate_designators,
+        }
+
+    def _restore_state(self, state: Dict):
+        self.duplicate_designators = state['duplicate_designators']
+        if 'model' in state:
+            self._attach_model(state['model'])
+            return
+        self.components = state['components']
+        self.nets = state['nets']
+        self.pin_index = state['pin_index']
+        self.net_members = state['net_members']
+
+    def _attach_model(self, model: CompactNetlist):
+        self.model = model
+        self.components = ComponentsView(model)
+        self.nets = NetsView(model)
+        self.pin_index = PinIndexView(model)
+        self.net_members = NetMembersView(model)
+
+    @staticmethod
+    def _note_designator(designator: str, seen: Set[str], duplicates: Dict[str, int]):
+        if designator in seen:
+            duplicates[designator] = duplicates.get(designator, 1) + 1
+        else:
+            seen.add(designator)
+
+    def _add_component(self, data: Dict[str, str]):
+        if self._builder is not None:
+            self._builder.add_component(data)
+            return
+        self.components[data['DESIGNATOR']] = data
+
+    def _add_net(self, net_name: str, pins: List[str]):
+        if self._builder is not None:
+            pairs = [split_pin_entry(p) for p in pins]
+            self._builder.add_net(net_name, [(c, p) for c, p in pairs if p])
+            return
+        # A net may be split over several blocks (sometimes an empty trailing one)
+        self.nets.setdefault(net_name, []).extend(pins)
+        members = self.net_members.setdefault(net_name, [])
+        for pin_entry in pins:
+            comp, pin = split_pin_entry(pin_entry)
+            if not pin:
+                continue
+            members.append((comp, pin))
+            self.pin_index.setdefault(comp, {})[pin] = net_name
 
     def get_net_names(self) -> List[str]:
         return list(self.nets.keys())
@@ -87,14 +536,10 @@ class NetlistParser:
     def get_net_pins(self, net_name: str) -> List[str]:
         return self.nets.get(net_name, [])
 
+    def get_net_members(self, net_name: str) -> List[Tuple[str, str]]:
+        """Returns the (designator, pin) pairs connected to a net."""
+        return self.net_members.get(net_name, [])
+
     def get_component_nets(self, designator: str) -> Dict[str, str]:
         """Returns a mapping of pin -> net_name for a given component."""
-        mapping = {}
-        for net_name, pins in self.nets.items():
-            for pin_entry in pins:
-                # Pin entry is typically "U1-A5"
-                if '-' in pin_entry:
-                    comp, pin = pin_entry.split('-', 1)
-                    if comp == designator:
-                        mapping[pin] = net_name
-        return mapping
+        return dict(self.pin_index.get(designator, {}))
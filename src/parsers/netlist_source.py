@@ -0,0 +1,66 @@
+import gzip
+import io
+import zipfile
+from typing import Optional, Tuple, IO
+
+# "archive.zip::Project Outputs/board.NET" selects a member explicitly
+MEMBER_SEPARATOR = '::'
+
+
+def split_archive_path(path: str, member: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """Splits "archive.zip::member" into (archive, member); plain paths are returned unchanged."""
+    if member is None and MEMBER_SEPARATOR in path:
+        path, member = path.split(MEMBER_SEPARATOR, 1)
+    return path, member
+
+
+def is_compressed(path: str) -> bool:
+    """True for .gz files and zip archives, i.e. sources without stable byte offsets."""
+    path, _ = split_archive_path(path)
+    lower = path.lower()
+    return lower.endswith('.gz') or lower.endswith('.zip')
+
+
+def _pick_member(zf: zipfile.ZipFile, member: Optional[str], extension: str) -> str:
+    if member is not None:
+        return member
+    candidates = [n for n in zf.namelist()
+                  if not n.endswith('/') and n.lower().endswith(extension.lower())]
+    if len(candidates) != 1:
+        found = ", ".join(candidates) if candidates else "none"
+        raise ValueError(
+            f"Cannot choose a {extension} member in {zf.filename} (found: {found}); "
+            f"use 'archive.zip{MEMBER_SEPARATOR}member'")
+    return candidates[0]
+
+
+def open_text_source(path: str, extension: str = '.NET', member: Optional[str] = None,
+                     encoding: str = 'utf-8-sig', errors: str = 'strict',
+                     newline: Optional[str] = None) -> IO[str]:
+    """
+    Opens a plain, gzip-compressed or zipped text file as a streaming text
+    handle. Nothing is extracted to disk: gzip and zip members are decompressed
+    on the fly while the caller iterates. Zip archives with a single member
+    matching `extension` are opened without naming the member.
+    """
+    path, member = split_archive_path(path, member)
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding=encoding, errors=errors, newline=newline)
+    if lower.endswith('.zip'):
+        zf = zipfile.ZipFile(path)
+        try:
+            raw = zf.open(_pick_member(zf, member, extension))
+        except Exception:
+            zf.close()
+            raise
+        # The member stream keeps its own handle on the archive file
+        zf.close()
+        return io.TextIOWrapper(raw, encoding=encoding, errors=errors, newline=newline)
+    return open(path, 'r', encoding=encoding, errors=errors, newline=newline)
+
+
+def source_file(path: str) -> str:
+    """The on-disk file behind a source path (the archive for zip members)."""
+    return split_archive_path(path)[0]
+
@@ -0,0 +1,92 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Iterator, Optional, FrozenSet
+
+from parsers.netlist_parser import BLOCK_COMPONENT, iter_netlist_blocks
+
+# Chunks smaller than this are not worth a worker process
+MIN_CHUNK_BYTES = 4 << 20
+
+# A line holding only a closing bracket ends a block; splitting right after
+# it can never cut a component or net in half.
+_BLOCK_END = re.compile(rb'\n[\])][ \t]*\r?\n')
+
+
+def chunk_boundaries(path: str, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Splits a netlist into at most `chunks` byte ranges that each start right
+    after a line consisting of ']' or ')'.
+    """
+    size = os.path.getsize(path)
+    chunks = max(1, min(chunks, size // MIN_CHUNK_BYTES or 1))
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, chunks):
+            target = max(bounds[-1], size * i // chunks)
+            f.seek(target)
+            buf = b''
+            pos = size
+            while True:
+                data = f.read(1 << 16)
+                if not data:
+                    break
+                buf += data
+                match = _BLOCK_END.search(buf)
+                if match:
+                    pos = target + match.end()
+                    break
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_chunk(args) -> List[Tuple[str, object]]:
+    """
+    Worker: parses one byte range. Components are packed as (tags, values)
+    tuples with shared tag tuples and de-duplicated values so that pickle's
+    memo sends each repeated string once; this keeps the transfer back to the
+    parent small compared to the parse itself.
+    """
+    path, start, end, fields = args
+    with open(path, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    text = raw.decode('utf-8-sig' if start == 0 else 'utf-8', errors='ignore')
+
+    schemas, values, out = {}, {}, []
+    for kind, payload in iter_netlist_blocks(text.splitlines(), fields):
+        if kind == BLOCK_COMPONENT:
+            tags = tuple(payload)
+            tags = schemas.setdefault(tags, tags)
+            payload = (tags, tuple(values.setdefault(v, v) for v in payload.values()))
+        out.append((kind, payload))
+    return out
+
+
+def _unpack(blocks: List[Tuple[str, object]]) -> Iterator[Tuple[str, object]]:
+    for kind, payload in blocks:
+        if kind == BLOCK_COMPONENT:
+            payload = dict(zip(*payload))
+        yield kind, payload
+
+
+def iter_blocks_parallel(path: str, workers: int,
+                         fields: Optional[FrozenSet[str]] = None) -> Iterator[Tuple[str, object]]:
+    """
+    Parses byte ranges of the file in a process pool and yields their blocks
+    in file order, so merging into the parser tables is deterministic.
+    Falls back to a single in-process pass when the file is too small to split.
+    """
+    ranges = chunk_boundaries(path, workers)
+    jobs = [(path, start, end, fields) for start, end in ranges]
+    if len(jobs) == 1:
+        yield from _unpack(_parse_chunk(jobs[0]))
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        # map() returns results in submission order regardless of completion order
+        for blocks in pool.map(_parse_chunk, jobs):
+            yield from _unpack(blocks)
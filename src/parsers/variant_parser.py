@@ -0,0 +1,55 @@
+import csv
+from typing import List, Dict, Set
+
+from parsers.netlist_source import open_text_source
+
+# Status column values that remove a part from a variant
+DNP_STATUSES = {'DNP', 'NOT FITTED', 'NF', 'DNF', 'NO'}
+
+
+class VariantParser:
+    """
+    Parses an assembly variant definition CSV. Each row changes one
+    designator in one variant; designators not listed are fitted as in the
+    netlist:
+
+        Variant,Designator,Status,Value
+        LITE,C12,DNP,
+        LITE,R7,,22K
+        PRO,C12,Fitted,22uF 25V
+
+    Status DNP (or Not Fitted / DNF) removes the part. A Value replaces the
+    part's value text (PARTTYPE / DESCRIPTION / Value / Comment) in that
+    variant. A variant that only appears with Fitted rows is still defined.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.variants: List[str] = []
+        self.dnp: Dict[str, Set[str]] = {}
+        self.values: Dict[str, Dict[str, str]] = {}
+        self.parse()
+
+    def parse(self):
+        try:
+            with open_text_source(self.filepath, extension='.csv', newline='') as f:
+                for row in csv.DictReader(f):
+                    variant = (row.get('Variant') or '').strip()
+                    designator = (row.get('Designator') or '').strip()
+                    if not variant or not designator:
+                        continue
+                    if variant not in self.dnp:
+                        self.variants.append(variant)
+                        self.dnp[variant] = set()
+                        self.values[variant] = {}
+                    status = (row.get('Status') or '').strip().upper()
+                    value = (row.get('Value') or '').strip()
+                    if status in DNP_STATUSES:
+                        self.dnp[variant].add(designator)
+                    elif value:
+                        self.values[variant][designator] = value
+        except Exception as e:
+            print(f"Error parsing variant file: {e}")
+
+    def get_variants(self) -> List[str]:
+        return self.variants
@@ -0,0 +1,264 @@
+from typing import Dict, List, Set, Optional, Any, Callable, Tuple
+
+from parsers.netlist_parser import NetlistParser, NetlistDelta
+from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.rule_engine import RuleEngine
+from analyzers.voltage_propagation import RailPropagator
+from analyzers.dc_solver import DCSolver
+from analyzers.connectivity import ConnectivityIndex
+from analyzers.netlist_integrity import NetlistIntegrityAnalyzer
+from analyzers.decoupling import RailDecouplingAggregator
+from analyzers.net_roles import NetRoleIndex, ROLE_GROUND
+from analyzers.variants import VariantSet, not_fitted, variant_link_predicate, variant_resistance
+from parsers.variant_parser import VariantParser
+from analyzers.switching_nodes import SwitchingNodeDetector, DEFAULT_MAX_HOPS
+
+# name -> names it is computed from (inputs or other views)
+_DEPENDENCIES: Dict[str, tuple] = {}
+
+
+def derived(*deps: str):
+    """Declares a memoized session view computed from the named inputs/views."""
+    def wrap(fn: Callable):
+        name = fn.__name__
+        _DEPENDENCIES[name] = deps
+
+        def getter(self):
+            if name not in self._views:
+                self.compute_counts[name] = self.compute_counts.get(name, 0) + 1
+                self._views[name] = fn(self)
+            return self._views[name]
+        getter.__doc__ = fn.__doc__
+        return property(getter)
+    return wrap
+
+
+class ProjectSession:
+    """
+    Shared state for one netlist analysis run.
+
+    Every derived view (parsed netlist, net names, GND nets, switchable nodes,
+    voltage candidates, rating analyzer) is computed on first access and then
+    memoized. Changing an input with set_input()/confirm_voltage()/exclude_net()
+    drops only the views that depend on it, directly or transitively.
+    """
+
+    def __init__(self, netlist_path: str, db_path: Optional[str] = None,
+                 parser_options: Optional[Dict[str, Any]] = None,
+                 switch_hops: int = DEFAULT_MAX_HOPS, variant_path: Optional[str] = None):
+        self._inputs: Dict[str, Any] = {
+            'netlist_path': netlist_path,
+            'db_path': db_path,
+            'parser_options': dict(parser_options or {}),
+            'switch_hops': switch_hops,
+            # Rail voltages supplied from outside this board (see SystemStitcher.board_voltages)
+            'external_voltages': {},
+            'variant_path': variant_path,
+        }
+        self._views: Dict[str, Any] = {}
+        self.compute_counts: Dict[str, int] = {}
+        self.voltage_detector = NetVoltageAnalyzer()
+
+    # --- Inputs & invalidation ---
+    def get_input(self, name: str) -> Any:
+        return self._inputs[name]
+
+    def set_input(self, name: str, value: Any):
+        if name not in self._inputs:
+            raise KeyError(f"Unknown session input: {name}")
+        self._inputs[name] = value
+        self.invalidate(name)
+
+    def invalidate(self, name: str):
+        """Drops every memoized view that depends on `name`."""
+        for view in self._dependents(name) | {name}:
+            self._views.pop(view, None)
+
+    def _dependents(self, name: str) -> Set[str]:
+        """Views that depend on `name`, directly or transitively."""
+        stale = {name}
+        changed = True
+        while changed:
+            changed = False
+            for view, deps in _DEPENDENCIES.items():
+                if view not in stale and stale.intersection(deps):
+                    stale.add(view)
+                    changed = True
+        return stale - {name}
+
+    def reparse(self) -> Optional[NetlistDelta]:
+        """
+        Re-reads the netlist file (e.g. after a re-export). With
+        parser_options track_changes=True the parsed netlist is patched in
+        place by NetlistParser.reparse() and its dependent views are dropped
+        only if the delta is non-empty; the delta is returned. Otherwise the
+        netlist is parsed again from scratch and None is returned.
+        """
+        netlist = self._views.get('netlist')
+        if netlist is None or not netlist.track_changes:
+            self.invalidate('netlist_path')
+            return None
+        delta = netlist.reparse()
+        if not delta.is_empty():
+            for view in self._dependents('netlist'):
+                self._views.pop(view, None)
+        return delta
+
+    def confirm_voltage(self, net_name: str, voltage: float):
+        self.voltage_detector.add_confirmed(net_name, voltage)
+        self.invalidate('confirmations')
+
+    def exclude_net(self, net_name: str):
+        self.voltage_detector.exclude_net(net_name)
+        self.invalidate('exclusions')
+
+    # --- Derived views ---
+    @derived('netlist_path', 'parser_options')
+    def netlist(self) -> NetlistParser:
+        """Parsed netlist."""
+        return NetlistParser(self._inputs['netlist_path'], **self._inputs['parser_options'])
+
+    @derived('netlist')
+    def net_names(self) -> List[str]:
+        return self.netlist.get_net_names()
+
+    @derived('netlist')
+    def connectivity(self) -> ConnectivityIndex:
+        """Indexed neighbor / membership / path queries."""
+        return ConnectivityIndex(self.netlist)
+
+    @derived('netlist')
+    def integrity_findings(self) -> List[Dict]:
+        """Structural netlist defects (see NetlistIntegrityAnalyzer)."""
+        return NetlistIntegrityAnalyzer().analyze(self.netlist)
+
+    @derived('net_names')
+    def name_roles(self) -> NetRoleIndex:
+        """Ground / supply / signal role of every net, classified once by name."""
+        return NetRoleIndex.from_names(self.net_names, self.voltage_detector)
+
+    @derived('name_roles')
+    def gnd_nets(self) -> Set[str]:
+        """Standardizes identification of Ground nets."""
+        return set(self.name_roles.nets_with(ROLE_GROUND))
+
+    @derived('netlist')
+    def switching_detector(self) -> SwitchingNodeDetector:
+        """Net/transistor adjacency index."""
+        return SwitchingNodeDetector(self.netlist)
+
+    @derived('propagation', 'gnd_nets')
+    def supply_rails(self) -> Set[str]:
+        """Nets of every confirmed non-zero rail domain."""
+        return {net for net, v in self.propagation[0].items() if v != 0 and net not in self.gnd_nets}
+
+    @derived('switching_detector', 'gnd_nets', 'supply_rails', 'switch_hops')
+    def switchable_nodes(self) -> Set[str]:
+        """Nets connected to GND via transistor switches (low side), not crossing supply rails."""
+        return self.switching_detector.low_side(self.gnd_nets, self._inputs['switch_hops'], self.supply_rails)
+
+    @derived('switching_detector', 'gnd_nets', 'supply_rails', 'switch_hops')
+    def high_side_nodes(self) -> Set[str]:
+        """Nets connected to a confirmed non-zero rail via transistor switches."""
+        return self.switching_detector.high_side(self.supply_rails, self.gnd_nets, self._inputs['switch_hops'])
+
+    @derived('name_roles', 'exclusions')
+    def voltage_candidates(self) -> Dict[str, float]:
+        return self.voltage_detector.detect_candidates(self.net_names, self.name_roles)
+
+    @derived('confirmations')
+    def confirmed_voltages(self) -> Dict[str, float]:
+        return dict(self.voltage_detector.get_analysis_state())
+
+    @derived('netlist')
+    def rail_propagator(self) -> RailPropagator:
+        """Union-find rail domains joined by 0R / FB / FL / L parts."""
+        return RailPropagator(self.netlist)
+
+    def _fixed_voltages(self) -> Dict[str, float]:
+        fixed = dict(self._inputs['external_voltages'])
+        fixed.update(self.confirmed_voltages)
+        return fixed
+
+    @derived('rail_propagator', 'confirmations', 'external_voltages')
+    def propagation(self) -> Tuple[Dict[str, float], List[Dict]]:
+        """(net -> voltage for every net of a confirmed rail domain, conflicts)."""
+        return self.rail_propagator.propagate(self._fixed_voltages())
+
+    @derived('rail_propagator', 'analyzer')
+    def dc_solver(self) -> DCSolver:
+        """Sparse nodal model of the resistor network."""
+        return DCSolver(self.netlist, self.analyzer.resistance, self.rail_propagator)
+
+    def _solver_fixed(self, rails: Dict[str, float]) -> Dict[str, float]:
+        fixed = {net: 0.0 for net in self.gnd_nets}
+        fixed.update(rails)
+        return fixed
+
+    @derived('dc_solver', 'propagation', 'gnd_nets')
+    def node_voltages(self) -> Dict[str, float]:
+        """DC voltage of every net with a resistive path to a confirmed rail or GND."""
+        return self.dc_solver.solve(self._solver_fixed(self.propagation[0]))
+
+    @derived('dc_solver', 'propagation', 'gnd_nets')
+    def worst_case_voltages(self) -> Dict[str, float]:
+        """Worst-case rail magnitude of every net the DC solve leaves unknown."""
+        return self.dc_solver.worst_case(self._solver_fixed(self.propagation[0]))
+
+    @derived('dc_solver', 'node_voltages', 'worst_case_voltages')
+    def terminal_stress(self) -> Dict[str, float]:
+        """Designator -> pin-to-pin voltage of every two-pin part."""
+        return self.dc_solver.terminal_stress(self.node_voltages, self.worst_case_voltages)
+
+    @derived('name_roles', 'switchable_nodes', 'high_side_nodes', 'propagation')
+    def net_roles(self) -> NetRoleIndex:
+        """name_roles plus switched nodes and confirmed rail domains."""
+        return self.name_roles.with_topology(self.switchable_nodes | self.high_side_nodes,
+                                             self.propagation[0])
+
+    @derived('netlist', 'analyzer', 'propagation', 'gnd_nets')
+    def rail_decoupling(self) -> List[Dict]:
+        """Per-rail capacitor count, total capacitance and rating/package breakdown."""
+        return RailDecouplingAggregator(self.analyzer).aggregate(
+            self.netlist, self.propagation[0], self.gnd_nets, required=self.confirmed_voltages)
+
+    @derived('variant_path')
+    def variants(self) -> Optional[VariantSet]:
+        """Assembly variants from the variant file, or None without one."""
+        path = self._inputs['variant_path']
+        return VariantSet.from_parser(VariantParser(path)) if path else None
+
+    @derived('variants', 'terminal_stress', 'node_voltages')
+    def variant_operating_points(self) -> List[Tuple[int, Dict[str, float], Dict[str, float]]]:
+        """
+        [(variant mask, node voltages, terminal stress)], one entry per class
+        of variants with the same R / FB / FL / L fitting. A class that leaves
+        the network as in the netlist reuses the base views; only the others
+        redo propagation and the DC solve.
+        """
+        variants = self.variants
+        if variants is None:
+            return []
+        points = []
+        for mask, overrides in variants.network_groups():
+            if not overrides:
+                points.append((mask, self.node_voltages, self.terminal_stress))
+                continue
+            propagator = RailPropagator(self.netlist, variant_link_predicate(overrides))
+            fixed = self._solver_fixed(propagator.propagate(self._fixed_voltages())[0])
+            solver = DCSolver(self.netlist, variant_resistance(overrides, self.analyzer.resistance),
+                              propagator, not_fitted(overrides))
+            node_voltages = solver.solve(fixed)
+            points.append((mask, node_voltages,
+                           solver.terminal_stress(node_voltages, solver.worst_case(fixed))))
+        return points
+
+    @derived('db_path')
+    def analyzer(self) -> PassiveRatingAnalyzer:
+        return PassiveRatingAnalyzer(self._inputs['db_path'])
+
+    @derived('analyzer')
+    def rule_engine(self) -> RuleEngine:
+        """Designator prefix -> rating rule, compiled from the component database."""
+        return RuleEngine(self.analyzer)
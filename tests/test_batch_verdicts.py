@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.batch_verdicts import BATCH_VERDICTS
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.rating_result import Verdict
+from analyzers.rule_engine import RuleEngine
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+STD_LIB = {'Library Name': 'triomobil.DbLib'}
+
+# get_verdict() strings -> Verdict
+SCALAR = {'OK': Verdict.OK, 'Marginal': Verdict.MARGINAL, 'NOK': Verdict.NOK, 'Unknown': Verdict.UNKNOWN}
+
+
+def test_batch_matches_scalar_verdicts():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    rng = np.random.default_rng(0)
+    applied = rng.uniform(-60, 60, 2000)
+    rating = rng.choice([0.0, 6.3, 10, 16, 25, 50], 2000)
+    factor = rng.choice([0.0, 0.5, 0.8, 1.0], 2000)
+    threshold = rng.choice([0.5, 0.8, 0.9], 2000)
+    batch = analyzer.analyze_batch(applied, rating, factor, threshold)
+    for i in range(len(batch)):
+        expected = analyzer.get_verdict(abs(applied[i]), rating[i], factor[i], threshold[i])
+        assert batch.verdict(i) == SCALAR[expected]
+    assert sum(batch.counts().values()) == 2000
+
+
+def test_missing_rating_and_stress_are_unknown():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    batch = analyzer.analyze_batch([0.05, 0.2, float('nan'), 0.01], [0.1, 0.1, 0.1, 0.0], 0.8)
+    assert [batch.verdict(i) for i in range(4)] == [Verdict.OK, Verdict.NOK, Verdict.UNKNOWN, Verdict.UNKNOWN]
+    assert batch.derated[1] == pytest.approx(0.08)
+    assert list(batch.rows_with(Verdict.NOK)) == [1]
+
+
+def test_rule_batch_matches_single_analysis():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    engine = RuleEngine(analyzer, [{'name': 'Capacitor', 'prefixes': ['C'], 'model': 'capacitor_voltage',
+                                    'marginal_threshold_percentage': 50}])
+    rule = engine.rule_for('C')
+    comps = [{'designator': f'C{i}', 'type': 'C', 'PARTTYPE': part, 'FOOTPRINT': '0603C', **STD_LIB}
+             for i, part in enumerate(['10uF 16V', '10uF 6V3', '100nF', '1uF 10V'])]
+    stresses = [5.0, 5.5, 3.3, 5.0]
+
+    batch = engine.analyze_batch(rule, comps, stresses)
+    single = [engine.analyze(rule, comp, v) for comp, v in zip(comps, stresses)]
+    assert [r.verdict for r in batch] == [Verdict.OK, Verdict.NOK, Verdict.MISSING_DATA, Verdict.MARGINAL]
+    assert [(r.verdict, r.ratio, r.note, r.audit) for r in batch] == \
+           [(r.verdict, r.ratio, r.note, r.audit) for r in single]
+
+
+def test_large_batch():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    n = 200_000
+    batch = analyzer.analyze_batch(np.linspace(0, 20, n), np.full(n, 16.0), 0.8)
+    counts = batch.counts()
+    assert set(counts) == set(BATCH_VERDICTS)
+    assert counts[Verdict.NOK] == np.count_nonzero(np.linspace(0, 20, n) > 12.8)
@@ -0,0 +1,40 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.connectivity import ConnectivityIndex
+from test_voltage_propagation import RAIL_NET
+
+
+def make_index(tmp_path):
+    path = tmp_path / "rail.NET"
+    path.write_text(RAIL_NET)
+    return ConnectivityIndex(NetlistParser(str(path)))
+
+
+def test_membership(tmp_path):
+    index = make_index(tmp_path)
+    assert index.components_on('VDD_5V') == ['R1', 'C1']
+    assert index.nets_of('FB1') == ['5V_A', '5V_B']
+    assert index.pins_of('C1') == {'1': 'VDD_5V', '2': 'GND'}
+    assert index.members('5V_C') == [('L1', '2'), ('R2', '1')]
+    assert index.between('VDD_5V', 'GND', ('C',)) == ['C1']
+    assert index.components_on('NOPE') == [] and index.nets_of('U99') == []
+
+
+def test_neighbors_and_k_hop(tmp_path):
+    index = make_index(tmp_path)
+    assert index.neighbors('FB1') == {'R1', 'L1'}
+    assert index.k_hop('FB1', 2) == {'R1', 'L1', 'C1', 'R2'}
+    assert index.k_hop('R1', 1, exclude_nets=['VDD_5V']) == {'FB1'}
+
+
+def test_path(tmp_path):
+    index = make_index(tmp_path)
+    assert index.path('VDD_5V', 'SENSE') == ['VDD_5V', 'R1', '5V_A', 'FB1', '5V_B', 'L1', '5V_C', 'R2', 'SENSE']
+    assert index.path('VDD_5V', 'SENSE', via_prefixes=('R', 'FB')) is None
+    assert index.path('5V_A', 'SENSE', exclude_nets=['5V_B']) is None
+    assert index.path('GND', 'VDD_5V') == ['GND', 'C1', 'VDD_5V']
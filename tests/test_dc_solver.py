@@ -0,0 +1,147 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+import pytest
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.dc_solver import DCSolver
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.rating_result import Verdict
+from test_voltage_propagation import component, net
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+DIVIDER_NET = ("PROTEL NETLIST 2.0\n"
+               + component('R1', '10K') + component('R2', '10K') + component('R3', '0R')
+               + component('R4', '1K') + component('R5', '30K') + component('R6', '4K')
+               + component('R7', '100K')
+               + net('VIN', 'R1-1', 'R4-1')
+               + net('MID', 'R1-2', 'R2-1', 'R3-1')
+               + net('MID_B', 'R3-2')
+               + net('GND', 'R2-2', 'R6-2')
+               + net('CHAIN', 'R4-2', 'R5-1')
+               + net('CHAIN_2', 'R5-2', 'R6-1')
+               + net('FLOAT', 'R7-1')
+               + net('FLOAT_2', 'R7-2'))
+
+
+def make_solver(tmp_path):
+    path = tmp_path / "divider.NET"
+    path.write_text(DIVIDER_NET)
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    return DCSolver(NetlistParser(str(path)), analyzer.resistance)
+
+
+def test_divider_and_series_chain(tmp_path):
+    solver = make_solver(tmp_path)
+    v = solver.solve({'VIN': 10.0, 'GND': 0.0})
+
+    assert v['MID'] == pytest.approx(5.0)
+    assert v['MID_B'] == pytest.approx(5.0)  # behind the 0R jumper
+    assert v['CHAIN'] == pytest.approx(10.0 - 10.0 / 35 * 1)
+    assert v['CHAIN_2'] == pytest.approx(10.0 * 4 / 35)
+    assert 'FLOAT' not in v and 'FLOAT_2' not in v
+
+
+def test_capacitors_do_not_block_the_solve(tmp_path):
+    path = tmp_path / "filtered.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('R1', '10K') + component('R2', '10K') + component('C1', '100nF 16V')
+                    + net('VIN', 'R1-1') + net('MID', 'R1-2', 'R2-1', 'C1-1') + net('GND', 'R2-2', 'C1-2'))
+    solver = DCSolver(NetlistParser(str(path)), PassiveRatingAnalyzer(DB_PATH).resistance)
+    fixed = {'VIN': 10.0, 'GND': 0.0}
+    v = solver.solve(fixed)
+    stress = solver.terminal_stress(v, solver.worst_case(fixed))
+
+    assert v['MID'] == pytest.approx(5.0)
+    assert solver.worst_case(fixed) == {}
+    assert stress == pytest.approx({'R1': 5.0, 'R2': 5.0, 'C1': 5.0})
+
+def test_nodes_with_other_parts_stay_unknown(tmp_path):
+    path = tmp_path / "pullup.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('R1', '10K') + component('R2', '10K') + component('U1', 'MCU')
+                    + net('3V3', 'R1-1') + net('SDA', 'R1-2', 'R2-1', 'U1-1')
+                    + net('SDA_R', 'R2-2', 'R9-1')  # R9 is on a net but has no component block
+                    + net('GND', 'U1-2'))
+    solver = DCSolver(NetlistParser(str(path)), PassiveRatingAnalyzer(DB_PATH).resistance)
+    v = solver.solve({'3V3': 3.3, 'GND': 0.0})
+
+    assert solver.resistors == ['R1', 'R2']
+    assert 'SDA' not in v
+    assert 'SDA_R' not in v  # resistively tied to the unknown IC pin only
+
+
+def test_terminal_stress(tmp_path):
+    solver = make_solver(tmp_path)
+    stress = solver.terminal_stress(solver.solve({'VIN': 10.0, 'GND': 0.0}))
+
+    assert stress['R1'] == pytest.approx(5.0)
+    assert stress['R5'] == pytest.approx(10.0 * 30 / 35)
+    assert stress['R7'] is None  # floating: unknown
+
+
+def test_terminal_stress_between_rails(tmp_path):
+    path = tmp_path / "split.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('C1', '10uF 25V') + component('R1', '10K') + component('C2', '1uF')
+                    + net('+12V', 'C1-1') + net('-12V', 'C1-2')
+                    + net('3V3', 'R1-1') + net('1V8', 'R1-2', 'C2-1') + net('NC', 'C2-2'))
+    solver = DCSolver(NetlistParser(str(path)), lambda comp: None)
+    stress = solver.terminal_stress({'+12V': 12.0, '-12V': -12.0, '3V3': 3.3, '1V8': 1.8})
+
+    assert stress['C1'] == pytest.approx(24.0)
+    assert stress['R1'] == pytest.approx(1.5)
+    assert stress['C2'] == pytest.approx(1.8)  # other pin unknown: worst case
+
+
+def test_conjugate_gradient_matches_direct(tmp_path, monkeypatch):
+    import analyzers.dc_solver as dc_solver
+    monkeypatch.setattr(dc_solver, 'coo_matrix', None)
+    solver = make_solver(tmp_path)
+    v = solver.solve({'VIN': 10.0, 'GND': 0.0})
+    assert solver.iterations > 0
+    assert v['CHAIN_2'] == pytest.approx(10.0 * 4 / 35)
+
+
+def test_unknown_pins_take_the_rail_worst_case(tmp_path):
+    path = tmp_path / "pullup.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('R1', '4.7K') + component('C1', '100nF 16V') + component('U1', 'MCU')
+                    + component('R2', '10K') + component('R3', '100K')
+                    + net('3V3', 'R1-1', 'U1-3') + net('RESET_N', 'R1-2', 'C1-1', 'U1-1')
+                    + net('EN', 'R3-1', 'U1-4')
+                    + net('GND', 'C1-2', 'U1-2', 'R3-2') + net('NC', 'R2-1') + net('NC_2', 'R2-2'))
+    solver = DCSolver(NetlistParser(str(path)), PassiveRatingAnalyzer(DB_PATH).resistance)
+    fixed = {'3V3': 3.3, 'GND': 0.0}
+    v = solver.solve(fixed)
+    worst = solver.worst_case(fixed)
+    stress = solver.terminal_stress(v, worst)
+
+    assert 'RESET_N' not in v
+    assert worst == {'RESET_N': 3.3, 'EN': 3.3}
+    assert stress['R1'] == pytest.approx(3.3)  # pull-up into an IC pin: full rail
+    assert stress['C1'] == pytest.approx(3.3)  # not 0 V from the GND pin alone
+    assert stress['R3'] == pytest.approx(3.3)  # pull-down: bounded by the IC supply
+    assert stress['R2'] is None
+
+
+def test_series_resistor_between_unknown_nets_is_unknown(tmp_path):
+    path = tmp_path / "series.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('R1', '22R') + component('U1', 'MCU') + component('U2', 'PHY')
+                    + net('3V3', 'U1-1', 'U2-1') + net('GND', 'U1-2', 'U2-2')
+                    + net('TX', 'U1-3', 'R1-1') + net('TX_R', 'R1-2', 'U2-3'))
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    solver = DCSolver(NetlistParser(str(path)), analyzer.resistance)
+    fixed = {'3V3': 3.3, 'GND': 0.0}
+    worst = solver.worst_case(fixed)
+    stress = solver.terminal_stress(solver.solve(fixed), worst)
+
+    assert worst == {'TX': 3.3, 'TX_R': 3.3}
+    assert stress['R1'] is None  # no rail-to-rail drop between two unsolved nets
+    result = analyzer.analyze_resistor({'designator': 'R1', 'PARTTYPE': '22R 0402'}, stress['R1'])
+    assert result.verdict == Verdict.UNKNOWN and result.applied is None
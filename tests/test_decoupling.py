@@ -0,0 +1,66 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+import pytest
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.decoupling import RailDecouplingAggregator, package_of
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.value_lexer import lex_component
+from test_voltage_propagation import component, net
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+
+def cap(des, parttype, description, footprint):
+    return (f"[\nDESIGNATOR\n{des}\nFOOTPRINT\n{footprint}\nPARTTYPE\n{parttype}\n"
+            f"DESCRIPTION\n{description}\n\n*\n]\n")
+
+
+DECOUPLING_NET = ("PROTEL NETLIST 2.0\n"
+                  + cap('C1', '10uF 16V', 'CAP-SMD-0603 10uF 16V 20% X5R', 'CAP_SMD_0603')
+                  + cap('C2', '10uF 16V', 'CAP-SMD-0603 10uF 16V 20% X5R', 'CAP_SMD_0603')
+                  + cap('C3', '0.1uF', 'CAP-SMD-0402 0.1uF 16V 10% X7R', 'CAP_SMD_0402')
+                  + cap('C4', '4u7 25V', 'Capacitor', '0805C')
+                  + cap('C5', '1nF', 'CAP', '0402C')
+                  + component('R1', '10K')
+                  + net('VDD_3V3', 'C1-1', 'C2-1', 'C3-1', 'R1-1')
+                  + net('VIN_12V', 'C4-1', 'C5-1')
+                  + net('GND', 'C1-2', 'C2-2', 'C3-2', 'C4-2', 'R1-2')
+                  + net('FILT', 'C5-2'))
+
+
+def test_capacitance_parsing():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    assert analyzer._extract_capacitance({'PARTTYPE': '10uF 16V'}) == pytest.approx(10e-6)
+    assert analyzer._extract_capacitance({'PARTTYPE': '100nF/50V'}) == pytest.approx(100e-9)
+    assert analyzer._extract_capacitance({'PARTTYPE': '4u7'}) == pytest.approx(4.7e-6)
+    assert analyzer._extract_capacitance({'PARTTYPE': 'CL10A105KA8NNNC',
+                                          'DESCRIPTION': 'MLCC (1608) 0603 1uF 25VDC'}) == pytest.approx(1e-6)
+    assert analyzer._extract_capacitance({'PARTTYPE': 'N.C.'}) is None
+    for comp, package in (({'FOOTPRINT': 'CAP_SMD_TANTAL_C'}, 'CAP_SMD_TANTAL_C'),
+                          ({'FOOTPRINT': '_1206C'}, '1206'),
+                          ({'FOOTPRINT': 'RES_2512'}, '2512'),
+                          ({'FOOTPRINT': 'CAP_RADIAL', 'DESCRIPTION': 'MLCC 2010 1uF'}, '2010')):
+        assert package_of(comp, lex_component(comp)) == package
+
+
+def test_rail_aggregation(tmp_path):
+    path = tmp_path / "decoupling.NET"
+    path.write_text(DECOUPLING_NET)
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    aggregator = RailDecouplingAggregator(analyzer)
+    rows = aggregator.aggregate(NetlistParser(str(path)), {'VDD_3V3': 3.3, 'VIN_12V': 12.0, 'GND': 0.0},
+                                {'GND'}, required=['VIN_12V'])
+
+    assert [r['Rail'] for r in rows] == ['VIN_12V', 'VDD_3V3']
+    vin, vdd = rows
+    assert vin['Capacitors'] == 1 and vin['Total Capacitance'] == '4.7uF'
+    assert vdd['Capacitors'] == 3
+    assert vdd['Total (uF)'] == pytest.approx(20.1)
+    assert vdd['By Voltage Rating'] == '16V x3'
+    assert vdd['By Package'] == '0402 x1, 0603 x2'
+    assert analyzer.cache_stats()['hits'] >= 1  # C2 reuses C1's lexed part
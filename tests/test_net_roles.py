@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.net_roles import NetRoleIndex, ROLE_GROUND, ROLE_SUPPLY, ROLE_SWITCHED, ROLE_SIGNAL
+from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
+from project_session import ProjectSession
+from test_project_session import SWITCHED_NET, DB_PATH
+from test_netlist_parser import write_sample
+
+NAMES = ['GND', 'AGND', 'VDD_3V3', 'VCC', '+12V', 'LED_K', 'I2C_SDA', 'VDD33']
+
+
+def test_name_roles():
+    roles = NetRoleIndex.from_names(NAMES, NetVoltageAnalyzer())
+    assert roles.nets_with(ROLE_GROUND) == ['GND', 'AGND']
+    assert roles.nets_with(ROLE_SUPPLY) == ['VDD_3V3', 'VCC', '+12V', 'VDD33']
+    assert roles.role_of('I2C_SDA') == ROLE_SIGNAL
+    assert roles.voltage_hint('VDD_3V3') == 3.3
+    assert roles.voltage_hint('VDD33') == 3.3
+    assert roles.voltage_hint('I2C_SDA') is None
+    assert "GND" in roles.reason('AGND')
+    assert roles.counts() == {'signal': 2, 'ground': 2, 'supply': 4, 'switched': 0}
+
+
+def test_detector_uses_shared_roles():
+    detector = NetVoltageAnalyzer()
+    roles = NetRoleIndex.from_names(NAMES, detector)
+    assert detector.detect_candidates(NAMES, roles) == detector.detect_candidates(NAMES)
+    assert detector.identify_gnd_nets(NAMES) == roles.nets_with(ROLE_GROUND)
+
+
+def test_topology_roles():
+    roles = NetRoleIndex.from_names(NAMES, NetVoltageAnalyzer())
+    full = roles.with_topology(switched={'LED_K', 'GND'}, rail_voltages={'I2C_SDA': 1.8})
+    assert full.role_of('LED_K') == ROLE_SWITCHED
+    assert full.role_of('GND') == ROLE_GROUND
+    assert full.role_of('I2C_SDA') == ROLE_SUPPLY and full.voltage_hint('I2C_SDA') == 1.8
+    assert roles.role_of('LED_K') == ROLE_SIGNAL  # original untouched
+
+
+def test_session_shares_role_index(tmp_path):
+    session = ProjectSession(str(write_sample(tmp_path, SWITCHED_NET)), DB_PATH)
+    assert session.gnd_nets == set(session.name_roles.nets_with(ROLE_GROUND))
+    assert session.net_roles.role_name('LED_K') == 'switched'
+    session.voltage_candidates
+    assert session.compute_counts['name_roles'] == 1
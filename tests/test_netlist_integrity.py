@@ -0,0 +1,44 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.netlist_integrity import NetlistIntegrityAnalyzer
+from test_voltage_propagation import component, net
+
+DEFECT_NET = ("PROTEL NETLIST 2.0\n"
+              + component('R1', '10K') + component('R1', '22K') + component('C1', '100nF')
+              + component('MH1', 'HOLE') + component('U1', 'MCU')
+              + net('VCC', 'R1-1', 'U1-1', 'C1-1', 'C1-2')
+              + net('SIG', 'R1-2', 'U2-4')
+              + net('TP', 'U1-2'))
+
+
+def test_integrity_findings(tmp_path):
+    path = tmp_path / "defects.NET"
+    path.write_text(DEFECT_NET)
+    for options in ({}, {'compact': True}):
+        netlist = NetlistParser(str(path), **options)
+        assert netlist.duplicate_designators == {'R1': 2}
+        assert netlist.components['R1']['PARTTYPE'] == '22K'
+
+        findings = NetlistIntegrityAnalyzer().analyze(netlist)
+        found = {(f['Check'], f['Designator'], f['Net']) for f in findings}
+        assert found == {
+            ('Duplicate Designator', 'R1', '-'),
+            ('Unknown Designator', 'U2', 'SIG'),
+            ('Shorted Passive', 'C1', 'VCC'),
+            ('Single-Pin Net', 'U1-2', 'TP'),
+            ('Unconnected Component', 'MH1', '-'),
+        }
+        assert {f['Severity'] for f in findings if f['Check'] == 'Unknown Designator'} == {'FAIL'}
+
+
+def test_only_open_nets_flagged(tmp_path):
+    from test_voltage_propagation import RAIL_NET
+    path = tmp_path / "rail.NET"
+    path.write_text(RAIL_NET)
+    findings = NetlistIntegrityAnalyzer().analyze(NetlistParser(str(path)))
+    assert [f['Check'] for f in findings] == ['Single-Pin Net', 'Single-Pin Net']
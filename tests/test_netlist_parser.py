@@ -0,0 +1,256 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from parsers.netlist_parser import NetlistParser
+
+SAMPLE_NET = """PROTEL NETLIST 2.0
+[
+DESIGNATOR
+Bat1
+FOOTPRINT
+79548211
+PARTTYPE
+CR2032
+DESCRIPTION
+BATT ---  Lithium Battery Non-Rechargeable (Primary) 3V Coin
+Capacity
+
+Library Name
+LibSch_Kus.SchLib
+OriginalSymbolOrigin
+(-1050,1100)
+
+*
+]
+[
+DESIGNATOR
+R1
+FOOTPRINT
+RES_SMD_0603
+PARTTYPE
+100K
+DESCRIPTION
+RES 0603 100K 1/10W
+Library Name
+triomobil.DbLib
+
+*
+]
+[
+DESIGNATOR
+C1
+FOOTPRINT
+CAP_SMD_0402
+PARTTYPE
+100nF 16V
+DESCRIPTION
+CAP 0402 100nF 16V
+Library Name
+triomobil.DbLib
+
+*
+]
+(
+VDD_3V3
+R1-1 100K-1 Passive
+Bat1-1 CR2032-+ Passive
+)
+(
+GND
+C1-2 100nF 16V-2 Passive
+Bat1-2 CR2032-- Passive
+)
+(
+NODE_A
+R1-2 100K-2 Passive
+C1-1 100nF 16V-1 Passive
+)
+(
+GND
+)
+"""
+
+
+def write_sample(tmp_path, text=SAMPLE_NET, name="sample.NET"):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_parse_components_and_nets(tmp_path):
+    parser = NetlistParser(write_sample(tmp_path))
+
+    assert set(parser.components) == {'Bat1', 'R1', 'C1'}
+    # Parentheses inside component text must not create nets
+    assert parser.get_net_names() == ['VDD_3V3', 'GND', 'NODE_A']
+    assert parser.get_net_pins('GND') == ['C1-2', 'Bat1-2']
+
+
+def test_empty_values_keep_tags_aligned(tmp_path):
+    parser = NetlistParser(write_sample(tmp_path))
+    bat = parser.components['Bat1']
+
+    assert bat['Capacity'] == ''
+    assert bat['Library Name'] == 'LibSch_Kus.SchLib'
+    assert bat['OriginalSymbolOrigin'] == '(-1050,1100)'
+
+
+def test_component_nets(tmp_path):
+    parser = NetlistParser(write_sample(tmp_path))
+
+    assert parser.get_component_nets('R1') == {'1': 'VDD_3V3', '2': 'NODE_A'}
+    assert parser.get_component_nets('U99') == {}
+
+
+def test_reparse_does_not_duplicate(tmp_path):
+    parser = NetlistParser(write_sample(tmp_path))
+    parser.parse()
+
+    assert parser.get_net_pins('VDD_3V3') == ['R1-1', 'Bat1-1']
+
+
+def test_net_members_index(tmp_path):
+    parser = NetlistParser(write_sample(tmp_path))
+
+    assert parser.get_net_members('NODE_A') == [('R1', '2'), ('C1', '1')]
+    assert parser.pin_index['Bat1'] == {'1': 'VDD_3V3', '2': 'GND'}
+
+
+def test_compact_model_matches_dict_api(tmp_path):
+    path = write_sample(tmp_path)
+    plain = NetlistParser(path)
+    compact = NetlistParser(path, compact=True)
+
+    assert compact.model is not None and compact.model.num_pins == 6
+    assert {d: compact.components[d] for d in compact.components} == plain.components
+    assert {n: compact.nets[n] for n in compact.nets} == plain.nets
+    assert compact.get_component_nets('C1') == plain.get_component_nets('C1')
+    assert compact.get_net_members('GND') == plain.get_net_members('GND')
+    assert dict(compact.pin_index.items()) == plain.pin_index
+    assert len(compact.components) == len(plain.components)
+    assert len(compact.pin_index) == len(plain.pin_index)
+    # Rows are views over the model or built once, not rebuilt per access
+    assert compact.components['C1'] is compact.components['C1']
+    assert compact.nets['GND'] is compact.nets['GND']
+
+
+def test_cache_roundtrip_and_invalidation(tmp_path):
+    path = write_sample(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    first = NetlistParser(path, use_cache=True, cache_dir=cache_dir)
+    second = NetlistParser(path, use_cache=True, cache_dir=cache_dir)
+    assert not first.from_cache and second.from_cache
+    assert second.components == first.components
+    assert second.get_component_nets('R1') == first.get_component_nets('R1')
+
+    compact = NetlistParser(path, compact=True, use_cache=True, cache_dir=cache_dir)
+    assert not compact.from_cache
+    assert NetlistParser(path, compact=True, use_cache=True, cache_dir=cache_dir).model is not None
+
+    # Changing the file content invalidates the entry
+    write_sample(tmp_path, SAMPLE_NET.replace("NODE_A", "NODE_B"))
+    changed = NetlistParser(path, use_cache=True, cache_dir=cache_dir)
+    assert not changed.from_cache
+    assert 'NODE_B' in changed.nets
+
+
+def test_lazy_mode_decodes_on_first_access(tmp_path):
+    path = write_sample(tmp_path)
+    plain = NetlistParser(path)
+    lazy = NetlistParser(path, lazy=True)
+    try:
+        r1 = lazy.components['R1']
+        assert r1['DESIGNATOR'] == 'R1' and not r1.is_decoded
+        assert r1['FOOTPRINT'] == 'RES_SMD_0603' and r1.is_decoded
+        assert {d: dict(lazy.components[d]) for d in lazy.components} == plain.components
+        assert lazy.nets == plain.nets
+    finally:
+        lazy.close()
+
+
+def test_parallel_parse_matches_sequential(tmp_path, monkeypatch):
+    import parsers.parallel_parser as parallel_parser
+    monkeypatch.setattr(parallel_parser, 'MIN_CHUNK_BYTES', 64)
+    path = write_sample(tmp_path)
+
+    ranges = parallel_parser.chunk_boundaries(path, 4)
+    assert len(ranges) > 1 and ranges[0][0] == 0
+
+    sequential = NetlistParser(path)
+    parallel = NetlistParser(path, workers=4)
+    assert list(parallel.components.items()) == list(sequential.components.items())
+    assert parallel.nets == sequential.nets
+    assert parallel.pin_index == sequential.pin_index
+
+
+def test_field_projection(tmp_path):
+    path = write_sample(tmp_path)
+    fields = ('FOOTPRINT', 'Library Name')
+
+    for parser in (NetlistParser(path, fields=fields), NetlistParser(path, compact=True, fields=fields)):
+        assert parser.components['Bat1'] == {
+            'DESIGNATOR': 'Bat1', 'FOOTPRINT': '79548211', 'Library Name': 'LibSch_Kus.SchLib'}
+
+    lazy = NetlistParser(path, lazy=True, fields=fields)
+    try:
+        assert set(lazy.components['R1']) == {'DESIGNATOR', 'FOOTPRINT', 'Library Name'}
+    finally:
+        lazy.close()
+
+
+def test_incremental_reparse_reports_delta(tmp_path):
+    path = write_sample(tmp_path)
+    parser = NetlistParser(path, track_changes=True)
+    assert parser.reparse().is_empty()
+
+    edited = (SAMPLE_NET
+              .replace("100nF 16V\nDESCRIPTION", "220nF 25V\nDESCRIPTION")     # C1 attributes
+              .replace("(\nNODE_A\nR1-2 100K-2 Passive\nC1-1 100nF 16V-1 Passive\n)\n",
+                       "(\nNODE_B\nR1-2 100K-2 Passive\nC1-1 100nF 16V-1 Passive\n)\n"))
+    write_sample(tmp_path, edited)
+    delta = parser.reparse()
+
+    assert delta.modified_components == {'C1'}
+    assert not delta.added_components and not delta.removed_components
+    assert delta.added_nets == {'NODE_B'} and delta.removed_nets == {'NODE_A'}
+    assert delta.affected_components() == {'C1', 'R1'}
+
+    fresh = NetlistParser(path)
+    assert parser.components == fresh.components
+    assert parser.nets == fresh.nets
+    assert parser.pin_index == fresh.pin_index
+    assert parser.net_members == fresh.net_members
+
+
+
+def test_block_texts_match_line_scan_at_any_chunk_size():
+    import io
+    from parsers.netlist_parser import iter_block_texts, iter_raw_blocks, _block_lines
+    text = SAMPLE_NET + "  [\nDESIGNATOR\nR9\nPARTTYPE\n(Primary)\n\n  ]  \n(\nNODE_Z\nR9-1 1K-1 Passive\n\t)"
+    expected = list(iter_raw_blocks(text.split('\n')))
+    assert expected[-1] == ('(', ['NODE_Z', 'R9-1 1K-1 Passive'])
+    for chunk_size in (1, 2, 3, 7, 19, 37, 64, 100, 1 << 20):
+        blocks = [(b, _block_lines(b, body)) for b, body in iter_block_texts(io.StringIO(text), chunk_size)]
+        assert blocks == expected, chunk_size
+
+def test_parse_from_gzip_and_zip(tmp_path):
+    import gzip
+    import zipfile
+    plain = NetlistParser(write_sample(tmp_path))
+
+    gz_path = tmp_path / "sample.NET.gz"
+    with gzip.open(gz_path, 'wt', encoding='utf-8') as f:
+        f.write(SAMPLE_NET)
+    zip_path = tmp_path / "outputs.zip"
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr("Project Outputs/sample.NET", SAMPLE_NET)
+        zf.writestr("Project Outputs/readme.txt", "not a netlist")
+
+    for source in (str(gz_path), str(zip_path), f"{zip_path}::Project Outputs/sample.NET"):
+        parser = NetlistParser(source)
+        assert parser.components == plain.components
+        assert parser.nets == plain.nets
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.part_cache import PartCache
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+
+def test_lru_eviction_and_stats():
+    cache = PartCache(max_parts=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1          # 'a' becomes most recent
+    cache.put('c', 3)                   # evicts 'b'
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['parts'], stats['hits'], stats['misses']) == (2, 2, 1)
+
+
+def test_placements_of_one_part_share_an_entry():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    part = {'PARTTYPE': '100nF 16V', 'FOOTPRINT': '0402C', 'Library Name': 'triomobil.DbLib'}
+    for i in range(50):
+        comp = {**part, 'designator': f"C{i}"}
+        # Case and spacing differences normalize to the same part
+        if i % 2:
+            comp['PARTTYPE'] = ' 100nf  16v '
+        assert analyzer._extract_voltage_rating(comp) == 16
+        audit = analyzer.audit_component(comp)
+        assert audit['AuditVerdict'] == 'OK'
+        audit['AuditVerdict'] = 'FAIL'  # callers get a copy
+    stats = analyzer.cache_stats()
+    assert stats['parts'] == 1 and stats['misses'] == 1
+    assert stats['hits'] == 99
+
+
+def test_library_name_is_part_of_the_key():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    part = {'PARTTYPE': '10K', 'FOOTPRINT': '0402R'}
+    assert analyzer.audit_component({**part, 'Library Name': 'triomobil.DbLib'})['AuditVerdict'] == 'OK'
+    assert analyzer.audit_component({**part, 'Library Name': 'Misc.IntLib'})['AuditVerdict'] == 'FAIL'
@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from project_session import ProjectSession
+from test_netlist_parser import SAMPLE_NET, write_sample
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+SWITCHED_NET = SAMPLE_NET + """[
+DESIGNATOR
+Q1
+FOOTPRINT
+SOT23
+PARTTYPE
+BSS138
+DESCRIPTION
+MOSFET N-CH
+
+*
+]
+(
+LED_K
+Q1-3 BSS138-3 Passive
+)
+(
+GND
+Q1-2 BSS138-2 Passive
+)
+"""
+
+
+def test_views_are_memoized(tmp_path):
+    session = ProjectSession(write_sample(tmp_path, SWITCHED_NET), DB_PATH)
+
+    assert session.gnd_nets == {'GND'}
+    assert session.switchable_nodes == {'LED_K'}
+    assert session.netlist is session.netlist
+    assert session.analyzer is session.analyzer
+    session.voltage_candidates
+    session.voltage_candidates
+    assert all(count == 1 for count in session.compute_counts.values())
+
+
+def test_invalidation_only_drops_dependents(tmp_path):
+    session = ProjectSession(write_sample(tmp_path), DB_PATH)
+    session.switchable_nodes
+    session.analyzer
+    candidates = session.voltage_candidates
+    assert 'VDD_3V3' in candidates
+
+    session.exclude_net('VDD_3V3')
+    assert 'VDD_3V3' not in session.voltage_candidates
+    assert session.compute_counts['voltage_candidates'] == 2
+    assert session.compute_counts['netlist'] == 1
+
+    session.confirm_voltage('VDD_3V3', 3.3)
+    assert session.confirmed_voltages == {'VDD_3V3': 3.3}
+
+    session.reparse()
+    session.switchable_nodes
+    assert session.compute_counts['netlist'] == 2
+    assert session.compute_counts['switchable_nodes'] == 2
+    assert session.compute_counts['analyzer'] == 1
+
+
+def test_incremental_reparse_keeps_parser(tmp_path):
+    path = write_sample(tmp_path)
+    session = ProjectSession(path, DB_PATH, parser_options={'track_changes': True})
+    netlist = session.netlist
+    assert 'NODE_A' in session.net_names
+
+    assert session.reparse().is_empty()
+    session.net_names
+    assert session.compute_counts['net_names'] == 1
+
+    write_sample(tmp_path, SAMPLE_NET.replace("NODE_A", "NODE_B"))
+    delta = session.reparse()
+    assert delta.added_nets == {'NODE_B'}
+    assert session.netlist is netlist
+    assert 'NODE_B' in session.net_names and 'NODE_A' not in session.net_names
+    assert session.compute_counts['netlist'] == 1
+    assert session.compute_counts['net_names'] == 2
@@ -0,0 +1,84 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.rating_result import RatingResult, Verdict, AuditCode
+from generators.excel_generator import ExcelGenerator
+from generators.html_generator import HTMLExecutiveGenerator
+from generators.result_format import display_row, reason_text
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+STD_LIB = {'Library Name': 'triomobil.DbLib'}
+
+
+def analyzer():
+    return PassiveRatingAnalyzer(DB_PATH)
+
+
+def test_capacitor_result_is_numeric():
+    res = analyzer().analyze_capacitor({'designator': 'C1', 'PARTTYPE': '10uF 16V', 'FOOTPRINT': '0805C',
+                                        **STD_LIB}, 15.0)
+    assert res.verdict == Verdict.NOK and res.audit == AuditCode.FAIL
+    assert res.unit == 'V' and res.applied == 15.0 and res.rating == 16.0
+    assert res.ratio == pytest.approx(15.0 / res.derated)
+    row = display_row(res)
+    assert row['Applied'] == '15.00V' and row['Verdict'] == 'NOK' and row['AuditVerdict'] == 'FAIL'
+    assert row['Reason'].startswith('EXCEEDED: ')
+
+
+def test_missing_data_and_power_units():
+    res = analyzer().analyze_resistor({'designator': 'R1', 'PARTTYPE': 'N.C.', 'FOOTPRINT': '0402R',
+                                       **STD_LIB}, 3.3)
+    assert res.verdict == Verdict.MISSING_DATA and res.applied is None
+    assert display_row(res)['Rating'] == '63.00mW'
+    assert reason_text(res) == "Could not parse resistance value"
+
+
+def test_switching_labels():
+    res = RatingResult('R2', 'R', 'W', 0.2, 0.1, 0.08, 2.5, Verdict.REVIEW)
+    assert display_row(res)['Verdict'] == 'User Review Required'
+    assert reason_text(res) == ("[Switching Path - NOK] EXCEEDED: 250.0% of derated limit (80.00mW)"
+                                " - Requires manual verification")
+    res = RatingResult('R3', 'R', 'W', 0.01, 0.1, 0.08, 0.125, Verdict.OK)
+    res.switching = True
+    assert (display_row(res)['Verdict'], reason_text(res)) == ('OK (Switching)', '[Switching Path] Safe')
+
+
+def test_reports_from_records(tmp_path):
+    a = analyzer()
+    results = [
+        a.analyze_capacitor({'designator': 'C1', 'PARTTYPE': '10uF 6V3', 'FOOTPRINT': '0603C', **STD_LIB}, 5.5),
+        a.analyze_capacitor({'designator': 'C2', 'PARTTYPE': '10uF 25V', 'FOOTPRINT': '0603C', **STD_LIB}, 5.0),
+        a.audit_only({'designator': 'U1', 'FOOTPRINT': 'QFN', 'Library Name': 'Misc.IntLib'}),
+    ]
+    for r in results:
+        r.variant_verdicts = {'BASE': (r.verdict, False), 'LITE': (Verdict.DNP, False)}
+    ExcelGenerator(str(tmp_path / "out.xlsx")).generate(results)
+    sheets = pd.read_excel(tmp_path / "out.xlsx", sheet_name=None)
+    details = sheets['Verification Details']
+    assert list(details['Designator']) == ['C1', 'C2', 'U1']
+    assert list(details['Verdict [LITE]']) == ['DNP'] * 3
+    assert list(sheets['Derating Errors']['Designator']) == ['C1']
+    assert list(sheets['Library Errors']['Designator']) == ['U1']
+
+    HTMLExecutiveGenerator(str(tmp_path / "out.html")).generate(results)
+    html = (tmp_path / "out.html").read_text(encoding='utf-8')
+    assert 'EXCEEDED' in html and '<td>LITE</td>' in html
+    assert 'Netlist Integrity' not in html  # integrity checks not run
+
+
+def test_integrity_summary_row(tmp_path):
+    results = [analyzer().analyze_capacitor({'designator': 'C1', 'PARTTYPE': '10uF 16V',
+                                             'FOOTPRINT': '0603C', **STD_LIB}, 5.0)]
+    path = tmp_path / "out.xlsx"
+    ExcelGenerator(str(path)).generate(results)
+    assert 'Netlist Integrity Findings' not in list(pd.read_excel(path)['Category'])
+
+    ExcelGenerator(str(path)).generate(results, integrity=[])
+    categories = list(pd.read_excel(path)['Category'])
+    assert categories[categories.index('Derating Errors') + 1] == 'Netlist Integrity Findings'
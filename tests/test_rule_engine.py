@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from analyzers.rating_result import Verdict
+from analyzers.rule_engine import RuleEngine, DEFAULT_RULES, validate_database
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+CAP = {'designator': 'CT1', 'type': 'CT', 'PARTTYPE': '10uF 10V', 'FOOTPRINT': '0805C',
+       'Library Name': 'triomobil.DbLib'}
+
+
+def test_database_rules_dispatch_by_prefix():
+    engine = RuleEngine(PassiveRatingAnalyzer(DB_PATH))
+    assert engine.rule_for('C').model == 'capacitor_voltage'
+    assert engine.rule_for('U').model == 'audit' and not engine.rule_for('U').rated
+    assert engine.rule_for('MP') is None
+    assert [r.model for r in engine.rules] == [r['model'] for r in DEFAULT_RULES]
+
+
+def test_new_type_by_configuration():
+    rules = list(DEFAULT_RULES) + [{'name': 'Tantalum', 'prefixes': ['CT'], 'model': 'capacitor_voltage',
+                                    'derating_factor': 0.5, 'marginal_threshold_percentage': 50}]
+    engine = RuleEngine(PassiveRatingAnalyzer(DB_PATH), rules)
+    rule = engine.rule_for('CT')
+    # 3V on a 10V part: 60% of the 5V derated limit, above the rule's 50% threshold
+    res = engine.analyze(rule, CAP, 3.0)
+    assert res.verdict == Verdict.MARGINAL and res.derated == pytest.approx(5.0)
+    assert engine.analyze(engine.rule_for('C'), {**CAP, 'designator': 'C1'}, 3.0).verdict == Verdict.OK
+
+
+def test_schema_validation():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    with pytest.raises(ValueError) as err:
+        RuleEngine(analyzer, [{'prefixes': ['C'], 'model': 'capacitor_voltage'},
+                              {'prefixes': ['C', 'x'], 'model': 'thermal'},
+                              {'prefixes': ['R'], 'model': 'resistor_power', 'derating_factor': 1.5}])
+    message = str(err.value)
+    assert "rules[1].model: unknown model 'thermal'" in message
+    assert "rules[1].prefixes" in message
+    assert "rules[2].derating_factor" in message
+
+    db = json.load(open(DB_PATH))
+    db.pop('rules')
+    assert validate_database(db) == []
+    db['capacitors']['derating_factors'] = {'MLCC': 0.8}
+    assert validate_database(db) == ["capacitors.derating_factors: must be an object with a 'Default' entry"]
+
+
+def test_invalid_database_rejected_at_load(tmp_path):
+    db = json.load(open(DB_PATH))
+    db['resistors']['footprint_power_ratings_watts']['0402'] = '63mW'
+    path = tmp_path / "db.json"
+    path.write_text(json.dumps(db))
+    with pytest.raises(ValueError, match=r"footprint_power_ratings_watts\.0402"):
+        PassiveRatingAnalyzer(str(path))
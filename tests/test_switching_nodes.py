@@ -0,0 +1,58 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.switching_nodes import SwitchingNodeDetector
+from project_session import ProjectSession
+from test_voltage_propagation import component, net
+
+# Q1 pulls Q2's source low; Q3 switches 12V onto a load.
+SWITCH_NET = ("PROTEL NETLIST 2.0\n"
+              + component('Q1', 'NMOS') + component('Q2', 'NMOS') + component('Q3', 'PMOS')
+              + component('R1', '1K')
+              + net('GND', 'Q1-2')
+              + net('EN', 'Q1-1')
+              + net('MID', 'Q1-3', 'Q2-2')
+              + net('LOAD', 'Q2-3', 'R1-1')
+              + net('EN2', 'Q2-1')
+              + net('12V', 'Q3-2', 'R1-2')
+              + net('HS_OUT', 'Q3-3')
+              + net('HS_GATE', 'Q3-1'))
+
+
+def make_detector(tmp_path):
+    path = tmp_path / "switch.NET"
+    path.write_text(SWITCH_NET)
+    return SwitchingNodeDetector(NetlistParser(str(path)))
+
+
+def test_low_side_hops(tmp_path):
+    detector = make_detector(tmp_path)
+    assert detector.low_side({'GND'}, max_hops=1) == {'EN', 'MID'}
+    assert detector.low_side({'GND'}, max_hops=2) == {'EN', 'MID', 'LOAD', 'EN2'}
+
+
+def test_high_side(tmp_path):
+    detector = make_detector(tmp_path)
+    assert detector.high_side({'12V'}, {'GND'}, max_hops=1) == {'HS_OUT', 'HS_GATE'}
+    assert detector.high_side({'12V'}, {'GND'}, max_hops=0) == set()
+
+
+def test_low_side_stops_at_supply_rails(tmp_path):
+    # Q1 (NMOS) drives the gate of load switch Q2 (PMOS) whose source is on 5V
+    path = tmp_path / "load_switch.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('Q1', 'NMOS') + component('Q2', 'PMOS')
+                    + net('GND', 'Q1-2') + net('PG', 'Q1-1')
+                    + net('CTRL', 'Q1-3', 'Q2-1') + net('5V', 'Q2-2') + net('LOAD', 'Q2-3'))
+    detector = SwitchingNodeDetector(NetlistParser(str(path)))
+
+    assert detector.low_side({'GND'}) == {'PG', 'CTRL', 'LOAD', '5V'}  # without rail knowledge
+    assert detector.low_side({'GND'}, rail_nets={'5V'}) == {'PG', 'CTRL', 'LOAD'}
+
+    session = ProjectSession(str(path), os.path.join(os.getcwd(), 'data', 'component_database.json'))
+    session.confirm_voltage('5V', 5.0)
+    assert session.switchable_nodes == {'PG', 'CTRL', 'LOAD'}
@@ -0,0 +1,84 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+import pytest
+
+from analyzers.system_stitcher import SystemStitcher, qualify
+from parsers.connector_map_parser import ConnectorMapParser
+from project_session import ProjectSession
+from test_voltage_propagation import component, net
+
+SUPPLY_NET = ("PROTEL NETLIST 2.0\n"
+              + component('J1', 'CONN 4P') + component('C1', '10uF 25V')
+              + net('VIN_12V', 'J1-1', 'C1-1') + net('GND', 'J1-2', 'C1-2')
+              + net('PG', 'J1-3'))
+
+IO_NET = ("PROTEL NETLIST 2.0\n"
+          + component('J5', 'CONN 4P') + component('FB1', '600R') + component('C7', '1uF 16V')
+          + net('12V_IN', 'J5-1', 'FB1-1') + net('12V_F', 'FB1-2', 'C7-1')
+          + net('GND', 'J5-2', 'C7-2') + net('PWR_GOOD', 'J5-4'))
+
+MAP_CSV = ("BoardA,ConnectorA,PinA,BoardB,ConnectorB,PinB\n"
+           "PSU,J1,,IO,J5,\n"
+           "PSU,J1,3,IO,J5,4\n")
+
+
+@pytest.fixture
+def system_files(tmp_path):
+    (tmp_path / "psu.NET").write_text(SUPPLY_NET)
+    (tmp_path / "io.NET").write_text(IO_NET)
+    (tmp_path / "map.csv").write_text(MAP_CSV)
+    return ({'PSU': str(tmp_path / "psu.NET"), 'IO': str(tmp_path / "io.NET")},
+            str(tmp_path / "map.csv"))
+
+
+def test_stitch_and_propagate(system_files):
+    boards, mapping = system_files
+    system = SystemStitcher.from_files(boards, mapping)
+
+    assert len(system.links) == 3
+    assert system.unmatched == []
+    assert sorted(system.domain_of(qualify('PSU', 'VIN_12V'))) == ['12V_F@IO', '12V_IN@IO', 'VIN_12V@PSU']
+
+    voltages, conflicts = system.propagate({'VIN_12V@PSU': 12.0, 'PG@PSU': 3.3})
+    assert not conflicts
+    assert system.board_voltages(voltages, 'IO') == {'12V_IN': 12.0, '12V_F': 12.0, 'PWR_GOOD': 3.3}
+
+
+def test_session_uses_external_voltages(system_files):
+    boards, mapping = system_files
+    system = SystemStitcher.from_files(boards, mapping)
+    voltages, _ = system.propagate({'VIN_12V@PSU': 12.0})
+
+    session = ProjectSession(boards['IO'], os.path.join(os.getcwd(), 'data', 'component_database.json'))
+    session.set_input('external_voltages', system.board_voltages(voltages, 'IO'))
+    assert session.propagation[0]['12V_F'] == 12.0
+    assert session.terminal_stress['C7'] == 12.0
+
+
+def test_unknown_board_and_unmatched_pins(system_files, tmp_path):
+    boards, _ = system_files
+    bad = tmp_path / "bad.csv"
+    bad.write_text("BoardA,ConnectorA,PinA,BoardB,ConnectorB,PinB\nPSU,J1,9,IO,J5,9\n")
+    assert SystemStitcher.from_files(boards, str(bad)).unmatched == ["J1-9@PSU <-> J5-9@IO: pin not connected"]
+
+    bad.write_text("BoardA,ConnectorA,PinA,BoardB,ConnectorB,PinB\nPSU,J1,1,CPU,J2,1\n")
+    with pytest.raises(ValueError):
+        SystemStitcher.from_files(boards, str(bad))
+
+
+def test_half_pin_rows_are_rejected(system_files, tmp_path):
+    boards, _ = system_files
+    path = tmp_path / "bad_map.csv"
+    path.write_text(MAP_CSV + "PSU,J1,4,IO,J5,\n")
+    parser = ConnectorMapParser(str(path))
+    assert len(parser.get_pairs()) == 2
+    assert parser.errors[0].startswith("line 4: PinA and PinB")
+
+    system = SystemStitcher.from_files(boards, str(path))
+    assert len(system.links) == 3
+    with pytest.raises(ValueError):
+        SystemStitcher(system.boards, [dict(parser.get_pairs()[1], PinB='')])
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from analyzers.value_lexer import lex_text, lex_component
+from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+
+def test_rkm_and_si_notation():
+    assert lex_text('4K7').resistance == [pytest.approx(4700)]
+    assert lex_text('1R0 2M2').resistance == [pytest.approx(1.0), pytest.approx(2.2e6)]
+    assert lex_text('100nF 4u7 2N2').capacitance == [pytest.approx(100e-9), pytest.approx(4.7e-6),
+                                                     pytest.approx(2.2e-9)]
+    assert lex_text('2A2 500mA').current == [pytest.approx(2.2), pytest.approx(0.5)]
+    assert lex_text('6V3 25VDC 2kV').voltage == [pytest.approx(6.3), 25, 2000]
+    assert lex_text('1/10W 100mW').power == [pytest.approx(0.1), pytest.approx(0.1)]
+    assert lex_text('10K Ohm 4.7 Ω').resistance == [10000, 4.7]
+
+
+def test_tokens_need_boundaries():
+    q = lex_text('CAP X7R 10% 100PPM 100MHz CL10A105KA8NNNC RES.(1608) 0603')
+    assert not (q.resistance or q.capacitance or q.voltage or q.power or q.current)
+    assert q.sizes == ['0603']
+    assert q.numbers == [1608]
+
+
+def test_component_fields_lexed_once():
+    q = lex_component({'PARTTYPE': '52K3', 'DESCRIPTION': 'RES --- 0603 1/16W',
+                       'FOOTPRINT': '0603R', 'Library Name': 'x'})
+    assert q.resistance == [pytest.approx(52300)]
+    assert q.sizes == ['0603'] and q.footprint_size == '0603'
+    assert q.power == [pytest.approx(0.0625)]
+
+
+def test_analyzer_extractors():
+    analyzer = PassiveRatingAnalyzer(DB_PATH)
+    assert analyzer.resistance({'PARTTYPE': '330R', 'DESCRIPTION': 'RES --- 0402R'}) == 330
+    assert analyzer.resistance({'PARTTYPE': 'RES 100'}) == 100
+    assert analyzer.resistance({'PARTTYPE': 'N.C.'}) is None
+    assert analyzer._extract_current_rating({'PARTTYPE': 'FB 600R@100MHz 2A2'}) == pytest.approx(2.2)
+    assert analyzer._extract_voltage_rating({'PARTTYPE': '10uF 6V3'}) == pytest.approx(6.3)
+    power = analyzer.db['resistors']['footprint_power_ratings_watts']['0402']
+    assert analyzer._get_resistor_power({'PARTTYPE': '10K', 'FOOTPRINT': '0402R'}) == power
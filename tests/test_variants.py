@@ -0,0 +1,89 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+import pytest
+
+from parsers.variant_parser import VariantParser
+from analyzers.variants import VariantSet, DNP, substitute
+from project_session import ProjectSession
+from test_voltage_propagation import component, net
+
+DB_PATH = os.path.join(os.getcwd(), 'data', 'component_database.json')
+
+VARIANT_NET = ("PROTEL NETLIST 2.0\n"
+               + component('R1', '10K') + component('R2', '10K') + component('C1', '100nF 16V')
+               + net('VIN', 'R1-1', 'C1-1')
+               + net('MID', 'R1-2', 'R2-1')
+               + net('GND', 'R2-2', 'C1-2'))
+
+VARIANT_CSV = ("Variant,Designator,Status,Value\n"
+               "BASE,R1,Fitted,\n"
+               "LITE,C1,DNP,\n"
+               "HV,R2,,30K\n"
+               "HV,C1,,100nF 50V\n"
+               "HV2,R2,,30K\n")
+
+
+@pytest.fixture
+def variant_file(tmp_path):
+    path = tmp_path / "variants.csv"
+    path.write_text(VARIANT_CSV)
+    return str(path)
+
+
+def test_variant_masks(variant_file):
+    variants = VariantSet.from_parser(VariantParser(variant_file))
+    assert variants.variants == ['BASE', 'LITE', 'HV', 'HV2']
+    assert variants.groups('C1') == [(0b0010, DNP), (0b0100, '100nF 50V'), (0b1001, None)]
+    assert variants.groups('R9') == [(0b1111, None)]
+    assert variants.names(0b1100) == ['HV', 'HV2']
+
+    network = sorted(variants.network_groups(), key=lambda g: g[0])
+    assert network == [(0b0011, {}), (0b1100, {'R2': '30K'})]
+    assert substitute({'PARTTYPE': '10K', 'DESCRIPTION': 'RES 10K'}, '30K') == \
+        {'PARTTYPE': '30K', 'DESCRIPTION': 'RES 30K'}
+
+
+def test_substitute_keeps_part_data():
+    comp = {'PARTTYPE': '10K 0603', 'DESCRIPTION': 'RES 10K 1% 0,1W 0603', 'Library Name': 'triomobil.DbLib'}
+    assert substitute(comp, '30K') == {'PARTTYPE': '30K 0603', 'DESCRIPTION': 'RES 30K 1% 0,1W 0603',
+                                       'Library Name': 'triomobil.DbLib'}
+    assert substitute({'DESCRIPTION': 'CAP 100nF 16V X7R'}, '100nF 50V') == \
+        {'PARTTYPE': '100nF 50V', 'DESCRIPTION': 'CAP 100nF 50V X7R'}
+    assert substitute({'Value': 'X7R'}, '22K') == {'PARTTYPE': '22K', 'Value': '22K X7R'}
+
+
+def test_variant_operating_points(tmp_path, variant_file):
+    path = tmp_path / "variant.NET"
+    path.write_text(VARIANT_NET)
+    session = ProjectSession(str(path), DB_PATH, variant_path=variant_file)
+    session.confirm_voltage('VIN', 12.0)
+
+    points = {mask: stress for mask, _, stress in session.variant_operating_points}
+    assert points[0b0011] is session.terminal_stress  # unchanged network is shared
+    assert points[0b0011]['R2'] == pytest.approx(6.0)
+    assert points[0b1100]['R2'] == pytest.approx(9.0)
+    assert session.compute_counts['node_voltages'] == 1
+
+
+def test_dnp_resistor_is_open(tmp_path):
+    path = tmp_path / "dnp.NET"
+    path.write_text("PROTEL NETLIST 2.0\n"
+                    + component('R1', '10K') + component('R2', '10K') + component('R3', '10K')
+                    + net('VIN', 'R1-1')
+                    + net('MID', 'R1-2', 'R2-1', 'R3-1')
+                    + net('GND', 'R2-2', 'R3-2'))
+    csv_path = tmp_path / "variants.csv"
+    csv_path.write_text("Variant,Designator,Status,Value\nBASE,R1,Fitted,\nLITE,R3,DNP,\n")
+    session = ProjectSession(str(path), DB_PATH, variant_path=str(csv_path))
+    session.confirm_voltage('VIN', 12.0)
+
+    points = {mask: (voltages, stress) for mask, voltages, stress in session.variant_operating_points}
+    assert points[0b01][1]['R2'] == pytest.approx(4.0)
+    voltages, stress = points[0b10]
+    assert voltages['MID'] == pytest.approx(6.0)  # R3 removed, not an unknown load
+    assert stress['R2'] == pytest.approx(6.0)
+    assert 'R3' not in stress
@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), 'src'))
+
+from parsers.netlist_parser import NetlistParser
+from analyzers.voltage_propagation import RailPropagator, is_zero_ohm
+
+
+def component(des, value):
+    return f"[\nDESIGNATOR\n{des}\nFOOTPRINT\n0603\nPARTTYPE\n{value}\nDESCRIPTION\n{value}\n\n*\n]\n"
+
+
+def net(name, *pins):
+    return "(\n" + name + "\n" + "\n".join(pins) + "\n)\n"
+
+
+RAIL_NET = ("PROTEL NETLIST 2.0\n"
+            + component('R1', '0R') + component('FB1', '600R@100MHz') + component('L1', '4.7uH')
+            + component('R2', '10K') + component('C1', '100nF 16V')
+            + net('VDD_5V', 'R1-1', 'C1-1')
+            + net('5V_A', 'R1-2', 'FB1-1')
+            + net('5V_B', 'FB1-2', 'L1-1')
+            + net('5V_C', 'L1-2', 'R2-1')
+            + net('SENSE', 'R2-2')
+            + net('GND', 'C1-2'))
+
+
+def test_zero_ohm_detection():
+    assert is_zero_ohm({'PARTTYPE': '0R'})
+    assert is_zero_ohm({'Value': '0 Ohm'})
+    assert is_zero_ohm({'Comment': '0R0'})
+    assert not is_zero_ohm({'PARTTYPE': '100K'})
+    assert not is_zero_ohm({'PARTTYPE': '0603SAJ0000T5E'})
+    assert not is_zero_ohm({'Value': '0.1%'})
+    assert is_zero_ohm({'Value': '0'}) and is_zero_ohm({'PARTTYPE': '0R 1% 0603'})
+    for value in ('1K 0,1W', '4K7 0,25W 0603', '10K 1% 0-5V'):
+        assert not is_zero_ohm({'PARTTYPE': value}), value
+
+
+def test_propagates_through_series_parts(tmp_path):
+    path = tmp_path / "rail.NET"
+    path.write_text(RAIL_NET)
+    propagator = RailPropagator(NetlistParser(str(path)))
+
+    voltages, conflicts = propagator.propagate({'VDD_5V': 5.0, 'GND': 0.0})
+    assert not conflicts
+    assert voltages['5V_A'] == voltages['5V_B'] == voltages['5V_C'] == 5.0
+    assert 'SENSE' not in voltages
+    assert sorted(propagator.domain_of('5V_B')) == ['5V_A', '5V_B', '5V_C', 'VDD_5V']
+
+
+def test_conflicting_confirmations_keep_worst_case(tmp_path):
+    path = tmp_path / "rail.NET"
+    path.write_text(RAIL_NET)
+    propagator = RailPropagator(NetlistParser(str(path)))
+
+    voltages, conflicts = propagator.propagate({'VDD_5V': 5.0, '5V_C': 3.3})
+    assert len(conflicts) == 1
+    assert voltages['5V_B'] == 5.0
+    assert voltages['5V_C'] == 3.3
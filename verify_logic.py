@@ -6,28 +6,29 @@ import pandas as pd
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from parsers.bom_parser import BOMParser
-from parsers.netlist_parser import NetlistParser
-from analyzers.net_voltage_analyzer import NetVoltageAnalyzer
 from analyzers.passive_rating_analyzer import PassiveRatingAnalyzer
+from project_session import ProjectSession
 from generators.excel_generator import ExcelGenerator
+from generators.result_format import display_row
+from analyzers.rating_result import Verdict
 
 def automated_verify(netlist_path, db_path):
     print(f"--- Automated Verification: {os.path.basename(netlist_path)} ---")
     
     # 1. Setup
-    netlist = NetlistParser(netlist_path)
-    analyzer = PassiveRatingAnalyzer(db_path)
-    voltage_detector = NetVoltageAnalyzer()
+    session = ProjectSession(netlist_path, db_path,
+                             parser_options={'use_cache': True, 'fields': PassiveRatingAnalyzer.COMPONENT_FIELDS})
+    netlist = session.netlist
+    analyzer = session.analyzer
     
     # 2. Get all Nets and Auto-Confirm Voltages
-    net_names = netlist.get_net_names()
-    candidates = voltage_detector.detect_candidates(net_names)
+    candidates = session.voltage_candidates
     
     print(f"Detected {len(candidates)} potential voltage points. Auto-confirming all logical matches...")
     for net, val in candidates.items():
-        voltage_detector.add_confirmed(net, val)
+        session.confirm_voltage(net, val)
     
-    confirmed_voltages = voltage_detector.get_analysis_state()
+    confirmed_voltages = session.confirmed_voltages
 
     # 3. Use all components found in the Netlist to create a virtual BOM
     # This ensures we test against real designators found in your file
@@ -75,10 +76,9 @@ def automated_verify(netlist_path, db_path):
         else:
             res = analyzer.analyze_generic(comp_info, voltage=max_v)
             
-        res['Type'] = comp_info['type']
-        res['Value'] = part_type
-        res['Footprint'] = footprint
-        res['Net_Voltage'] = f"{max_v}V"
+        res.type = comp_info['type']
+        res.description = part_type
+        res.footprint = footprint
         results.append(res)
 
     # 4. Generate Styled Excel
@@ -91,17 +91,16 @@ def automated_verify(netlist_path, db_path):
         print(f"  {net}: {val}V")
 
     # 5. Summary Report
-    df = pd.DataFrame(results)
+    df = pd.DataFrame([display_row(r) for r in results])
     print("\n--- Summary of Analysis ---")
     print(f"Total Analyzed: {len(df)}")
     if not df.empty :
-        print(df['verdict'].value_counts())
+        print(df['Verdict'].value_counts())
     
-    noks = df[df['verdict'] == 'NOK']
+    noks = df[[r.verdict == Verdict.NOK for r in results]]
     if not noks.empty:
         print(f"\nFound {len(noks)} NOK components. First 5:")
-        # Corrected column name 'applied' (lowercase as per analyzer output)
-        print(noks[['designator', 'Type', 'rating', 'applied', 'verdict']].head())
+        print(noks[['Designator', 'Type', 'Rating', 'Applied', 'Verdict']].head())
 
 if __name__ == "__main__":
     base = r"c:\Users\fikre\Documents\PlatformIO\Projects\Auto_Altium"